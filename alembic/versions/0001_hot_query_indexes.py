@@ -0,0 +1,56 @@
+"""hot query composite indexes
+
+为高频查询形状添加复合/覆盖索引：
+- 聊天记录：(sender_id, receiver_id) 过滤并按 sent_at 排序
+- 未读消息数：(receiver_id, is_read)
+- 销售趋势/渠道分布：按 date(order_date)、channel_id 分组汇总 order_amount
+- 库存预警：(inventory_id, alert_status)
+
+已有数据库（由 db.sql 创建）直接执行 alembic upgrade head 即可。
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_messages_sender_receiver_sent",
+        "CommunicationMessages",
+        ["sender_id", "receiver_id", "sent_at"],
+    )
+    op.create_index(
+        "ix_messages_receiver_read",
+        "CommunicationMessages",
+        ["receiver_id", "is_read"],
+    )
+    op.create_index(
+        "ix_salesorders_date_channel_amount",
+        "SalesOrders",
+        ["order_date", "channel_id", "order_amount"],
+    )
+    op.create_index(
+        "ix_inventoryalerts_inventory_status",
+        "InventoryAlerts",
+        ["inventory_id", "alert_status"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_inventoryalerts_inventory_status", table_name="InventoryAlerts")
+    op.drop_index("ix_salesorders_date_channel_amount", table_name="SalesOrders")
+    op.drop_index("ix_messages_receiver_read", table_name="CommunicationMessages")
+    op.drop_index("ix_messages_sender_receiver_sent", table_name="CommunicationMessages")
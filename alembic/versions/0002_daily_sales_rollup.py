@@ -0,0 +1,39 @@
+"""daily sales rollup table
+
+按 (销售日期, 渠道, 订单状态) 增量维护的日销售汇总表，供仪表盘图表读取。
+升级后执行 python rebuild_sales_rollup.py 回填历史数据。
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "DailySalesRollups",
+        sa.Column("sales_date", sa.Date(), nullable=False, comment="销售日期"),
+        sa.Column("channel_id", sa.Integer(), nullable=False, comment="渠道ID"),
+        sa.Column("order_status", sa.String(length=50), nullable=False, comment="订单状态"),
+        sa.Column("order_count", sa.Integer(), nullable=False, comment="订单数"),
+        sa.Column("total_amount", sa.DECIMAL(precision=14, scale=2), nullable=False, comment="订单总金额"),
+        sa.Column("updated_at", sa.DateTime(), nullable=True, comment="记录更新时间"),
+        sa.ForeignKeyConstraint(["channel_id"], ["SalesChannels.channel_id"]),
+        sa.PrimaryKeyConstraint("sales_date", "channel_id", "order_status"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("DailySalesRollups")
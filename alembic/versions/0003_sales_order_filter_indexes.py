@@ -0,0 +1,36 @@
+"""sales order list filter indexes
+
+订单列表按单个条件过滤并按 order_date 排序/游标分页时，由 (过滤列, order_date) 复合索引
+同时完成过滤与排序（InnoDB二级索引隐含主键 order_id，可作为游标的唯一键）：
+- 渠道：(channel_id, order_date)
+- 订单状态：(order_status, order_date)
+- 客户：(customer_user_id, order_date)
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_salesorders_channel_date", "SalesOrders", ["channel_id", "order_date"])
+    op.create_index("ix_salesorders_status_date", "SalesOrders", ["order_status", "order_date"])
+    op.create_index("ix_salesorders_customer_date", "SalesOrders", ["customer_user_id", "order_date"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_salesorders_customer_date", table_name="SalesOrders")
+    op.drop_index("ix_salesorders_status_date", table_name="SalesOrders")
+    op.drop_index("ix_salesorders_channel_date", table_name="SalesOrders")
@@ -0,0 +1,69 @@
+"""sales order archive tables
+
+SalesOrdersArchive / SalesOrderItemsArchive：由 archive_sales_orders.py 将超过
+ORDER_ARCHIVE_AFTER_DAYS 天的订单分批移入，在线表只保留近期数据；
+查询的日期范围落入归档区间时接口自动合并读取归档表。
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "SalesOrdersArchive",
+        sa.Column("order_id", sa.Integer(), autoincrement=False, nullable=False, comment="订单ID，主键"),
+        sa.Column("customer_user_id", sa.String(length=255), nullable=False, comment="客户用户ID"),
+        sa.Column("channel_id", sa.Integer(), nullable=False, comment="渠道ID"),
+        sa.Column("order_amount", sa.DECIMAL(precision=10, scale=2), nullable=False, comment="订单总金额"),
+        sa.Column("order_status", sa.String(length=50), nullable=False, comment="订单状态"),
+        sa.Column("order_date", sa.DateTime(), nullable=True, comment="订单日期"),
+        sa.Column("created_at", sa.DateTime(), nullable=True, comment="记录创建时间"),
+        sa.Column("updated_at", sa.DateTime(), nullable=True, comment="记录更新时间"),
+        sa.Column("archived_at", sa.DateTime(), nullable=True, comment="归档时间"),
+        sa.ForeignKeyConstraint(["channel_id"], ["SalesChannels.channel_id"]),
+        sa.PrimaryKeyConstraint("order_id"),
+    )
+    op.create_index("ix_SalesOrdersArchive_order_date", "SalesOrdersArchive", ["order_date"])
+    op.create_index("ix_SalesOrdersArchive_order_status", "SalesOrdersArchive", ["order_status"])
+    op.create_index("ix_salesordersarchive_channel_date", "SalesOrdersArchive", ["channel_id", "order_date"])
+    op.create_index("ix_salesordersarchive_customer_date", "SalesOrdersArchive", ["customer_user_id", "order_date"])
+
+    op.create_table(
+        "SalesOrderItemsArchive",
+        sa.Column("order_item_id", sa.Integer(), autoincrement=False, nullable=False, comment="订单项ID"),
+        sa.Column("order_id", sa.Integer(), nullable=False, comment="销售订单ID"),
+        sa.Column("product_id", sa.Integer(), nullable=False, comment="产品ID"),
+        sa.Column("quantity", sa.Integer(), nullable=False, comment="购买数量"),
+        sa.Column("unit_price", sa.DECIMAL(precision=10, scale=2), nullable=False, comment="售出单价"),
+        sa.Column("total_price", sa.DECIMAL(precision=10, scale=2), nullable=False, comment="总价"),
+        sa.ForeignKeyConstraint(["order_id"], ["SalesOrdersArchive.order_id"]),
+        sa.ForeignKeyConstraint(["product_id"], ["Products.product_id"]),
+        sa.PrimaryKeyConstraint("order_item_id"),
+    )
+    op.create_index("ix_SalesOrderItemsArchive_order_id", "SalesOrderItemsArchive", ["order_id"])
+    op.create_index("ix_SalesOrderItemsArchive_product_id", "SalesOrderItemsArchive", ["product_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_SalesOrderItemsArchive_product_id", table_name="SalesOrderItemsArchive")
+    op.drop_index("ix_SalesOrderItemsArchive_order_id", table_name="SalesOrderItemsArchive")
+    op.drop_table("SalesOrderItemsArchive")
+    op.drop_index("ix_salesordersarchive_customer_date", table_name="SalesOrdersArchive")
+    op.drop_index("ix_salesordersarchive_channel_date", table_name="SalesOrdersArchive")
+    op.drop_index("ix_SalesOrdersArchive_order_status", table_name="SalesOrdersArchive")
+    op.drop_index("ix_SalesOrdersArchive_order_date", table_name="SalesOrdersArchive")
+    op.drop_table("SalesOrdersArchive")
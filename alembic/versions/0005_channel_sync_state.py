@@ -0,0 +1,38 @@
+"""channel sync state
+
+ChannelSyncStates：每个渠道的订单同步检查点（高水位、外部游标、最近成功时间），
+与每批同步订单在同一事务中提交，同步只拉取检查点之后更新的订单，中断后从检查点继续。
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ChannelSyncStates",
+        sa.Column("channel_code", sa.String(length=50), nullable=False, comment="渠道代码，主键"),
+        sa.Column("high_water_mark", sa.DateTime(), nullable=True, comment="已同步订单的最大外部更新时间（高水位）"),
+        sa.Column("external_cursor", sa.String(length=500), nullable=True, comment="渠道分页游标或最后同步的外部订单ID"),
+        sa.Column("last_success_at", sa.DateTime(), nullable=True, comment="最近一次同步成功完成的时间"),
+        sa.Column("updated_at", sa.DateTime(), nullable=True, comment="检查点更新时间"),
+        sa.ForeignKeyConstraint(["channel_code"], ["SalesChannels.channel_code"]),
+        sa.PrimaryKeyConstraint("channel_code"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("ChannelSyncStates")
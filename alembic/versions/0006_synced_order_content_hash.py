@@ -0,0 +1,32 @@
+"""synced order content hash
+
+SyncedChannelOrders.content_hash：渠道原始订单规范化JSON的SHA-256，
+同步时与已存储的哈希比较，内容未变化的订单跳过写入。
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "SyncedChannelOrders",
+        sa.Column("content_hash", sa.String(length=64), nullable=True, comment="原始订单内容哈希（规范化JSON的SHA-256）"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("SyncedChannelOrders", "content_hash")
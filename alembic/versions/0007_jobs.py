@@ -0,0 +1,56 @@
+"""background jobs
+
+Jobs：后台任务（渠道同步、汇总重建、订单归档等）的状态与进度。
+active_key 在任务排队或执行期间等于去重键、结束后置空，唯一约束保证同一键同时只有一个活动任务。
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "Jobs",
+        sa.Column("job_id", sa.String(length=32), nullable=False, comment="任务ID，主键"),
+        sa.Column("job_type", sa.String(length=50), nullable=False, comment="任务类型"),
+        sa.Column("job_key", sa.String(length=255), nullable=False, comment="去重键（同类型同参数的任务相同）"),
+        sa.Column("active_key", sa.String(length=255), nullable=True, comment="活动任务去重键：排队或执行中时等于job_key，结束后置空"),
+        sa.Column("worker", sa.String(length=100), nullable=True, comment="执行任务的进程（主机名:进程号）"),
+        sa.Column("status", sa.String(length=20), nullable=False, comment="任务状态：queued/running/succeeded/failed"),
+        sa.Column("params", sa.JSON(), nullable=True, comment="任务参数"),
+        sa.Column("progress_current", sa.Integer(), nullable=False, comment="已完成的工作量"),
+        sa.Column("progress_total", sa.Integer(), nullable=True, comment="总工作量，未知时为空"),
+        sa.Column("message", sa.Text(), nullable=True, comment="进度或结果说明"),
+        sa.Column("result", sa.JSON(), nullable=True, comment="任务结果"),
+        sa.Column("error", sa.Text(), nullable=True, comment="失败原因"),
+        sa.Column("created_at", sa.DateTime(), nullable=True, comment="创建时间"),
+        sa.Column("started_at", sa.DateTime(), nullable=True, comment="开始执行时间"),
+        sa.Column("finished_at", sa.DateTime(), nullable=True, comment="结束时间"),
+        sa.PrimaryKeyConstraint("job_id"),
+        sa.UniqueConstraint("active_key"),
+    )
+    op.create_index("ix_Jobs_job_type", "Jobs", ["job_type"])
+    op.create_index("ix_Jobs_job_key", "Jobs", ["job_key"])
+    op.create_index("ix_Jobs_status", "Jobs", ["status"])
+    op.create_index("ix_Jobs_created_at", "Jobs", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_Jobs_created_at", table_name="Jobs")
+    op.drop_index("ix_Jobs_status", table_name="Jobs")
+    op.drop_index("ix_Jobs_job_key", table_name="Jobs")
+    op.drop_index("ix_Jobs_job_type", table_name="Jobs")
+    op.drop_table("Jobs")
@@ -0,0 +1,54 @@
+"""sales order date not null
+
+SalesOrders / SalesOrdersArchive.order_date 改为 NOT NULL：订单列表按 (order_date, order_id)
+游标分页时，NULL 无法参与范围比较，这些订单会被跳过或卡在最后一页。
+已有的 NULL 值以记录创建时间（缺失时为当前时间）回填。
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = {
+    "SalesOrders": sa.text("CURRENT_TIMESTAMP"),
+    "SalesOrdersArchive": None,
+}
+
+
+def upgrade() -> None:
+    for table, server_default in TABLES.items():
+        op.execute(
+            f"UPDATE {table} SET order_date = COALESCE(created_at, CURRENT_TIMESTAMP) WHERE order_date IS NULL"
+        )
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(
+                "order_date",
+                existing_type=sa.DateTime(),
+                existing_server_default=server_default,
+                existing_comment="订单日期",
+                nullable=False,
+            )
+
+
+def downgrade() -> None:
+    for table, server_default in TABLES.items():
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(
+                "order_date",
+                existing_type=sa.DateTime(),
+                existing_server_default=server_default,
+                existing_comment="订单日期",
+                nullable=True,
+            )
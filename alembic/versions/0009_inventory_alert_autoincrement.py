@@ -0,0 +1,44 @@
+"""inventory alert id auto increment
+
+InventoryAlerts.alert_id 改为自增：原先按秒取时间戳作为ID，同一秒内生成的多条预警
+（如一个订单使多个产品低于阈值）主键冲突，只有第一条能写入。
+已有的ID保持不变，新ID从当前最大值之后分配。
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("InventoryAlerts") as batch_op:
+        batch_op.alter_column(
+            "alert_id",
+            existing_type=sa.Integer(),
+            existing_nullable=False,
+            existing_comment="预警ID，主键",
+            autoincrement=True,
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("InventoryAlerts") as batch_op:
+        batch_op.alter_column(
+            "alert_id",
+            existing_type=sa.Integer(),
+            existing_nullable=False,
+            existing_comment="预警ID，主键",
+            autoincrement=False,
+        )
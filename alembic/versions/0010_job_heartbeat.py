@@ -0,0 +1,47 @@
+"""job heartbeat
+
+Jobs.heartbeat_at：执行中的任务定期刷新的心跳时间，超过 JOB_STALE_AFTER_SECONDS 未更新的任务
+视为执行进程已退出，标记为失败并释放去重键；worker 改为记录进程启动令牌。
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: Union[str, None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("Jobs") as batch_op:
+        batch_op.add_column(
+            sa.Column("heartbeat_at", sa.DateTime(), nullable=True, comment="最近一次心跳时间（执行中定期刷新）")
+        )
+        batch_op.alter_column(
+            "worker",
+            existing_type=sa.String(length=100),
+            existing_nullable=True,
+            existing_comment="执行任务的进程（主机名:进程号）",
+            comment="执行任务的进程启动令牌（每个进程启动时随机生成）",
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("Jobs") as batch_op:
+        batch_op.alter_column(
+            "worker",
+            existing_type=sa.String(length=100),
+            existing_nullable=True,
+            existing_comment="执行任务的进程启动令牌（每个进程启动时随机生成）",
+            comment="执行任务的进程（主机名:进程号）",
+        )
+        batch_op.drop_column("heartbeat_at")
@@ -1,17 +1,32 @@
-from typing import Generator, Optional
+import time
+from typing import Any, AsyncGenerator, Dict, Generator, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app import models, schemas
 from app.core import security
+from app.core.cache import TTLCache
 from app.core.config import settings
-from app.db.session import SessionLocal
+from app.db.session import AsyncSessionLocal, SessionLocal
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/login/access-token"
 )
 
+# 已解码的JWT载荷缓存（按token）与认证用户缓存（按用户名）
+token_payload_cache = TTLCache(
+    "token_payload",
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+principal_cache = TTLCache(
+    "principal",
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
 def get_db() -> Generator:
     """获取数据库会话"""
     try:
@@ -20,6 +35,28 @@ def get_db() -> Generator:
     finally:
         db.close()
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """获取异步数据库会话"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def decode_token(token: str) -> Dict[str, Any]:
+    """解码JWT令牌，结果按token缓存，缓存时间不超过令牌剩余有效期"""
+    payload = token_payload_cache.get(token)
+    if payload is None:
+        payload = jwt.decode(
+            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+        )
+        ttl = settings.PRINCIPAL_CACHE_TTL_SECONDS
+        if payload.get("exp") is not None:
+            ttl = min(ttl, payload["exp"] - time.time())
+        token_payload_cache.set(token, payload, ttl=ttl)
+    return payload
+
+def invalidate_principal(username: str) -> None:
+    """用户信息变更或删除后使认证用户缓存失效"""
+    principal_cache.invalidate(username)
+
 def get_current_user(
     db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
 ) -> models.User:
@@ -30,19 +67,26 @@ def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = decode_token(token)
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
     
-    user = db.query(models.User).filter(models.User.username == username).first()
-    if user is None:
-        raise credentials_exception
-    return user
+    # 缓存中保存列值快照，每次请求构造新的游离对象，避免跨会话共享ORM实例
+    columns = principal_cache.get(username)
+    if columns is None:
+        user = db.query(models.User).filter(models.User.username == username).first()
+        if user is None:
+            raise credentials_exception
+        columns = {
+            column.key: getattr(user, column.key)
+            for column in models.User.__table__.columns
+        }
+        principal_cache.set(username, columns)
+        return user
+    return models.User(**columns)
 
 def get_current_active_user(
     current_user: models.User = Depends(get_current_user),
@@ -10,7 +10,9 @@ from app.api.v1.endpoints import (
     logistics,
     order_sync,
     communication,
-    dashboard
+    dashboard,
+    sales_analytics,
+    jobs
 )
 
 api_router = APIRouter()
@@ -42,4 +44,8 @@ api_router.include_router(order_sync.router, prefix="/order-sync", tags=["订单
 api_router.include_router(communication.router, prefix="/communication", tags=["通信"])
 
 # 数据统计与分析
-api_router.include_router(dashboard.router, prefix="/dashboard", tags=["数据统计"]) 
\ No newline at end of file
+api_router.include_router(dashboard.router, prefix="/dashboard", tags=["数据统计"])
+api_router.include_router(sales_analytics.router, prefix="/sales", tags=["销售分析"]) 
+
+# 后台任务
+api_router.include_router(jobs.router, prefix="/jobs", tags=["后台任务"])
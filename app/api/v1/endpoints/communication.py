@@ -1,7 +1,8 @@
 from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func, or_, and_, desc
+from sqlalchemy import func, or_, and_, desc, select, update
 
 from app import models, schemas
 from app.api import deps
@@ -11,22 +12,22 @@ from app.models.communication import Contact, CommunicationMessage, MessageTempl
 router = APIRouter()
 
 @router.get("/contacts", response_model=schemas.communication.ContactListResponse)
-def read_contacts(
+async def read_contacts(
     skip: int = 0,
     limit: int = 100,
     search: Optional[str] = None,
     role: Optional[str] = None,
     status: Optional[str] = None,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     获取联系人列表
     """
-    query = db.query(Contact).filter(Contact.is_active == True)
+    query = select(Contact).where(Contact.is_active == True)
     
     if search:
-        query = query.filter(
+        query = query.where(
             or_(
                 Contact.name.contains(search),
                 Contact.contact_info.contains(search)
@@ -34,26 +35,36 @@ def read_contacts(
         )
     
     if role:
-        query = query.filter(Contact.role == role)
+        query = query.where(Contact.role == role)
     
     if status:
-        query = query.filter(Contact.status == status)
+        query = query.where(Contact.status == status)
     
     # 简化查询，先获取联系人列表，然后单独计算未读消息数
-    contacts = query.order_by(Contact.created_at.desc()).offset(skip).limit(limit).all()
-    total = query.count()
+    contacts = (await db.execute(
+        query.order_by(Contact.created_at.desc()).offset(skip).limit(limit)
+    )).scalars().all()
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    
+    # 一次分组查询计算本页所有联系人的未读消息数
+    contact_ids = [contact.contact_id for contact in contacts]
+    unread_counts = {}
+    if contact_ids:
+        unread_counts = dict((await db.execute(
+            select(
+                CommunicationMessage.receiver_id,
+                func.count(CommunicationMessage.message_id)
+            ).where(
+                and_(
+                    CommunicationMessage.receiver_id.in_(contact_ids),
+                    CommunicationMessage.is_read == False
+                )
+            ).group_by(CommunicationMessage.receiver_id)
+        )).all())
     
     # 构造响应数据
     result_contacts = []
     for contact in contacts:
-        # 计算每个联系人的未读消息数
-        unread_count = db.query(CommunicationMessage).filter(
-            and_(
-                CommunicationMessage.receiver_id == contact.contact_id,
-                CommunicationMessage.is_read == False
-            )
-        ).count()
-        
         contact_dict = {
             "contact_id": contact.contact_id,
             "name": contact.name,
@@ -65,7 +76,7 @@ def read_contacts(
             "is_active": contact.is_active,
             "created_at": contact.created_at,
             "updated_at": contact.updated_at,
-            "unread_count": unread_count
+            "unread_count": unread_counts.get(contact.contact_id, 0)
         }
         result_contacts.append(schemas.communication.Contact(**contact_dict))
     
@@ -162,11 +173,11 @@ def delete_contact(
     return {"message": "联系人已删除"}
 
 @router.get("/messages/{contact_id}", response_model=List[schemas.communication.Message])
-def read_messages(
+async def read_messages(
     contact_id: int,
     skip: int = 0,
     limit: int = 50,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
@@ -175,9 +186,9 @@ def read_messages(
     # 这里需要确定当前用户的联系人ID，简化处理，假设当前用户ID为1
     current_contact_id = 1  # 实际应该从用户信息中获取
     
-    messages = (
-        db.query(CommunicationMessage)
-        .filter(
+    messages = (await db.execute(
+        select(CommunicationMessage)
+        .where(
             or_(
                 and_(
                     CommunicationMessage.sender_id == current_contact_id,
@@ -192,14 +203,23 @@ def read_messages(
         .order_by(CommunicationMessage.sent_at.asc())
         .offset(skip)
         .limit(limit)
-        .all()
-    )
+    )).scalars().all()
+    
+    # 一次查询获取所有发送者和接收者信息
+    participant_ids = {m.sender_id for m in messages} | {m.receiver_id for m in messages}
+    contacts = {}
+    if participant_ids:
+        contacts = {
+            contact.contact_id: contact
+            for contact in (await db.execute(
+                select(Contact).where(Contact.contact_id.in_(participant_ids))
+            )).scalars()
+        }
     
-    # 获取发送者和接收者信息
     result = []
     for message in messages:
-        sender = db.query(Contact).filter(Contact.contact_id == message.sender_id).first()
-        receiver = db.query(Contact).filter(Contact.contact_id == message.receiver_id).first()
+        sender = contacts.get(message.sender_id)
+        receiver = contacts.get(message.receiver_id)
         
         message_dict = {
             **message.__dict__,
@@ -210,14 +230,16 @@ def read_messages(
         result.append(schemas.communication.Message(**message_dict))
     
     # 标记消息为已读
-    db.query(CommunicationMessage).filter(
-        and_(
-            CommunicationMessage.sender_id == contact_id,
-            CommunicationMessage.receiver_id == current_contact_id,
-            CommunicationMessage.is_read == False
-        )
-    ).update({"is_read": True, "read_at": func.now()})
-    db.commit()
+    await db.execute(
+        update(CommunicationMessage).where(
+            and_(
+                CommunicationMessage.sender_id == contact_id,
+                CommunicationMessage.receiver_id == current_contact_id,
+                CommunicationMessage.is_read == False
+            )
+        ).values(is_read=True, read_at=func.now())
+    )
+    await db.commit()
     
     return result
 
@@ -266,28 +288,27 @@ def send_message(
     return schemas.communication.Message(**message_dict)
 
 @router.get("/templates", response_model=List[schemas.communication.MessageTemplate])
-def read_message_templates(
+async def read_message_templates(
     skip: int = 0,
     limit: int = 50,
     category: Optional[str] = None,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     获取消息模板列表
     """
-    query = db.query(MessageTemplate).filter(MessageTemplate.is_active == True)
+    query = select(MessageTemplate).where(MessageTemplate.is_active == True)
     
     if category:
-        query = query.filter(MessageTemplate.category == category)
+        query = query.where(MessageTemplate.category == category)
     
-    templates = (
+    templates = (await db.execute(
         query
         .order_by(MessageTemplate.usage_count.desc())
         .offset(skip)
         .limit(limit)
-        .all()
-    )
+    )).scalars().all()
     
     return templates
 
@@ -308,23 +329,22 @@ def create_message_template(
     return template
 
 @router.get("/quick-replies", response_model=List[schemas.communication.QuickReply])
-def read_quick_replies(
+async def read_quick_replies(
     skip: int = 0,
     limit: int = 20,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     获取快捷回复列表
     """
-    quick_replies = (
-        db.query(QuickReply)
-        .filter(QuickReply.is_active == True)
+    quick_replies = (await db.execute(
+        select(QuickReply)
+        .where(QuickReply.is_active == True)
         .order_by(QuickReply.sort_order.asc(), QuickReply.usage_count.desc())
         .offset(skip)
         .limit(limit)
-        .all()
-    )
+    )).scalars().all()
     
     return quick_replies
 
@@ -1,90 +1,92 @@
-from typing import Any, Dict
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select, union_all
 from app.api import deps
 from app.models.user import User
 from app.models.sales_order import SalesOrder
+from app.models.sales_rollup import DailySalesRollup
 from app.models.product import Product
-from app.models.inventory import Inventory, InventoryAlert
-from app.models.supplier import Supplier
+from app.models.inventory import Inventory
+from app.services import top_sellers
+from app.services.dashboard_stats import statistics_snapshot
+from app.services.order_archive import order_models
+from app.services.sales_trend import MAX_HOURLY_RANGE_DAYS, bucket_sales, resolve_range
 
 router = APIRouter()
 
 @router.get("/statistics", response_model=Dict[str, Any])
-def get_statistics(
-    db: Session = Depends(deps.get_db),
+async def get_statistics(
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    获取系统统计数据
+    获取系统统计数据（共享快照，过期前后台刷新）
     """
-    # 订单统计
-    total_orders = db.query(func.count(SalesOrder.order_id)).scalar()
-    total_revenue = db.query(func.sum(SalesOrder.order_amount)).scalar() or 0
-    
-    # 产品统计
-    total_products = db.query(func.count(Product.product_id)).scalar()
-    
-    # 用户统计
-    total_users = db.query(func.count(User.user_id)).scalar()
-    
-    # 库存统计
-    total_inventory_value = db.query(
-        func.sum(Inventory.current_stock_quantity * Product.unit_price)
-    ).join(Product).scalar() or 0
-    
-    # 预警统计
-    active_alerts = db.query(func.count(InventoryAlert.alert_id)).filter(
-        InventoryAlert.alert_status.in_(["未发送", "已发送", "处理中", "待处理", "处理中"])
-    ).scalar()
-    
-    # 供应商统计
-    active_suppliers = db.query(func.count(Supplier.supplier_id)).filter(
-        Supplier.cooperation_status == "合作中"
-    ).scalar()
-    
-    # 订单状态分布
-    order_status_distribution = db.query(
-        SalesOrder.order_status,
-        func.count(SalesOrder.order_id)
-    ).group_by(SalesOrder.order_status).all()
-    
-    return {
-        "total_orders": total_orders,
-        "total_revenue": float(total_revenue),
-        "total_products": total_products,
-        "total_users": total_users,
-        "total_inventory_value": float(total_inventory_value),
-        "active_alerts": active_alerts,
-        "active_suppliers": active_suppliers,
-        "order_status_distribution": {
-            status: count for status, count in order_status_distribution
-        }
-    }
+    return await run_in_threadpool(statistics_snapshot.get)
 
 @router.get("/charts/sales-trend")
-def get_sales_trend(
-    db: Session = Depends(deps.get_db),
+async def get_sales_trend(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    granularity: Literal["hour", "day", "week", "month"] = "day",
+    channel_id: Optional[int] = None,
+    window: int = Query(7, ge=1, le=90),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     获取销售趋势数据
+    按小时/天/周/月分桶，缺失时间段补0，并返回window个时间桶的销售额移动平均
     """
-    # 按日期统计销售额
-    sales_by_date = db.query(
-        func.date(SalesOrder.order_date).label("date"),
-        func.sum(SalesOrder.order_amount).label("amount")
-    ).group_by(func.date(SalesOrder.order_date)).order_by("date").all()
-    
-    return {
-        "dates": [str(row.date) for row in sales_by_date],
-        "amounts": [float(row.amount) for row in sales_by_date]
-    }
+    start, end = resolve_range(start, end, granularity)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+
+    if granularity == "hour":
+        # 小时粒度读取订单明细
+        if (end - start).days + 1 > MAX_HOURLY_RANGE_DAYS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Hourly trend is limited to {MAX_HOURLY_RANGE_DAYS} days",
+            )
+        branches = []
+        for Order, _ in order_models(start):
+            query = select(Order.order_date, Order.order_amount).where(
+                Order.order_date >= datetime.combine(start, time.min),
+                Order.order_date < datetime.combine(end + timedelta(days=1), time.min),
+            )
+            if channel_id is not None:
+                query = query.where(Order.channel_id == channel_id)
+            branches.append(query)
+        query = branches[0] if len(branches) == 1 else union_all(*branches)
+        rows = (await db.execute(query)).all()
+        timestamps, amounts = (list(column) for column in zip(*rows)) if rows else ([], [])
+        counts = None
+    else:
+        # 天/周/月粒度读取日销售汇总表
+        query = select(
+            DailySalesRollup.sales_date,
+            func.sum(DailySalesRollup.total_amount),
+            func.sum(DailySalesRollup.order_count),
+        ).where(
+            DailySalesRollup.sales_date >= start,
+            DailySalesRollup.sales_date <= end,
+        ).group_by(DailySalesRollup.sales_date)
+        if channel_id is not None:
+            query = query.where(DailySalesRollup.channel_id == channel_id)
+        rows = (await db.execute(query)).all()
+        timestamps, amounts, counts = (list(column) for column in zip(*rows)) if rows else ([], [], [])
+
+    trend = await run_in_threadpool(
+        bucket_sales, timestamps, amounts, counts, start, end, granularity, window
+    )
+    return {"granularity": granularity, "start": str(start), "end": str(end), **trend}
 
 @router.get("/charts/channel-distribution")
-def get_channel_distribution(
-    db: Session = Depends(deps.get_db),
+async def get_channel_distribution(
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
@@ -92,33 +94,80 @@ def get_channel_distribution(
     """
     from app.models.sales_channel import SalesChannel
     
-    channel_sales = db.query(
-        SalesChannel.channel_name,
-        func.sum(SalesOrder.order_amount).label("amount")
-    ).join(SalesOrder).group_by(SalesChannel.channel_id).all()
+    channel_sales = (await db.execute(
+        select(
+            SalesChannel.channel_name,
+            func.sum(DailySalesRollup.total_amount).label("amount")
+        ).join(
+            DailySalesRollup, DailySalesRollup.channel_id == SalesChannel.channel_id
+        ).group_by(SalesChannel.channel_id, SalesChannel.channel_name).having(
+            func.sum(DailySalesRollup.order_count) > 0
+        )
+    )).all()
     
     return {
         "channels": [row.channel_name for row in channel_sales],
         "amounts": [float(row.amount) for row in channel_sales]
     }
 
+@router.get("/top-products")
+async def get_top_products(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    channel_id: Optional[int] = None,
+    metric: Literal["revenue", "quantity"] = "revenue",
+    group_by: Literal["product", "sku_family"] = "product",
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    获取畅销产品排行（默认最近30天），可按产品或SKU系列统计
+    """
+    start, end = resolve_range(start, end, "day")
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    rank = top_sellers.top_products if group_by == "product" else top_sellers.top_sku_families
+    items = await rank(db, start, end, metric, limit, channel_id)
+    return {"start": str(start), "end": str(end), "metric": metric, "group_by": group_by, "items": items}
+
+@router.get("/top-channels")
+async def get_top_channels(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    metric: Literal["revenue", "quantity"] = "revenue",
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    获取渠道销售排行（默认最近30天）
+    """
+    start, end = resolve_range(start, end, "day")
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    items = await top_sellers.top_channels(db, start, end, metric, limit)
+    return {"start": str(start), "end": str(end), "metric": metric, "items": items}
+
 @router.get("/inventory/alerts")
-def get_inventory_alerts(
-    db: Session = Depends(deps.get_db),
+async def get_inventory_alerts(
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     获取库存预警数据用于图表显示
     """
     # 获取所有有预警的库存信息
-    alerts_query = db.query(
-        Inventory.inventory_id,
-        Inventory.current_stock_quantity,
-        Inventory.alert_threshold,
-        Product.product_name
-    ).join(Product).filter(
-        Inventory.current_stock_quantity < Inventory.alert_threshold
-    ).all()
+    alerts_query = (await db.execute(
+        select(
+            Inventory.inventory_id,
+            Inventory.current_stock_quantity,
+            Inventory.alert_threshold,
+            Product.product_name
+        ).join(Product).where(
+            Inventory.current_stock_quantity < Inventory.alert_threshold
+        )
+    )).all()
     
     product_names = []
     current_stocks = []
@@ -136,8 +185,8 @@ def get_inventory_alerts(
     }
 
 @router.get("/recent-orders")
-def get_recent_orders(
-    db: Session = Depends(deps.get_db),
+async def get_recent_orders(
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
     limit: int = 10
 ) -> Any:
@@ -146,16 +195,18 @@ def get_recent_orders(
     """
     from app.models.sales_channel import SalesChannel
     
-    recent_orders = db.query(
-        SalesOrder.order_id,
-        SalesOrder.customer_user_id,
-        SalesOrder.order_amount,
-        SalesOrder.order_status,
-        SalesOrder.order_date,
-        SalesChannel.channel_name
-    ).join(SalesChannel).order_by(
-        SalesOrder.order_date.desc()
-    ).limit(limit).all()
+    recent_orders = (await db.execute(
+        select(
+            SalesOrder.order_id,
+            SalesOrder.customer_user_id,
+            SalesOrder.order_amount,
+            SalesOrder.order_status,
+            SalesOrder.order_date,
+            SalesChannel.channel_name
+        ).join(SalesChannel).order_by(
+            SalesOrder.order_date.desc()
+        ).limit(limit)
+    )).all()
     
     orders_data = []
     for order in recent_orders:
@@ -1,11 +1,17 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from datetime import datetime
 from app import schemas
 from app.api import deps
+from app.core.pagination import Keyset, set_next_cursor
+from app.db.counting import count_rows
 from app.models.inventory import Inventory, InventoryAlert
+from app.models.product import Product
 from app.models.user import User
+from app.services.export import export_response
+from app.services.stock import adjust_stock, raise_low_stock_alerts
 
 router = APIRouter()
 
@@ -14,17 +20,25 @@ def read_inventory(
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    total_mode: Literal["none", "estimate", "exact"] = Query(default="exact", alias="total"),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    获取库存信息列表
+    获取库存信息列表（传入cursor时按游标分页，total参数控制总数统计方式）
     """
-    total = db.query(Inventory).count()
-    inventory = db.query(Inventory).offset(skip).limit(limit).all()
+    keyset = Keyset(Inventory.inventory_id)
+    total = count_rows(
+        db, db.query(Inventory).statement, Inventory.__tablename__, total_mode, filtered=False
+    )
+    inventory, next_cursor = keyset.split(
+        keyset.apply(db.query(Inventory), cursor, skip, limit).all(), limit
+    )
     return {
         "data": inventory,
         "total": total,
-        "message": "获取库存信息成功"
+        "message": "获取库存信息成功",
+        "next_cursor": next_cursor
     }
 
 @router.post("/", response_model=schemas.Inventory)
@@ -49,21 +63,39 @@ def create_inventory(
     
     inventory = Inventory(**inventory_in.dict())
     db.add(inventory)
+    db.flush()
     
     # 如果库存低于预警值，创建预警记录
-    if inventory.current_stock_quantity < inventory.alert_threshold:
-        alert = InventoryAlert(
-            alert_id=int(datetime.now().timestamp()),  # 简单的ID生成
-            inventory_id=inventory.inventory_id,
-            alert_time=datetime.now(),
-            alert_status="未发送"
-        )
-        db.add(alert)
+    raise_low_stock_alerts(db, Inventory.inventory_id == inventory.inventory_id)
     
     db.commit()
     db.refresh(inventory)
     return inventory
 
+@router.get("/export")
+def export_inventory(
+    format: Literal["csv", "ndjson"] = "csv",
+    gzip: bool = False,
+    below_threshold: bool = False,
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    流式导出库存信息（含产品SKU与名称，CSV或NDJSON，可选gzip压缩）
+    below_threshold为真时只导出低于预警阈值的库存
+    """
+    query = select(
+        Inventory.inventory_id,
+        Inventory.product_id,
+        Product.sku,
+        Product.product_name,
+        Inventory.current_stock_quantity,
+        Inventory.alert_threshold,
+        Inventory.last_updated_at,
+    ).join(Product, Product.product_id == Inventory.product_id).order_by(Inventory.inventory_id)
+    if below_threshold:
+        query = query.where(Inventory.current_stock_quantity < Inventory.alert_threshold)
+    return export_response(query, "inventory", format, gzip)
+
 @router.get("/{inventory_id}", response_model=schemas.Inventory)
 def read_inventory_by_id(
     inventory_id: int,
@@ -94,44 +126,47 @@ def update_inventory(
         raise HTTPException(status_code=404, detail="Inventory not found")
     
     update_data = inventory_in.dict(exclude_unset=True)
+    stock_delta = update_data.pop("stock_delta", None)
+    if stock_delta is not None and "current_stock_quantity" in update_data:
+        raise HTTPException(
+            status_code=400,
+            detail="stock_delta and current_stock_quantity are mutually exclusive",
+        )
     for field, value in update_data.items():
         setattr(inventory, field, value)
     
     inventory.last_updated_at = datetime.now()
+    db.flush()
+    
+    # 增量调整在数据库中原子完成，避免并发调整互相覆盖
+    if stock_delta is not None and not adjust_stock(db, inventory_id, stock_delta):
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Insufficient stock")
     
     # 检查是否需要创建预警
-    if inventory.current_stock_quantity < inventory.alert_threshold:
-        # 检查是否已有未处理的预警
-        existing_alert = db.query(InventoryAlert).filter(
-            InventoryAlert.inventory_id == inventory_id,
-            InventoryAlert.alert_status.in_(["未发送", "已发送", "处理中"])
-        ).first()
-        
-        if not existing_alert:
-            alert = InventoryAlert(
-                alert_id=int(datetime.now().timestamp()),
-                inventory_id=inventory.inventory_id,
-                alert_time=datetime.now(),
-                alert_status="未发送"
-            )
-            db.add(alert)
+    raise_low_stock_alerts(db, Inventory.inventory_id == inventory_id)
     
-    db.add(inventory)
     db.commit()
     db.refresh(inventory)
     return inventory
 
 @router.get("/alerts/", response_model=List[schemas.InventoryAlert])
 def read_inventory_alerts(
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    获取库存预警记录列表
+    获取库存预警记录列表（按预警时间倒序，传入cursor时按游标分页）
     """
-    alerts = db.query(InventoryAlert).offset(skip).limit(limit).all()
+    keyset = Keyset(InventoryAlert.alert_time, InventoryAlert.alert_id, descending=True)
+    alerts, next_cursor = keyset.split(
+        keyset.apply(db.query(InventoryAlert), cursor, skip, limit).all(), limit
+    )
+    set_next_cursor(response, next_cursor)
     return alerts
 
 @router.post("/alerts/", response_model=schemas.InventoryAlert)
@@ -0,0 +1,64 @@
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.orm import Session
+from app import schemas
+from app.api import deps
+from app.core.pagination import Keyset, set_next_cursor
+from app.models.job import Job
+from app.models.user import User
+from app.services.jobs import JOB_HANDLERS, enqueue
+
+router = APIRouter()
+
+@router.get("/", response_model=List[schemas.Job])
+def read_jobs(
+    response: Response,
+    db: Session = Depends(deps.get_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    job_type: Optional[str] = None,
+    status: Optional[str] = None,
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    获取后台任务列表（按创建时间倒序，可按任务类型、状态过滤，传入cursor时按游标分页）
+    """
+    query = db.query(Job)
+    if job_type is not None:
+        query = query.filter(Job.job_type == job_type)
+    if status is not None:
+        query = query.filter(Job.status == status)
+    keyset = Keyset(Job.created_at, Job.job_id, descending=True)
+    jobs, next_cursor = keyset.split(keyset.apply(query, cursor, skip, limit).all(), limit)
+    set_next_cursor(response, next_cursor)
+    return jobs
+
+@router.post("/", response_model=schemas.JobEnqueueResponse)
+def create_job(
+    *,
+    db: Session = Depends(deps.get_db),
+    job_in: schemas.JobCreate,
+    current_user: User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    创建后台任务（order_sync / rollup_rebuild / order_archive / inventory_alert_scan），同类型同参数的活动任务不重复创建
+    """
+    if job_in.job_type not in JOB_HANDLERS:
+        raise HTTPException(status_code=400, detail=f"Unknown job type: {job_in.job_type}")
+    job, created = enqueue(db, job_in.job_type, job_in.params)
+    return {"job": job, "deduplicated": not created}
+
+@router.get("/{job_id}", response_model=schemas.Job)
+def read_job(
+    job_id: str,
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    获取后台任务的状态、进度与结果
+    """
+    job = db.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
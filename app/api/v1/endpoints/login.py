@@ -1,6 +1,7 @@
 from datetime import timedelta
 from typing import Any
 from fastapi import APIRouter, Body, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from app import schemas
@@ -12,21 +13,34 @@ from app.models.user import User
 router = APIRouter()
 
 @router.post("/login/access-token", response_model=schemas.Token)
-def login_access_token(
+async def login_access_token(
     db: Session = Depends(deps.get_db), form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """
     OAuth2 compatible token login, get an access token for future requests
     """
-    user = db.query(User).filter(User.username == form_data.username).first()
+    user = await run_in_threadpool(
+        lambda: db.query(User).filter(User.username == form_data.username).first()
+    )
+    if not user:
+        raise HTTPException(status_code=400, detail="Incorrect username or password")
     
-    if not user or not security.verify_password(form_data.password, user.password_hash):
+    verified, new_hash = await security.verify_and_update_password(
+        form_data.password, user.password_hash
+    )
+    if not verified:
         raise HTTPException(status_code=400, detail="Incorrect username or password")
     
+    username = user.username
+    # 旧哈希（成本因子已变更）登录成功后透明地重新哈希
+    if new_hash:
+        user.password_hash = new_hash
+        await run_in_threadpool(db.commit)
+    
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     return {
         "access_token": security.create_access_token(
-            user.username, expires_delta=access_token_expires
+            username, expires_delta=access_token_expires
         ),
         "token_type": "bearer",
     }
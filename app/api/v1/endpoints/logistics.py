@@ -1,8 +1,9 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from app import schemas
 from app.api import deps
+from app.core.pagination import Keyset, set_next_cursor
 from app.models.logistics import LogisticsInformation
 from app.models.user import User
 
@@ -10,15 +11,21 @@ router = APIRouter()
 
 @router.get("/", response_model=List[schemas.LogisticsInformation])
 def read_logistics(
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    获取物流信息列表
+    获取物流信息列表（传入cursor时按游标分页）
     """
-    logistics = db.query(LogisticsInformation).offset(skip).limit(limit).all()
+    keyset = Keyset(LogisticsInformation.logistics_id)
+    logistics, next_cursor = keyset.split(
+        keyset.apply(db.query(LogisticsInformation), cursor, skip, limit).all(), limit
+    )
+    set_next_cursor(response, next_cursor)
     return logistics
 
 @router.post("/", response_model=schemas.LogisticsInformation)
@@ -1,26 +1,42 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from datetime import datetime
 from app import schemas
 from app.api import deps
+from app.core.pagination import Keyset, set_next_cursor
+from app.models.channel_sync_state import ChannelSyncState
 from app.models.synced_order import SyncedChannelOrder
 from app.models.order_sync_log import OrderSyncLog
+from app.models.sales_channel import SalesChannel
 from app.models.user import User
+from app.services.export import export_response
+from app.services.jobs import enqueue
 
 router = APIRouter()
 
 @router.get("/orders", response_model=List[dict])
 def read_synced_orders(
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    获取已同步的渠道订单列表
+    获取已同步的渠道订单列表（按外部下单时间倒序，传入cursor时按游标分页）
     """
-    orders = db.query(SyncedChannelOrder).offset(skip).limit(limit).all()
+    keyset = Keyset(
+        SyncedChannelOrder.order_created_at_external,
+        SyncedChannelOrder.synced_order_id,
+        descending=True,
+    )
+    orders, next_cursor = keyset.split(
+        keyset.apply(db.query(SyncedChannelOrder), cursor, skip, limit).all(), limit
+    )
+    set_next_cursor(response, next_cursor)
     return [{"synced_order_id": o.synced_order_id, 
              "external_channel_code": o.external_channel_code,
              "order_status_external": o.order_status_external,
@@ -28,31 +44,95 @@ def read_synced_orders(
 
 @router.get("/logs", response_model=List[dict])
 def read_sync_logs(
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    sync_status: Optional[str] = None,
+    external_channel_code: Optional[str] = None,
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    获取订单同步日志
+    获取订单同步日志（按同步时间倒序，传入cursor时按游标分页）；
+    sync_status=quarantined 即SKU或渠道无法解析、等待处理的同步订单
     """
-    logs = db.query(OrderSyncLog).offset(skip).limit(limit).all()
+    query = db.query(OrderSyncLog)
+    if sync_status is not None:
+        query = query.filter(OrderSyncLog.sync_status == sync_status)
+    if external_channel_code is not None:
+        query = query.filter(OrderSyncLog.external_channel_code == external_channel_code)
+    keyset = Keyset(OrderSyncLog.sync_time, OrderSyncLog.log_id, descending=True)
+    logs, next_cursor = keyset.split(keyset.apply(query, cursor, skip, limit).all(), limit)
+    set_next_cursor(response, next_cursor)
     return [{"log_id": l.log_id,
              "synced_order_id": l.synced_order_id,
              "sync_status": l.sync_status,
              "sync_time": l.sync_time,
              "message": l.message} for l in logs]
 
-@router.post("/sync/{channel_code}")
+@router.get("/logs/export")
+def export_sync_logs(
+    format: Literal["csv", "ndjson"] = "csv",
+    gzip: bool = False,
+    external_channel_code: Optional[str] = None,
+    sync_status: Optional[str] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    流式导出订单同步日志（按同步时间排序，CSV或NDJSON，可选gzip压缩）
+    """
+    query = select(
+        OrderSyncLog.log_id,
+        OrderSyncLog.synced_order_id,
+        OrderSyncLog.external_channel_code,
+        OrderSyncLog.sync_status,
+        OrderSyncLog.sync_time,
+        OrderSyncLog.message,
+    ).order_by(OrderSyncLog.sync_time, OrderSyncLog.log_id)
+    if external_channel_code is not None:
+        query = query.where(OrderSyncLog.external_channel_code == external_channel_code)
+    if sync_status is not None:
+        query = query.where(OrderSyncLog.sync_status == sync_status)
+    if start_time is not None:
+        query = query.where(OrderSyncLog.sync_time >= start_time)
+    if end_time is not None:
+        query = query.where(OrderSyncLog.sync_time < end_time)
+    return export_response(query, "order_sync_logs", format, gzip)
+
+@router.get("/states", response_model=List[dict])
+def read_sync_states(
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    获取各渠道的同步检查点
+    """
+    states = db.query(ChannelSyncState).order_by(ChannelSyncState.channel_code).all()
+    return [{"channel_code": s.channel_code,
+             "high_water_mark": s.high_water_mark,
+             "external_cursor": s.external_cursor,
+             "last_success_at": s.last_success_at,
+             "updated_at": s.updated_at} for s in states]
+
+@router.post("/sync/{channel_code}", response_model=schemas.JobEnqueueResponse)
 def sync_channel_orders(
     channel_code: str,
+    full: bool = False,
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    触发指定渠道的订单同步
+    触发指定渠道的订单同步：创建后台任务并立即返回，进度与结果通过 GET /jobs/{job_id} 查询；
+    同一渠道已有排队或执行中的同步时返回该任务。默认只拉取检查点之后更新的订单，full=true 时全量同步
     """
-    # 这里应该调用实际的渠道API进行同步
-    # 这是一个模拟的实现
-    return {"message": f"Started syncing orders from channel {channel_code}",
-            "status": "processing"} 
\ No newline at end of file
+    channel = db.query(SalesChannel).filter(SalesChannel.channel_code == channel_code).first()
+    if not channel:
+        raise HTTPException(status_code=404, detail="Sales channel not found")
+    if not channel.api_address:
+        raise HTTPException(status_code=400, detail="Sales channel has no API address")
+
+    job, created = enqueue(db, "order_sync", {"channel_code": channel_code, "full": full})
+    return {"job": job, "deduplicated": not created}
@@ -1,9 +1,11 @@
 from typing import Any, List, Optional, Literal
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import or_, select
 from app import schemas
 from app.api import deps
+from app.db.counting import count_rows_async
 from app.models.product import Product
 from app.models.user import User
 import logging
@@ -17,41 +19,47 @@ router = APIRouter()
 @router.get("/", response_model=schemas.APIResponse[schemas.Product])
 async def read_products(
     request: Request,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
     name: str = Query(default=""),
     category: Optional[int] = Query(default=None),
     status: Optional[str] = Query(default=None),
+    total_mode: Literal["none", "estimate", "exact"] = Query(default="exact", alias="total"),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     获取产品列表，支持分页和过滤
+    total参数控制总数统计方式：none不统计，estimate使用表统计信息估算，exact精确计数（带缓存）
     """
     # 记录请求信息
     query_params = dict(request.query_params)
     logger.debug(f"请求参数: {query_params}")
     
-    query = db.query(Product)
+    query = select(Product)
+    filtered = False
     
     # 应用过滤条件
     if name:
-        query = query.filter(Product.product_name.ilike(f"%{name}%"))
+        query = query.where(Product.product_name.ilike(f"%{name}%"))
+        filtered = True
     if category is not None:
-        query = query.filter(Product.category_id == category)
+        query = query.where(Product.category_id == category)
+        filtered = True
     if status:
         logger.debug(f"状态过滤条件: {status}")
         if status in ["active", "inactive"]:
-            query = query.filter(Product.status == status)
+            query = query.where(Product.status == status)
+            filtered = True
         else:
             logger.warning(f"无效的状态值: {status}")
     
     # 获取总数
-    total = query.count()
+    total = await count_rows_async(db, query, Product.__tablename__, total_mode, filtered)
     logger.debug(f"查询到的总记录数: {total}")
     
     # 应用分页
-    products = query.offset(skip).limit(limit).all()
+    products = (await db.execute(query.offset(skip).limit(limit))).scalars().all()
     logger.debug(f"返回的记录数: {len(products)}")
     
     # 记录返回的数据结构
@@ -0,0 +1,163 @@
+from datetime import date
+from typing import Any, Literal, Optional
+
+import pandas as pd
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.models.user import User
+from app.services import sales_analytics as analytics
+
+router = APIRouter()
+
+def _window(start: Optional[date], end: Optional[date]) -> analytics.AnalyticsWindow:
+    window = analytics.analytics_window(start, end)
+    if window.start > window.end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    return window
+
+def _period(window: analytics.AnalyticsWindow) -> dict:
+    return {
+        "start": str(window.start),
+        "end": str(window.end),
+        "previous_start": str(window.previous_start),
+        "previous_end": str(window.previous_end),
+    }
+
+@router.get("/analytics/charts")
+async def get_analytics_charts(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    channel_id: Optional[int] = None,
+    order_status: Optional[str] = None,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    获取分析图表数据：按天、按渠道的销售额与订单数
+    """
+    window = _window(start, end)
+    data = await analytics.cached(
+        "charts", window, channel_id, order_status,
+        lambda: analytics.daily_channel_series(db, window, channel_id, order_status),
+    )
+    return {**_period(window), **data}
+
+@router.get("/analytics/channels")
+async def get_channel_analytics(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    channel_id: Optional[int] = None,
+    order_status: Optional[str] = None,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    获取各渠道KPI及环比趋势
+    """
+    window = _window(start, end)
+    channels = await analytics.cached(
+        "channels", window, channel_id, order_status,
+        lambda: analytics.channel_kpis(db, window, channel_id, order_status),
+    )
+    return {**_period(window), "channels": channels}
+
+@router.get("/analytics/orders")
+async def get_order_analytics(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    channel_id: Optional[int] = None,
+    order_status: Optional[str] = None,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    获取按订单状态统计的订单数、销售额及环比趋势
+    """
+    window = _window(start, end)
+    statuses = await analytics.cached(
+        "orders", window, channel_id, order_status,
+        lambda: analytics.status_breakdown(db, window, channel_id, order_status),
+    )
+    return {**_period(window), "statuses": statuses}
+
+@router.get("/statistics/basic")
+async def get_basic_statistics(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    channel_id: Optional[int] = None,
+    order_status: Optional[str] = None,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    获取核心指标卡片数据：本期值与环比变化幅度
+    """
+    window = _window(start, end)
+    metrics = await analytics.cached(
+        "summary", window, channel_id, order_status,
+        lambda: analytics.summary(db, window, channel_id, order_status),
+    )
+    return {
+        **_period(window),
+        **{
+            row["metric"]: {"value": row["current"], "change_pct": row["change_pct"], "trend": row["trend"]}
+            for row in metrics
+        },
+    }
+
+@router.get("/statistics/detailed")
+async def get_detailed_statistics(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    channel_id: Optional[int] = None,
+    order_status: Optional[str] = None,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    获取详细统计表格：核心指标的本期值、上期值、变化幅度与趋势，以及各渠道明细
+    """
+    window = _window(start, end)
+    metrics = await analytics.cached(
+        "summary", window, channel_id, order_status,
+        lambda: analytics.summary(db, window, channel_id, order_status),
+    )
+    channels = await analytics.cached(
+        "channels", window, channel_id, order_status,
+        lambda: analytics.channel_kpis(db, window, channel_id, order_status),
+    )
+    return {**_period(window), "metrics": metrics, "channels": channels}
+
+@router.get("/statistics/export")
+async def export_statistics(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    channel_id: Optional[int] = None,
+    order_status: Optional[str] = None,
+    report: Literal["summary", "channels", "orders"] = "summary",
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    导出统计数据为CSV（summary：核心指标；channels：渠道KPI；orders：订单状态统计）
+    """
+    window = _window(start, end)
+    compute = {
+        "summary": analytics.summary,
+        "channels": analytics.channel_kpis,
+        "orders": analytics.status_breakdown,
+    }[report]
+    rows = await analytics.cached(
+        report, window, channel_id, order_status,
+        lambda: compute(db, window, channel_id, order_status),
+    )
+    # 带BOM的UTF-8，便于Excel正确识别中文
+    content = pd.DataFrame(rows).to_csv(index=False)
+    filename = f"sales_{report}_{window.start}_{window.end}.csv"
+    return Response(
+        content="﻿" + content,
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
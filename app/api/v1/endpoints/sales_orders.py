@@ -1,49 +1,162 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from datetime import date, datetime, time, timedelta
+from typing import Any, List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select, union_all
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
 from app import schemas
 from app.api import deps
+from app.core.config import settings
+from app.core.pagination import Keyset, set_next_cursor
 from app.models.sales_order import SalesOrder, SalesOrderItem
 from app.models.sales_channel import SalesChannel
-from app.models.product import Product
 from app.models.user import User
+from app.services.bulk_orders import bulk_create_orders
+from app.services.export import export_response
+from app.services.order_archive import ARCHIVE, order_models
+from app.services.stock import InsufficientStock, reserve_stock
+from app.services.sales_rollup import apply_rollup_changes, order_snapshot
 
 router = APIRouter()
 
+# 列表可选的排序列（均有索引支撑），以 order_id 作为游标的唯一键
+ORDER_SORT_COLUMNS = {
+    "order_id": ("order_id",),
+    "order_date": ("order_date", "order_id"),
+}
+
+def _order_rows(Order=SalesOrder):
+    """订单列表/导出所需的列（含JOIN得到的渠道名称），Order为在线表或归档表模型"""
+    return select(
+        Order.order_id,
+        Order.customer_user_id,
+        Order.channel_id,
+        SalesChannel.channel_name,
+        Order.order_amount,
+        Order.order_status,
+        Order.order_date,
+        Order.created_at,
+        Order.updated_at,
+    ).join(
+        SalesChannel, Order.channel_id == SalesChannel.channel_id
+    )
+
+def _order_filters(
+    Order,
+    order_status: Optional[str],
+    channel_id: Optional[int],
+    customer_user_id: Optional[str],
+    start_date: Optional[date],
+    end_date: Optional[date],
+) -> list:
+    filters = []
+    if order_status is not None:
+        filters.append(Order.order_status == order_status)
+    if channel_id is not None:
+        filters.append(Order.channel_id == channel_id)
+    if customer_user_id is not None:
+        filters.append(Order.customer_user_id == customer_user_id)
+    if start_date is not None:
+        filters.append(Order.order_date >= datetime.combine(start_date, time.min))
+    if end_date is not None:
+        filters.append(Order.order_date < datetime.combine(end_date + timedelta(days=1), time.min))
+    return filters
+
 @router.get("/", response_model=List[dict])
-def read_sales_orders(
-    db: Session = Depends(deps.get_db),
+async def read_sales_orders(
+    response: Response,
+    db: AsyncSession = Depends(deps.get_async_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    order_status: Optional[str] = None,
+    channel_id: Optional[int] = None,
+    customer_user_id: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    sort_by: Literal["order_id", "order_date"] = "order_id",
+    order: Literal["asc", "desc"] = "asc",
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    获取销售订单列表
+    获取销售订单列表（传入cursor时按游标分页，下一页游标见X-Next-Cursor响应头）
+    过滤条件均为等值或范围条件，分别命中 (channel_id|order_status|customer_user_id, order_date)
+    复合索引或 order_date 索引；排序仅支持 order_id 与 order_date。
+    start_date早于归档分界时间（或未指定）时同时读取归档订单
     """
-    # JOIN查询以获取渠道名称
-    orders_with_channels = db.query(
-        SalesOrder,
-        SalesChannel.channel_name
-    ).join(
-        SalesChannel, SalesOrder.channel_id == SalesChannel.channel_id
-    ).offset(skip).limit(limit).all()
+    names = ORDER_SORT_COLUMNS[sort_by]
+    descending = order == "desc"
+    filters = (order_status, channel_id, customer_user_id, start_date, end_date)
+    models = order_models(start_date)
+
+    # 直接查询所需列，不构造ORM对象
+    if len(models) == 1:
+        keyset = Keyset(*[getattr(SalesOrder, n) for n in names], descending=descending)
+        query = keyset.apply(
+            _order_rows(SalesOrder).where(*_order_filters(SalesOrder, *filters)), cursor, skip, limit
+        )
+    else:
+        # 在线表与归档表各自按索引取前 skip+limit+1 行，合并后再排序分页
+        branches = [
+            select(
+                Keyset(*[getattr(Order, n) for n in names], descending=descending).apply(
+                    _order_rows(Order).where(*_order_filters(Order, *filters)), cursor, 0, skip + limit
+                ).subquery()
+            )
+            for Order, _ in models
+        ]
+        merged = union_all(*branches).subquery()
+        keyset = Keyset(*[merged.c[n] for n in names], descending=descending)
+        query = keyset.apply(select(merged), cursor, skip, limit)
+
+    rows = (await db.execute(query)).all()
+    rows, next_cursor = keyset.split(
+        rows, limit, key=lambda row: [getattr(row, n) for n in names]
+    )
+    set_next_cursor(response, next_cursor)
     
     # 转换为字典格式
-    result = []
-    for order, channel_name in orders_with_channels:
-        result.append({
-            "order_id": order.order_id,
-            "customer_user_id": order.customer_user_id,
-            "channel_id": order.channel_id,
-            "channel_name": channel_name,
-            "order_amount": float(order.order_amount),
-            "order_status": order.order_status,
-            "order_date": order.order_date.isoformat() if order.order_date else None,
-            "created_at": order.created_at.isoformat() if order.created_at else None,
-            "updated_at": order.updated_at.isoformat() if order.updated_at else None
-        })
-    
-    return result
+    return [
+        {
+            "order_id": row.order_id,
+            "customer_user_id": row.customer_user_id,
+            "channel_id": row.channel_id,
+            "channel_name": row.channel_name,
+            "order_amount": float(row.order_amount),
+            "order_status": row.order_status,
+            "order_date": row.order_date.isoformat() if row.order_date else None,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+            "updated_at": row.updated_at.isoformat() if row.updated_at else None
+        }
+        for row in rows
+    ]
+
+@router.get("/export")
+async def export_sales_orders(
+    format: Literal["csv", "ndjson"] = "csv",
+    gzip: bool = False,
+    order_status: Optional[str] = None,
+    channel_id: Optional[int] = None,
+    customer_user_id: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    流式导出销售订单（CSV或NDJSON，可选gzip压缩），过滤条件与列表接口一致
+    """
+    filters = (order_status, channel_id, customer_user_id, start_date, end_date)
+    branches = [
+        _order_rows(Order).where(*_order_filters(Order, *filters))
+        for Order, _ in order_models(start_date)
+    ]
+    if len(branches) == 1:
+        query = branches[0].order_by(SalesOrder.order_id)
+    else:
+        merged = union_all(*branches).subquery()
+        query = select(merged).order_by(merged.c.order_id)
+    return export_response(query, "sales_orders", format, gzip)
 
 @router.post("/", response_model=schemas.SalesOrder)
 def create_sales_order(
@@ -57,9 +170,16 @@ def create_sales_order(
     """
     # 检查订单ID是否已存在
     order = db.query(SalesOrder).filter(SalesOrder.order_id == order_in.order_id).first()
-    if order:
+    if order or db.get(ARCHIVE[0], order_in.order_id):
         raise HTTPException(status_code=400, detail="Order ID already exists")
     
+    # 扣减库存（条件UPDATE，库存不足时整单失败）
+    try:
+        reserve_stock(db, ((item.product_id, item.quantity) for item in order_in.order_items))
+    except InsufficientStock as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=str(e))
+    
     # 创建订单
     order_data = order_in.dict(exclude={"order_items"})
     order = SalesOrder(**order_data)
@@ -71,66 +191,125 @@ def create_sales_order(
         item = SalesOrderItem(order_id=order.order_id, **item_data.dict())
         db.add(item)
     
+    # 同一事务内维护日销售汇总
+    apply_rollup_changes(db, added=[order_snapshot(order)])
+    
     db.commit()
     db.refresh(order)
     return order
 
-@router.get("/{order_id}", response_model=dict)
-def read_sales_order(
-    order_id: int,
+@router.post("/bulk", response_model=schemas.SalesOrderBulkResponse)
+def create_sales_orders_bulk(
+    *,
     db: Session = Depends(deps.get_db),
+    bulk_in: schemas.SalesOrderBulkCreate,
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    获取指定的销售订单（包含订单项和产品信息）
+    批量创建销售订单（逐行返回结果，校验失败的订单不影响其余订单写入）
     """
-    # 获取订单基本信息
-    order_with_channel = db.query(
-        SalesOrder,
-        SalesChannel.channel_name
-    ).join(
-        SalesChannel, SalesOrder.channel_id == SalesChannel.channel_id
-    ).filter(SalesOrder.order_id == order_id).first()
-    
-    if not order_with_channel:
-        raise HTTPException(status_code=404, detail="Order not found")
-    
-    order, channel_name = order_with_channel
-    
-    # 获取订单项信息（包含产品信息）
-    order_items_with_products = db.query(
-        SalesOrderItem,
-        Product.product_name
-    ).join(
-        Product, SalesOrderItem.product_id == Product.product_id
-    ).filter(SalesOrderItem.order_id == order_id).all()
-    
-    # 构造订单项列表
-    items = []
-    for item, product_name in order_items_with_products:
-        items.append({
-            "order_item_id": item.order_item_id,
-            "product_id": item.product_id,
-            "product_name": product_name,
-            "quantity": item.quantity,
-            "unit_price": float(item.unit_price),
-            "total_price": float(item.total_price)
-        })
-    
-    # 返回完整订单信息
+    if len(bulk_in.orders) > settings.BULK_ORDER_MAX_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.BULK_ORDER_MAX_SIZE} orders per request",
+        )
+    try:
+        return bulk_create_orders(db, bulk_in.orders)
+    except IntegrityError:
+        # 校验后被并发请求抢先写入同一订单ID
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Bulk insert conflicted with concurrent writes, please retry")
+
+# 批量获取订单详情时单次请求的最大订单数
+MAX_BATCH_IDS = 200
+
+def _order_detail(order: SalesOrder) -> dict:
+    """将已预加载渠道、订单项及产品的订单转换为详情字典"""
     return {
         "order_id": order.order_id,
         "customer_user_id": order.customer_user_id,
         "channel_id": order.channel_id,
-        "channel_name": channel_name,
+        "channel_name": order.channel.channel_name if order.channel else None,
         "order_amount": float(order.order_amount),
         "order_status": order.order_status,
         "order_date": order.order_date.isoformat() if order.order_date else None,
         "created_at": order.created_at.isoformat() if order.created_at else None,
         "updated_at": order.updated_at.isoformat() if order.updated_at else None,
-        "order_items": items
+        "order_items": [
+            {
+                "order_item_id": item.order_item_id,
+                "product_id": item.product_id,
+                "product_name": item.product.product_name if item.product else None,
+                "quantity": item.quantity,
+                "unit_price": float(item.unit_price),
+                "total_price": float(item.total_price)
+            }
+            for item in order.order_items
+        ]
     }
 
+@router.get("/batch", response_model=dict)
+async def read_sales_orders_batch(
+    ids: str = Query(..., description="逗号分隔的订单ID"),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    批量获取订单详情（包含订单项和产品信息），按传入顺序返回，不存在的订单ID见missing
+    查询次数固定：订单+渠道一条JOIN语句，订单项+产品一条IN语句；有订单不在在线表时再查一次归档表
+    """
+    try:
+        order_ids = list(dict.fromkeys(int(v) for v in ids.split(",") if v.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+    if not order_ids:
+        raise HTTPException(status_code=400, detail="ids is required")
+    if len(order_ids) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_IDS} ids per request")
+
+    by_id = {}
+    for Order, Item in (SalesOrder, SalesOrderItem), ARCHIVE:
+        # 在线表中找不到的订单再到归档表查找
+        pending = [i for i in order_ids if i not in by_id]
+        if not pending:
+            break
+        orders = (await db.execute(
+            select(Order).where(Order.order_id.in_(pending)).options(
+                joinedload(Order.channel),
+                selectinload(Order.order_items).joinedload(Item.product),
+            )
+        )).scalars().all()
+        by_id.update((order.order_id, order) for order in orders)
+    return {
+        "orders": [_order_detail(by_id[i]) for i in order_ids if i in by_id],
+        "missing": [i for i in order_ids if i not in by_id],
+    }
+
+@router.get("/{order_id}", response_model=dict)
+async def read_sales_order(
+    order_id: int,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    获取指定的销售订单（包含订单项和产品信息，一条JOIN语句预加载，含已归档订单）
+    """
+    for Order, Item in (SalesOrder, SalesOrderItem), ARCHIVE:
+        # 在线表中找不到时再查归档表
+        order = (await db.execute(
+            select(Order).where(Order.order_id == order_id).options(
+                joinedload(Order.channel),
+                joinedload(Order.order_items).joinedload(Item.product),
+            )
+        )).unique().scalar_one_or_none()
+        if order:
+            break
+    
+    if not order:
+        raise HTTPException(status_code=404, detail="Order not found")
+    
+    return _order_detail(order)
+
 @router.put("/{order_id}", response_model=schemas.SalesOrder)
 def update_sales_order(
     *,
@@ -146,10 +325,15 @@ def update_sales_order(
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     
+    before = order_snapshot(order)
     update_data = order_in.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(order, field, value)
     
+    after = order_snapshot(order)
+    if after != before:
+        apply_rollup_changes(db, added=[after], removed=[before])
+    
     db.add(order)
     db.commit()
     db.refresh(order)
@@ -169,18 +353,25 @@ def delete_sales_order(
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     
+    apply_rollup_changes(db, removed=[order_snapshot(order)])
     db.delete(order)
     db.commit()
     return {"message": "Order deleted successfully"}
 
 @router.get("/{order_id}/items", response_model=List[schemas.SalesOrderItem])
-def read_order_items(
+async def read_order_items(
     order_id: int,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     获取订单的商品项列表
     """
-    items = db.query(SalesOrderItem).filter(SalesOrderItem.order_id == order_id).all()
+    for Item in SalesOrderItem, ARCHIVE[1]:
+        # 在线表中没有时再查归档表
+        items = (await db.execute(
+            select(Item).where(Item.order_id == order_id)
+        )).scalars().all()
+        if items:
+            break
     return items 
\ No newline at end of file
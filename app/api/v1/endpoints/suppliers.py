@@ -1,8 +1,9 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from app import schemas
 from app.api import deps
+from app.core.pagination import Keyset, set_next_cursor
 from app.models.supplier import Supplier
 from app.models.user import User
 
@@ -10,15 +11,21 @@ router = APIRouter()
 
 @router.get("/", response_model=List[schemas.Supplier])
 def read_suppliers(
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    获取供应商列表
+    获取供应商列表（传入cursor时按游标分页）
     """
-    suppliers = db.query(Supplier).offset(skip).limit(limit).all()
+    keyset = Keyset(Supplier.supplier_id)
+    suppliers, next_cursor = keyset.split(
+        keyset.apply(db.query(Supplier), cursor, skip, limit).all(), limit
+    )
+    set_next_cursor(response, next_cursor)
     return suppliers
 
 @router.post("/", response_model=schemas.Supplier)
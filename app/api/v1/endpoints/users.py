@@ -1,9 +1,10 @@
-from typing import Any, List
+from typing import Any, List, Optional
 from fastapi import APIRouter, Body, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app import schemas
 from app.api import deps
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash_async
 from app.models.user import User
 
 router = APIRouter()
@@ -21,8 +22,14 @@ def read_users(
     users = db.query(User).offset(skip).limit(limit).all()
     return users
 
+def _save_user(db: Session, user: User) -> User:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
 @router.post("/", response_model=schemas.User)
-def create_user(
+async def create_user(
     *,
     db: Session = Depends(deps.get_db),
     user_in: schemas.UserCreate,
@@ -31,22 +38,22 @@ def create_user(
     """
     Create new user.
     """
-    user = db.query(User).filter(User.username == user_in.username).first()
+    user = await run_in_threadpool(
+        lambda: db.query(User).filter(User.username == user_in.username).first()
+    )
     if user:
         raise HTTPException(
             status_code=400,
             detail="The user with this username already exists in the system.",
         )
+    # 密码哈希在有界的密码线程池中计算，与登录校验共用
     user = User(
         username=user_in.username,
-        password_hash=get_password_hash(user_in.password),
+        password_hash=await get_password_hash_async(user_in.password),
         full_name=user_in.full_name,
         role=user_in.role,
     )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return user
+    return await run_in_threadpool(_save_user, db, user)
 
 @router.get("/me", response_model=schemas.User)
 def read_user_me(
@@ -69,4 +76,70 @@ def read_user_by_id(
     user = db.query(User).filter(User.user_id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return user 
\ No newline at end of file
+    return user 
+
+def _update_user(
+    db: Session, user_id: int, user_in: schemas.UserUpdate, password_hash: Optional[str]
+) -> User:
+    user = db.query(User).filter(User.user_id == user_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    if user_in.username != user.username:
+        existing = db.query(User).filter(User.username == user_in.username).first()
+        if existing:
+            raise HTTPException(
+                status_code=400,
+                detail="The user with this username already exists in the system.",
+            )
+    
+    old_username = user.username
+    update_data = user_in.dict(exclude_unset=True)
+    update_data.pop("password", None)
+    if password_hash:
+        user.password_hash = password_hash
+    for field, value in update_data.items():
+        setattr(user, field, value)
+    
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    deps.invalidate_principal(old_username)
+    deps.invalidate_principal(user.username)
+    return user
+
+@router.put("/{user_id}", response_model=schemas.User)
+async def update_user(
+    *,
+    db: Session = Depends(deps.get_db),
+    user_id: int,
+    user_in: schemas.UserUpdate,
+    current_user: User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Update a user.
+    """
+    password_hash = None
+    if user_in.password:
+        password_hash = await get_password_hash_async(user_in.password)
+    return await run_in_threadpool(_update_user, db, user_id, user_in, password_hash)
+
+@router.delete("/{user_id}")
+def delete_user(
+    *,
+    db: Session = Depends(deps.get_db),
+    user_id: int,
+    current_user: User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Delete a user.
+    """
+    user = db.query(User).filter(User.user_id == user_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    username = user.username
+    db.delete(user)
+    db.commit()
+    deps.invalidate_principal(username)
+    return {"message": "User deleted successfully"}
@@ -0,0 +1,173 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+# 进程内缓存注册表，便于统一查看命中率
+_registry: Dict[str, Any] = {}
+
+
+class TTLCache:
+    """
+    线程安全的进程内缓存，支持过期时间(TTL)与LRU淘汰，并记录命中/未命中次数
+    """
+
+    def __init__(self, name: str, maxsize: int = 1024, ttl: float = 60.0):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        _registry[name] = self
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """获取缓存值，过期或不存在时返回default"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at <= now:
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """写入缓存值，ttl为空时使用默认过期时间"""
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """删除指定缓存项"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """返回缓存统计信息"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class SnapshotCache:
+    """
+    单值快照缓存：在过期前refresh_ahead秒起由后台线程提前刷新，
+    请求始终读取已有快照；没有可用快照时并发请求合并为一次计算
+    """
+
+    def __init__(self, name: str, loader: Callable[[], Any], ttl: float = 60.0, refresh_ahead: float = 0.0):
+        self.name = name
+        self.loader = loader
+        self.ttl = ttl
+        self.refresh_ahead = min(refresh_ahead, ttl)
+        self._value: Any = None
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._refreshing = False
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        _registry[name] = self
+
+    def _fresh(self, now: float) -> bool:
+        return self._loaded_at is not None and now - self._loaded_at < self.ttl
+
+    def get(self) -> Any:
+        """返回当前快照，必要时计算或触发后台刷新"""
+        if self.ttl <= 0:
+            return self.loader()
+        now = time.monotonic()
+        with self._lock:
+            if self._fresh(now):
+                self.hits += 1
+                if now - self._loaded_at >= self.ttl - self.refresh_ahead and not self._refreshing:
+                    self._refreshing = True
+                    threading.Thread(target=self._refresh, name=f"{self.name}-refresh", daemon=True).start()
+                return self._value
+            self.misses += 1
+        return self._load()
+
+    def _load(self) -> Any:
+        # 同一时刻只有一个线程执行loader，其余线程等待后直接使用其结果
+        with self._load_lock:
+            with self._lock:
+                if self._fresh(time.monotonic()):
+                    return self._value
+            value = self.loader()
+            with self._lock:
+                self._value = value
+                self._loaded_at = time.monotonic()
+            return value
+
+    def _refresh(self) -> None:
+        try:
+            with self._load_lock:
+                value = self.loader()
+                with self._lock:
+                    self._value = value
+                    self._loaded_at = time.monotonic()
+                    self.refreshes += 1
+        except Exception:
+            # 刷新失败时保留旧快照，过期后由请求线程重新计算
+            logger.exception("Background refresh of %s failed", self.name)
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def invalidate(self) -> None:
+        """丢弃当前快照"""
+        with self._lock:
+            self._loaded_at = None
+            self._value = None
+
+    def stats(self) -> Dict[str, Any]:
+        """返回缓存统计信息"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            age = time.monotonic() - self._loaded_at if self._loaded_at is not None else None
+            return {
+                "ttl": self.ttl,
+                "refresh_ahead": self.refresh_ahead,
+                "age": round(age, 3) if age is not None else None,
+                "hits": self.hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """返回所有已注册缓存的统计信息"""
+    return {name: cache.stats() for name, cache in _registry.items()}
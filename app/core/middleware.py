@@ -0,0 +1,105 @@
+import logging
+import time
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.db.query_stats import QueryStats, current_query_stats
+from app.db.session import replica_reads_allowed
+
+logger = logging.getLogger(__name__)
+
+# 只读请求方法
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# 写操作后在该Cookie有效期内的读请求继续走主库（读己之写）
+PRIMARY_STICKY_COOKIE = "db_primary_until"
+
+class ReadReplicaMiddleware:
+    """
+    读写分离中间件：
+    只读请求允许会话读从库；写请求成功后下发Cookie，
+    有效期内同一客户端的读请求仍走主库，请求头 X-Read-Consistency: strong 可强制读主库
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        is_read = scope["method"] in SAFE_METHODS
+        if is_read:
+            token = replica_reads_allowed.set(self._replica_allowed(Headers(scope=scope)))
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                replica_reads_allowed.reset(token)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                sticky = settings.DATABASE_REPLICA_STICKY_SECONDS
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie",
+                    f"{PRIMARY_STICKY_COOKIE}={time.time() + sticky:.3f}; "
+                    f"Max-Age={sticky}; Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper if settings.DATABASE_REPLICA_URLS else send)
+
+    @staticmethod
+    def _replica_allowed(headers: Headers) -> bool:
+        if headers.get("x-read-consistency", "").lower() == "strong":
+            return False
+        cookies = cookie_parser(headers.get("cookie", ""))
+        try:
+            return float(cookies.get(PRIMARY_STICKY_COOKIE, 0)) < time.time()
+        except ValueError:
+            return True
+
+class QueryStatsMiddleware:
+    """
+    请求级SQL统计中间件：
+    统计每个请求执行的语句数与数据库总耗时，通过 X-DB-Queries / Server-Timing 响应头返回，
+    同一语句形状在单个请求内重复次数超过阈值时记录N+1告警
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("X-DB-Queries", str(stats.count))
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.total_time * 1000:.2f};desc="{stats.count} queries"',
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_query_stats.reset(token)
+            threshold = settings.N_PLUS_ONE_THRESHOLD
+            for shape, times in stats.repeated_shapes(threshold):
+                logger.warning(
+                    "Possible N+1 query: %s %s executed the same statement %d times "
+                    "(threshold %d): %s",
+                    scope["method"], scope["path"], times, threshold, shape[:500],
+                )
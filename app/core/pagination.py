@@ -0,0 +1,97 @@
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response
+from sqlalchemy import and_, or_
+
+# 列表接口通过该响应头返回下一页游标
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"dec": str(value)}
+    return value
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "dec" in value:
+            return Decimal(value["dec"])
+    return value
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """将(排序键, 主键)编码为不透明游标"""
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """解析游标，格式错误时返回400"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list):
+            raise ValueError(cursor)
+        return [_decode_value(v) for v in values]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+class Keyset:
+    """
+    基于(排序键, 主键)的游标分页：
+    翻到第N页与第一页代价相同，最后一列必须是唯一键以保证排序稳定
+    """
+
+    def __init__(self, *columns: Any, descending: bool = False):
+        self.columns = columns
+        self.descending = descending
+
+    def _after(self, values: Sequence[Any]):
+        """构造“位于游标之后”的条件：(a > x) OR (a = x AND b > y) ..."""
+        if len(values) != len(self.columns):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        clauses = []
+        for i, column in enumerate(self.columns):
+            beyond = column < values[i] if self.descending else column > values[i]
+            equals = [self.columns[j] == values[j] for j in range(i)]
+            clauses.append(and_(*equals, beyond))
+        return or_(*clauses)
+
+    def apply(self, query: Any, cursor: Optional[str], skip: int, limit: int) -> Any:
+        """
+        为查询（Query或Select）添加稳定排序与分页，多取一行用于判断是否有下一页；
+        提供游标时忽略skip
+        """
+        order = [c.desc() if self.descending else c.asc() for c in self.columns]
+        query = query.order_by(*order)
+        if cursor:
+            query = query.filter(self._after(decode_cursor(cursor)))
+        elif skip:
+            query = query.offset(skip)
+        return query.limit(limit + 1)
+
+    def split(
+        self, rows: Sequence[Any], limit: int, key: Optional[Callable[[Any], Sequence[Any]]] = None
+    ) -> Tuple[List[Any], Optional[str]]:
+        """截取本页数据并生成下一页游标（没有下一页时为None）"""
+        rows = list(rows)
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        last = rows[-1]
+        values = key(last) if key else [getattr(last, c.key) for c in self.columns]
+        return rows, encode_cursor(values)
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    """通过响应头返回下一页游标"""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
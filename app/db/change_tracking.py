@@ -0,0 +1,56 @@
+import threading
+from collections import defaultdict
+from itertools import chain
+from typing import Callable, Dict, Iterable, List
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+# 每张表的写入版本号，事务提交后递增，用于使基于该表的缓存失效
+_versions: Dict[str, int] = defaultdict(int)
+_subscribers: Dict[str, List[Callable[[], None]]] = defaultdict(list)
+_lock = threading.Lock()
+
+def table_version(table: str) -> int:
+    """返回表的当前写入版本号"""
+    return _versions[table]
+
+def subscribe(table: str, callback: Callable[[], None]) -> None:
+    """注册表写入回调，事务提交后调用"""
+    _subscribers[table].append(callback)
+
+def mark_changed(tables: Iterable[str]) -> None:
+    """标记表已被写入：递增版本号并通知订阅者"""
+    tables = set(tables)
+    with _lock:
+        for table in tables:
+            _versions[table] += 1
+    for table in tables:
+        for callback in _subscribers.get(table, ()):
+            callback()
+
+def _pending(session: Session) -> set:
+    return session.info.setdefault("changed_tables", set())
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session, flush_context):
+    tables = _pending(session)
+    for obj in chain(session.new, session.dirty, session.deleted):
+        tables.update(t.name for t in inspect(obj).mapper.tables)
+
+@event.listens_for(Session, "do_orm_execute")
+def _do_orm_execute(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None:
+            _pending(orm_execute_state.session).add(table.name)
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session):
+    tables = session.info.pop("changed_tables", None)
+    if tables:
+        mark_changed(tables)
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session):
+    session.info.pop("changed_tables", None)
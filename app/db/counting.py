@@ -0,0 +1,82 @@
+from typing import Optional
+
+from sqlalchemy import column, func, select, table
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.change_tracking import table_version
+
+# 列表接口 total 参数的取值：不统计 / 表统计信息估算 / 精确计数（带缓存）
+TOTAL_MODES = ("none", "estimate", "exact")
+
+# 精确计数缓存，键包含表写入版本号，表被写入后自动失效
+count_cache = TTLCache(
+    "exact_count",
+    maxsize=settings.COUNT_CACHE_MAX_SIZE,
+    ttl=settings.COUNT_CACHE_TTL_SECONDS,
+)
+
+def _count_statement(stmt: Select) -> Select:
+    return select(func.count()).select_from(stmt.order_by(None).subquery())
+
+def _cache_key(stmt: Select, table_name: str) -> tuple:
+    """过滤条件签名：SQL文本 + 绑定参数"""
+    compiled = stmt.compile()
+    params = tuple(sorted((k, repr(v)) for k, v in compiled.params.items()))
+    return (table_name, table_version(table_name), str(compiled), params)
+
+def _estimate_statement(dialect_name: str, table_name: str) -> Optional[Select]:
+    """基于表统计信息的行数估算语句，不支持的数据库返回None"""
+    if dialect_name == "mysql":
+        tables = table("TABLES", column("TABLE_ROWS"), column("TABLE_SCHEMA"), column("TABLE_NAME"),
+                       schema="information_schema")
+        return select(tables.c.TABLE_ROWS).where(
+            tables.c.TABLE_SCHEMA == func.database(),
+            tables.c.TABLE_NAME == table_name,
+        )
+    if dialect_name == "postgresql":
+        pg_class = table("pg_class", column("reltuples"), column("relname"))
+        return select(pg_class.c.reltuples).where(pg_class.c.relname == table_name)
+    return None
+
+def count_rows(db: Session, stmt: Select, table_name: str, mode: str, filtered: bool) -> Optional[int]:
+    """
+    按计数策略统计查询结果总数：
+    none返回None；estimate对无过滤条件的列表使用表统计信息；其余情况使用带缓存的精确计数
+    """
+    if mode == "none":
+        return None
+    if mode == "estimate" and not filtered:
+        estimate = _estimate_statement(db.get_bind().dialect.name, table_name)
+        if estimate is not None:
+            value = db.scalar(estimate)
+            if value is not None:
+                return max(int(value), 0)
+    key = _cache_key(stmt, table_name)
+    total = count_cache.get(key)
+    if total is None:
+        total = db.scalar(_count_statement(stmt))
+        count_cache.set(key, total)
+    return total
+
+async def count_rows_async(
+    db: AsyncSession, stmt: Select, table_name: str, mode: str, filtered: bool
+) -> Optional[int]:
+    """count_rows 的异步会话版本"""
+    if mode == "none":
+        return None
+    if mode == "estimate" and not filtered:
+        estimate = _estimate_statement(db.bind.dialect.name, table_name)
+        if estimate is not None:
+            value = await db.scalar(estimate)
+            if value is not None:
+                return max(int(value), 0)
+    key = _cache_key(stmt, table_name)
+    total = count_cache.get(key)
+    if total is None:
+        total = await db.scalar(_count_statement(stmt))
+        count_cache.set(key, total)
+    return total
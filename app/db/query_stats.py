@@ -0,0 +1,81 @@
+import json
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+# 占位符列表（IN (?, ?, ?) / IN (%s, %s)）归一化为单个占位符
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%s|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+def statement_shape(statement: str) -> str:
+    """将SQL语句归一化为形状，用于识别同一语句在循环中的重复执行"""
+    shape = _PLACEHOLDER_LIST.sub("(?)", statement)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+class QueryStats:
+    """
+    单个请求内的SQL执行统计：语句数、数据库耗时及各语句形状的执行次数
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_time = 0.0
+        self.shapes: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        shape = statement_shape(statement)
+        with self._lock:
+            self.count += 1
+            self.total_time += elapsed
+            self.shapes[shape] += 1
+
+    def repeated_shapes(self, threshold: int) -> List[Tuple[str, int]]:
+        """返回执行次数超过阈值的语句形状"""
+        with self._lock:
+            return [(shape, n) for shape, n in self.shapes.most_common() if n > threshold]
+
+# 已采集的语句形状（每种形状只采集一次）
+_captured_shapes: set = set()
+_capture_lock = threading.Lock()
+
+def capture_statement(statement: str, parameters: Any, executemany: bool) -> None:
+    """
+    将首次出现的语句形状及一组样例参数追加写入SQL_CAPTURE_PATH（JSON Lines），
+    供 explain_query_shapes.py 回放EXPLAIN
+    """
+    shape = statement_shape(statement)
+    with _capture_lock:
+        if shape in _captured_shapes:
+            return
+        _captured_shapes.add(shape)
+        if executemany and parameters:
+            parameters = parameters[0]
+        record = {"shape": shape, "statement": statement, "parameters": parameters}
+        with open(settings.SQL_CAPTURE_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+# 当前请求的统计对象，由QueryStatsMiddleware设置
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_query_stats.get() is not None and context is not None:
+        context._query_start_time = time.perf_counter()
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_query_stats.get()
+    start = getattr(context, "_query_start_time", None)
+    if stats is not None and start is not None:
+        stats.record(statement, time.perf_counter() - start)
+    if settings.SQL_CAPTURE_PATH:
+        capture_statement(statement, parameters, executemany)
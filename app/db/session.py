@@ -1,13 +1,157 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import itertools
+import threading
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+from sqlalchemy.sql import Select
 
 from app.core.config import settings
+from app.db import change_tracking  # noqa: 注册表写入跟踪事件
+
+# 同步驱动到异步驱动的映射
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+# 当前请求是否可以读从库（由ReadReplicaMiddleware按请求设置）
+replica_reads_allowed: ContextVar[bool] = ContextVar("replica_reads_allowed", default=False)
+
+def get_async_database_url(url: str) -> str:
+    """根据同步数据库URL推导异步驱动URL"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"Unsupported database backend for async engine: {backend}")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+def engine_options(url: str) -> Dict[str, Any]:
+    """连接池参数（SQLite本地运行时不使用连接池参数）"""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {"pool_pre_ping": True, "pool_size": 10, "max_overflow": 20}
+
+class ReplicaSelector:
+    """
+    从库选择器，支持轮询(round_robin)与最少活跃连接(least_loaded)两种策略
+    """
+
+    def __init__(self, engines: List[Engine], strategy: str = "round_robin"):
+        if strategy not in ("round_robin", "least_loaded"):
+            raise ValueError(f"Unknown replica strategy: {strategy}")
+        self.engines = engines
+        self.strategy = strategy
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._in_use: Dict[Engine, int] = {e: 0 for e in engines}
+        for e in engines:
+            event.listen(e, "checkout", self._make_listener(e, 1))
+            event.listen(e, "checkin", self._make_listener(e, -1))
+
+    def _make_listener(self, engine: Engine, delta: int):
+        def listener(*args: Any) -> None:
+            with self._lock:
+                self._in_use[engine] += delta
+        return listener
+
+    def choose(self) -> Optional[Engine]:
+        """选择一个从库，未配置从库时返回None"""
+        if not self.engines:
+            return None
+        if self.strategy == "least_loaded":
+            with self._lock:
+                return min(self.engines, key=lambda e: self._in_use[e])
+        return self.engines[next(self._counter) % len(self.engines)]
+
+class RoutingSession(Session):
+    """
+    读写分离会话：只读请求中的查询路由到从库；
+    flush、DML、SELECT ... FOR UPDATE及会话内发生过写操作后的查询全部走主库
+    """
+
+    primary: Engine
+    replicas: ReplicaSelector
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        is_read = isinstance(clause, Select) and clause._for_update_arg is None
+        if self._flushing or (clause is not None and not is_read):
+            # 会话已写入，后续读取需要看到自己的写入
+            self.info["use_primary"] = True
+        if not is_read or self.info.get("use_primary") or not replica_reads_allowed.get():
+            return self.primary
+        # 同一会话内固定使用同一从库，保证读取一致
+        replica = self.info.get("replica")
+        if replica is None:
+            replica = self.replicas.choose()
+            if replica is None:
+                return self.primary
+            self.info["replica"] = replica
+        return replica
+
+    def use_primary(self) -> None:
+        """强制本会话后续查询走主库"""
+        self.info["use_primary"] = True
 
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+    **engine_options(settings.DATABASE_URL)
+)
+
+replica_engines = [
+    create_engine(url, **engine_options(url))
+    for url in settings.DATABASE_REPLICA_URLS
+]
+
+class PrimaryReplicaSession(RoutingSession):
+    primary = engine
+    replicas = ReplicaSelector(replica_engines, settings.DATABASE_REPLICA_STRATEGY)
+
+SessionLocal = sessionmaker(
+    class_=PrimaryReplicaSession, autocommit=False, autoflush=False, bind=engine
+)
+
+# 异步引擎，供高频只读接口使用
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or get_async_database_url(settings.DATABASE_URL)
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    **engine_options(ASYNC_DATABASE_URL)
+)
+
+async_replica_engines = [
+    create_async_engine(get_async_database_url(url), **engine_options(url))
+    for url in settings.DATABASE_REPLICA_URLS
+]
+
+class AsyncPrimaryReplicaSession(RoutingSession):
+    primary = async_engine.sync_engine
+    replicas = ReplicaSelector(
+        [e.sync_engine for e in async_replica_engines], settings.DATABASE_REPLICA_STRATEGY
+    )
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    sync_session_class=AsyncPrimaryReplicaSession,
+    autoflush=False,
+    expire_on_commit=False,
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine) 
\ No newline at end of file
+@asynccontextmanager
+async def isolated_async_sessionmaker() -> AsyncIterator[async_sessionmaker]:
+    """
+    在应用事件循环之外（后台任务线程、Celery任务中的asyncio.run）使用的异步会话工厂：
+    异步连接不能跨事件循环复用，因此使用独立的无连接池引擎，退出时释放
+    """
+    isolated_engine = create_async_engine(ASYNC_DATABASE_URL, poolclass=NullPool)
+    try:
+        yield async_sessionmaker(bind=isolated_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    finally:
+        await isolated_engine.dispose()
@@ -0,0 +1,57 @@
+from typing import Any, Dict, Iterable, List, Sequence
+
+from sqlalchemy import Table
+from sqlalchemy.orm import Session
+
+def build_upsert(
+    dialect_name: str,
+    table: Table,
+    key_columns: Sequence[str],
+    set_columns: Iterable[str] = (),
+    increment_columns: Iterable[str] = (),
+) -> Any:
+    """
+    构造方言相关的插入或更新语句：
+    MySQL使用 INSERT ... ON DUPLICATE KEY UPDATE，SQLite/PostgreSQL使用 ON CONFLICT DO UPDATE；
+    set_columns 冲突时覆盖为新值，increment_columns 冲突时在原值上累加
+    """
+    if dialect_name == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table)
+        new = stmt.inserted
+    elif dialect_name in ("sqlite", "postgresql"):
+        if dialect_name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(table)
+        new = stmt.excluded
+    else:
+        raise ValueError(f"Upsert is not supported for dialect: {dialect_name}")
+
+    updates: Dict[str, Any] = {c: new[c] for c in set_columns}
+    updates.update({c: table.c[c] + new[c] for c in increment_columns})
+
+    if not updates:
+        # 冲突时保持原行不变
+        if dialect_name == "mysql":
+            return stmt.on_duplicate_key_update({key_columns[0]: table.c[key_columns[0]]})
+        return stmt.on_conflict_do_nothing(index_elements=list(key_columns))
+    if dialect_name == "mysql":
+        return stmt.on_duplicate_key_update(updates)
+    return stmt.on_conflict_do_update(index_elements=list(key_columns), set_=updates)
+
+def upsert(
+    db: Session,
+    table: Table,
+    rows: List[Dict[str, Any]],
+    key_columns: Sequence[str],
+    set_columns: Iterable[str] = (),
+    increment_columns: Iterable[str] = (),
+) -> None:
+    """批量插入或更新（executemany），在调用方的事务中执行"""
+    if not rows:
+        return
+    dialect_name = db.get_bind().dialect.name
+    stmt = build_upsert(dialect_name, table, key_columns, set_columns, increment_columns)
+    db.execute(stmt, rows)
@@ -1,7 +1,10 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.api import api_router
+from app.core.cache import cache_stats
 from app.core.config import settings
+from app.core.middleware import QueryStatsMiddleware, ReadReplicaMiddleware
+from app.services.jobs import recover_jobs
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -17,15 +20,33 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-DB-Queries", "Server-Timing", "X-Next-Cursor"],
     )
 
+# 读写分离：只读请求路由到从库
+app.add_middleware(ReadReplicaMiddleware)
+
+# 请求级SQL统计与N+1检测
+app.add_middleware(QueryStatsMiddleware)
+
 # 添加API路由
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+@app.on_event("startup")
+def resume_background_jobs():
+    """进程内执行后台任务时，重新提交重启前未执行的任务"""
+    if settings.JOB_BACKEND == "thread":
+        recover_jobs()
+
 @app.get("/")
 def root():
     return {"message": f"Welcome to {settings.PROJECT_NAME}"}
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"} 
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/health/caches")
+def cache_health_check():
+    """进程内缓存命中统计"""
+    return cache_stats()
@@ -2,11 +2,15 @@
 from .user import User
 from .sales_channel import SalesChannel
 from .sales_order import SalesOrder, SalesOrderItem
+from .sales_rollup import DailySalesRollup
+from .sales_order_archive import SalesOrderArchive, SalesOrderItemArchive
 from .product import Product
 from .inventory import Inventory, InventoryAlert
 from .supplier import Supplier
 from .synced_order import SyncedChannelOrder, SyncedChannelOrderItem
 from .order_sync_log import OrderSyncLog
+from .channel_sync_state import ChannelSyncState
+from .job import Job
 from .communication import CommunicationMessage, Contact, MessageTemplate, QuickReply
 from .logistics import LogisticsInformation
 
@@ -15,6 +19,9 @@ __all__ = [
     "SalesChannel",
     "SalesOrder",
     "SalesOrderItem",
+    "DailySalesRollup",
+    "SalesOrderArchive",
+    "SalesOrderItemArchive",
     "Product",
     "Inventory",
     "InventoryAlert",
@@ -22,6 +29,8 @@ __all__ = [
     "SyncedChannelOrder",
     "SyncedChannelOrderItem",
     "OrderSyncLog",
+    "ChannelSyncState",
+    "Job",
     "CommunicationMessage",
     "Contact",
     "MessageTemplate",
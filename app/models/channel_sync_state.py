@@ -0,0 +1,12 @@
+from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+class ChannelSyncState(Base):
+    __tablename__ = "ChannelSyncStates"
+    
+    channel_code = Column(String(50), ForeignKey("SalesChannels.channel_code"), primary_key=True, comment="渠道代码，主键")
+    high_water_mark = Column(DateTime, comment="已同步订单的最大外部更新时间（高水位）")
+    external_cursor = Column(String(500), comment="渠道分页游标或最后同步的外部订单ID")
+    last_success_at = Column(DateTime, comment="最近一次同步成功完成的时间")
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), comment="检查点更新时间")
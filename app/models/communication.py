@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
@@ -23,6 +23,10 @@ class Contact(Base):
 
 class CommunicationMessage(Base):
     __tablename__ = "CommunicationMessages"
+    __table_args__ = (
+        Index("ix_messages_sender_receiver_sent", "sender_id", "receiver_id", "sent_at"),
+        Index("ix_messages_receiver_read", "receiver_id", "is_read"),
+    )
     
     message_id = Column(Integer, primary_key=True, autoincrement=True, comment="消息ID，主键")
     sender_id = Column(Integer, ForeignKey("Contacts.contact_id"), nullable=False, comment="发送方ID")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, String, Text
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, String, Text, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
@@ -18,8 +18,11 @@ class Inventory(Base):
 
 class InventoryAlert(Base):
     __tablename__ = "InventoryAlerts"
+    __table_args__ = (
+        Index("ix_inventoryalerts_inventory_status", "inventory_id", "alert_status"),
+    )
     
-    alert_id = Column(Integer, primary_key=True, comment="预警ID，主键")
+    alert_id = Column(Integer, primary_key=True, autoincrement=True, comment="预警ID，主键（自增）")
     inventory_id = Column(Integer, ForeignKey("Inventory.inventory_id"), nullable=False, comment="库存ID")
     alert_time = Column(DateTime, nullable=False, index=True, comment="预警生成时间")
     alert_status = Column(String(50), nullable=False, index=True, comment="预警状态")
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, String, Integer, DateTime, Text, JSON
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+class Job(Base):
+    __tablename__ = "Jobs"
+    
+    job_id = Column(String(32), primary_key=True, comment="任务ID，主键")
+    job_type = Column(String(50), nullable=False, index=True, comment="任务类型")
+    job_key = Column(String(255), nullable=False, index=True, comment="去重键（同类型同参数的任务相同）")
+    active_key = Column(String(255), unique=True, comment="活动任务去重键：排队或执行中时等于job_key，结束后置空")
+    worker = Column(String(100), comment="执行任务的进程启动令牌（每个进程启动时随机生成）")
+    status = Column(String(20), nullable=False, index=True, comment="任务状态：queued/running/succeeded/failed")
+    params = Column(JSON, comment="任务参数")
+    progress_current = Column(Integer, nullable=False, default=0, comment="已完成的工作量")
+    progress_total = Column(Integer, comment="总工作量，未知时为空")
+    message = Column(Text, comment="进度或结果说明")
+    result = Column(JSON, comment="任务结果")
+    error = Column(Text, comment="失败原因")
+    created_at = Column(DateTime, default=func.now(), index=True, comment="创建时间")
+    started_at = Column(DateTime, comment="开始执行时间")
+    heartbeat_at = Column(DateTime, comment="最近一次心跳时间（执行中定期刷新）")
+    finished_at = Column(DateTime, comment="结束时间")
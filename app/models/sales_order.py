@@ -1,17 +1,23 @@
-from sqlalchemy import Column, Integer, String, DECIMAL, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DECIMAL, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 
 class SalesOrder(Base):
     __tablename__ = "SalesOrders"
+    __table_args__ = (
+        Index("ix_salesorders_date_channel_amount", "order_date", "channel_id", "order_amount"),
+        Index("ix_salesorders_channel_date", "channel_id", "order_date"),
+        Index("ix_salesorders_status_date", "order_status", "order_date"),
+        Index("ix_salesorders_customer_date", "customer_user_id", "order_date"),
+    )
     
     order_id = Column(Integer, primary_key=True, comment="订单ID，主键")
     customer_user_id = Column(String(255), nullable=False, index=True, comment="客户用户ID")
     channel_id = Column(Integer, ForeignKey("SalesChannels.channel_id"), nullable=False, comment="渠道ID")
     order_amount = Column(DECIMAL(10, 2), nullable=False, comment="订单总金额")
     order_status = Column(String(50), nullable=False, index=True, comment="订单状态")
-    order_date = Column(DateTime, default=func.now(), index=True, comment="订单日期")
+    order_date = Column(DateTime, nullable=False, default=func.now(), index=True, comment="订单日期")
     created_at = Column(DateTime, default=func.now(), comment="记录创建时间")
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), comment="记录更新时间")
     
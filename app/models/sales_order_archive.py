@@ -0,0 +1,41 @@
+from sqlalchemy import Column, Integer, String, DECIMAL, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from app.db.base_class import Base
+
+class SalesOrderArchive(Base):
+    """已归档的历史销售订单，列与SalesOrders一致，只读"""
+    __tablename__ = "SalesOrdersArchive"
+    __table_args__ = (
+        Index("ix_salesordersarchive_channel_date", "channel_id", "order_date"),
+        Index("ix_salesordersarchive_customer_date", "customer_user_id", "order_date"),
+    )
+    
+    order_id = Column(Integer, primary_key=True, autoincrement=False, comment="订单ID，主键")
+    customer_user_id = Column(String(255), nullable=False, comment="客户用户ID")
+    channel_id = Column(Integer, ForeignKey("SalesChannels.channel_id"), nullable=False, comment="渠道ID")
+    order_amount = Column(DECIMAL(10, 2), nullable=False, comment="订单总金额")
+    order_status = Column(String(50), nullable=False, index=True, comment="订单状态")
+    order_date = Column(DateTime, nullable=False, index=True, comment="订单日期")
+    created_at = Column(DateTime, comment="记录创建时间")
+    updated_at = Column(DateTime, comment="记录更新时间")
+    archived_at = Column(DateTime, default=func.now(), comment="归档时间")
+    
+    # 关系
+    channel = relationship("SalesChannel")
+    order_items = relationship("SalesOrderItemArchive", back_populates="order")
+
+class SalesOrderItemArchive(Base):
+    """已归档的历史订单项"""
+    __tablename__ = "SalesOrderItemsArchive"
+    
+    order_item_id = Column(Integer, primary_key=True, autoincrement=False, comment="订单项ID")
+    order_id = Column(Integer, ForeignKey("SalesOrdersArchive.order_id"), nullable=False, index=True, comment="销售订单ID")
+    product_id = Column(Integer, ForeignKey("Products.product_id"), nullable=False, index=True, comment="产品ID")
+    quantity = Column(Integer, nullable=False, comment="购买数量")
+    unit_price = Column(DECIMAL(10, 2), nullable=False, comment="售出单价")
+    total_price = Column(DECIMAL(10, 2), nullable=False, comment="总价")
+    
+    # 关系
+    order = relationship("SalesOrderArchive", back_populates="order_items")
+    product = relationship("Product")
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String, DECIMAL, Date, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+class DailySalesRollup(Base):
+    __tablename__ = "DailySalesRollups"
+    
+    sales_date = Column(Date, primary_key=True, comment="销售日期")
+    channel_id = Column(Integer, ForeignKey("SalesChannels.channel_id"), primary_key=True, comment="渠道ID")
+    order_status = Column(String(50), primary_key=True, comment="订单状态")
+    order_count = Column(Integer, nullable=False, default=0, comment="订单数")
+    total_amount = Column(DECIMAL(14, 2), nullable=False, default=0, comment="订单总金额")
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), comment="记录更新时间")
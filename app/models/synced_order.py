@@ -13,6 +13,7 @@ class SyncedChannelOrder(Base):
     order_amount_external = Column(DECIMAL(12, 2), comment="外部订单金额")
     order_created_at_external = Column(DateTime, nullable=False, index=True, comment="外部订单创建时间")
     raw_order_data = Column(JSON, comment="原始订单数据")
+    content_hash = Column(String(64), comment="原始订单内容哈希（规范化JSON的SHA-256）")
     internal_sales_order_id = Column(Integer, ForeignKey("SalesOrders.order_id"), unique=True, comment="内部销售订单ID")
     sync_timestamp = Column(DateTime, default=func.now(), comment="数据同步时间戳")
     
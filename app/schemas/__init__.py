@@ -1,11 +1,14 @@
-from typing import TypeVar, Generic, List
+from typing import TypeVar, Generic, List, Optional
 from pydantic import BaseModel
 
 from .user import User, UserCreate, UserUpdate, UserInDB
 from .token import Token, TokenPayload
 from .sales_channel import SalesChannel, SalesChannelCreate, SalesChannelUpdate
 from .product import Product, ProductCreate, ProductUpdate
-from .sales_order import SalesOrder, SalesOrderCreate, SalesOrderUpdate, SalesOrderItem, SalesOrderItemCreate
+from .sales_order import (
+    SalesOrder, SalesOrderCreate, SalesOrderUpdate, SalesOrderItem, SalesOrderItemCreate,
+    SalesOrderBulkCreate, SalesOrderBulkResult, SalesOrderBulkResponse
+)
 from .inventory import Inventory, InventoryCreate, InventoryUpdate, InventoryAlert, InventoryAlertCreate
 from .supplier import Supplier, SupplierCreate, SupplierUpdate
 from .logistics import LogisticsInformation, LogisticsInformationCreate, LogisticsInformationUpdate
@@ -16,13 +19,15 @@ from .communication import (
     QuickReply, QuickReplyCreate, QuickReplyUpdate,
     ChatSession
 )
+from .job import Job, JobCreate, JobEnqueueResponse
 
 T = TypeVar("T")
 
 class APIResponse(BaseModel, Generic[T]):
     data: List[T]
-    total: int
+    total: Optional[int]
     message: str = ""
+    next_cursor: Optional[str] = None
 
 __all__ = [
     # API Response
@@ -37,6 +42,7 @@ __all__ = [
     "Product", "ProductCreate", "ProductUpdate",
     # Sales order schemas
     "SalesOrder", "SalesOrderCreate", "SalesOrderUpdate", "SalesOrderItem", "SalesOrderItemCreate",
+    "SalesOrderBulkCreate", "SalesOrderBulkResult", "SalesOrderBulkResponse",
     # Inventory schemas
     "Inventory", "InventoryCreate", "InventoryUpdate", "InventoryAlert", "InventoryAlertCreate",
     # Supplier schemas
@@ -48,5 +54,7 @@ __all__ = [
     "Message", "MessageCreate", "MessageUpdate",
     "MessageTemplate", "MessageTemplateCreate", "MessageTemplateUpdate",
     "QuickReply", "QuickReplyCreate", "QuickReplyUpdate",
-    "ChatSession"
+    "ChatSession",
+    # Job schemas
+    "Job", "JobCreate", "JobEnqueueResponse"
 ] 
\ No newline at end of file
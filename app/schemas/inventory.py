@@ -14,6 +14,8 @@ class InventoryCreate(InventoryBase):
 
 class InventoryUpdate(BaseModel):
     current_stock_quantity: Optional[int] = None
+    # 库存增量（入库为正、出库为负），原子累加，与current_stock_quantity互斥
+    stock_delta: Optional[int] = None
     alert_threshold: Optional[int] = None
 
 class InventoryInDBBase(InventoryBase):
@@ -35,7 +37,7 @@ class InventoryAlertBase(BaseModel):
     notes: Optional[str] = None
 
 class InventoryAlertCreate(InventoryAlertBase):
-    alert_id: int
+    alert_id: Optional[int] = None
 
 class InventoryAlert(InventoryAlertBase):
     alert_id: int
@@ -0,0 +1,31 @@
+from typing import Any, Dict, Optional
+from pydantic import BaseModel
+from datetime import datetime
+
+class JobCreate(BaseModel):
+    job_type: str
+    params: Dict[str, Any] = {}
+
+class Job(BaseModel):
+    job_id: str
+    job_type: str
+    job_key: str
+    status: str
+    params: Optional[Dict[str, Any]] = None
+    progress_current: int = 0
+    progress_total: Optional[int] = None
+    message: Optional[str] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    heartbeat_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+class JobEnqueueResponse(BaseModel):
+    """deduplicated为True表示同一去重键已有排队或执行中的任务，返回的是该任务"""
+    job: Job
+    deduplicated: bool
@@ -1,5 +1,5 @@
 from typing import Optional, List
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from decimal import Decimal
 
@@ -31,6 +31,21 @@ class SalesOrderCreate(SalesOrderBase):
     order_id: int
     order_items: Optional[List[SalesOrderItemCreate]] = []
 
+# 批量创建订单
+class SalesOrderBulkCreate(BaseModel):
+    orders: List[SalesOrderCreate] = Field(..., min_length=1)
+
+class SalesOrderBulkResult(BaseModel):
+    index: int
+    order_id: int
+    status: str
+    error: Optional[str] = None
+
+class SalesOrderBulkResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[SalesOrderBulkResult]
+
 class SalesOrderUpdate(BaseModel):
     order_status: Optional[str] = None
 
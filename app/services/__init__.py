@@ -0,0 +1 @@
+# Services module 
\ No newline at end of file
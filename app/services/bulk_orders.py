@@ -0,0 +1,94 @@
+from typing import Dict, Iterable, List, Sequence, Set
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app import schemas
+from app.core.config import settings
+from app.models.product import Product
+from app.models.sales_channel import SalesChannel
+from app.models.sales_order import SalesOrder, SalesOrderItem
+from app.models.sales_order_archive import SalesOrderArchive
+from app.services.sales_rollup import apply_rollup_changes
+
+def chunked(rows: Sequence, size: int) -> Iterable[Sequence]:
+    """按固定大小切分批次"""
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+def existing_ids(db: Session, column, ids: Iterable) -> Set:
+    """用IN查询（按批）找出已存在的ID"""
+    ids = list(set(ids))
+    found: Set = set()
+    for batch in chunked(ids, settings.BULK_INSERT_BATCH_SIZE):
+        found.update(db.scalars(select(column).where(column.in_(batch))))
+    return found
+
+def validate_orders(db: Session, orders: List[schemas.SalesOrderCreate]) -> Dict[int, str]:
+    """
+    批量校验订单：订单ID重复/已存在（含已归档）、渠道不存在、产品不存在；
+    每类ID各用一次IN查询，返回 {订单序号: 错误信息}
+    """
+    taken = existing_ids(db, SalesOrder.order_id, (o.order_id for o in orders))
+    taken |= existing_ids(db, SalesOrderArchive.order_id, (o.order_id for o in orders))
+    channels = existing_ids(db, SalesChannel.channel_id, (o.channel_id for o in orders))
+    products = existing_ids(
+        db, Product.product_id, (i.product_id for o in orders for i in o.order_items or [])
+    )
+
+    errors: Dict[int, str] = {}
+    seen: Set[int] = set()
+    for index, order in enumerate(orders):
+        if order.order_id in taken:
+            errors[index] = "Order ID already exists"
+        elif order.order_id in seen:
+            errors[index] = "Duplicate order ID in request"
+        elif order.channel_id not in channels:
+            errors[index] = f"Sales channel {order.channel_id} not found"
+        else:
+            missing = sorted({i.product_id for i in order.order_items or []} - products)
+            if missing:
+                errors[index] = f"Products not found: {', '.join(map(str, missing))}"
+        seen.add(order.order_id)
+    return errors
+
+def bulk_create_orders(db: Session, orders: List[schemas.SalesOrderCreate]) -> schemas.SalesOrderBulkResponse:
+    """
+    批量创建订单：校验通过的订单及订单项以executemany分批插入，
+    日销售汇总一次性更新，全部在同一事务中提交；返回逐行结果
+    """
+    errors = validate_orders(db, orders)
+    valid = [order for index, order in enumerate(orders) if index not in errors]
+
+    if valid:
+        # 与单条创建一致，订单日期取数据库当前时间
+        now = db.scalar(select(func.now()))
+        order_rows = [
+            {**order.dict(exclude={"order_items"}), "order_date": now, "created_at": now, "updated_at": now}
+            for order in valid
+        ]
+        item_rows = [
+            {"order_id": order.order_id, **item.dict()}
+            for order in valid for item in order.order_items or []
+        ]
+        for batch in chunked(order_rows, settings.BULK_INSERT_BATCH_SIZE):
+            db.execute(insert(SalesOrder), batch)
+        for batch in chunked(item_rows, settings.BULK_INSERT_BATCH_SIZE):
+            db.execute(insert(SalesOrderItem), batch)
+        apply_rollup_changes(db, added=[
+            (now, row["channel_id"], row["order_status"], row["order_amount"]) for row in order_rows
+        ])
+        db.commit()
+
+    results = [
+        schemas.SalesOrderBulkResult(
+            index=index,
+            order_id=order.order_id,
+            status="error" if index in errors else "created",
+            error=errors.get(index),
+        )
+        for index, order in enumerate(orders)
+    ]
+    return schemas.SalesOrderBulkResponse(
+        created=len(valid), failed=len(errors), results=results
+    )
@@ -0,0 +1,79 @@
+from typing import Any, Dict
+
+from sqlalchemy import func, select
+
+from app.core.cache import SnapshotCache
+from app.core.config import settings
+from app.db.session import SessionLocal, replica_reads_allowed
+from app.models.inventory import Inventory, InventoryAlert
+from app.models.product import Product
+from app.models.sales_rollup import DailySalesRollup
+from app.models.supplier import Supplier
+from app.models.user import User
+
+# 视为“活跃”的预警状态
+ACTIVE_ALERT_STATUSES = ["未发送", "已发送", "处理中", "待处理"]
+
+def _scalar(stmt) -> Any:
+    return stmt.scalar_subquery()
+
+def compute_statistics() -> Dict[str, Any]:
+    """
+    计算系统统计数据：各表计数合并为一条由标量子查询组成的语句，
+    订单数、销售额与状态分布取自日销售汇总表，两条语句在同一只读事务中执行
+    """
+    token = replica_reads_allowed.set(True)
+    db = SessionLocal()
+    try:
+        totals = db.execute(
+            select(
+                _scalar(select(func.count(Product.product_id))).label("total_products"),
+                _scalar(select(func.count(User.user_id))).label("total_users"),
+                _scalar(
+                    select(func.sum(Inventory.current_stock_quantity * Product.unit_price))
+                    .select_from(Inventory).join(Product)
+                ).label("total_inventory_value"),
+                _scalar(
+                    select(func.count(InventoryAlert.alert_id))
+                    .where(InventoryAlert.alert_status.in_(ACTIVE_ALERT_STATUSES))
+                ).label("active_alerts"),
+                _scalar(
+                    select(func.count(Supplier.supplier_id))
+                    .where(Supplier.cooperation_status == "合作中")
+                ).label("active_suppliers"),
+            )
+        ).one()
+
+        status_rows = db.execute(
+            select(
+                DailySalesRollup.order_status,
+                func.sum(DailySalesRollup.order_count),
+                func.sum(DailySalesRollup.total_amount),
+            ).group_by(DailySalesRollup.order_status).having(
+                func.sum(DailySalesRollup.order_count) > 0
+            )
+        ).all()
+    finally:
+        db.close()
+        replica_reads_allowed.reset(token)
+
+    return {
+        "total_orders": sum(int(count) for _, count, _ in status_rows),
+        "total_revenue": float(sum(amount or 0 for _, _, amount in status_rows)),
+        "total_products": totals.total_products,
+        "total_users": totals.total_users,
+        "total_inventory_value": float(totals.total_inventory_value or 0),
+        "active_alerts": totals.active_alerts,
+        "active_suppliers": totals.active_suppliers,
+        "order_status_distribution": {
+            status: int(count) for status, count, _ in status_rows
+        }
+    }
+
+# 首页统计快照，所有用户共享
+statistics_snapshot = SnapshotCache(
+    "dashboard_statistics",
+    compute_statistics,
+    ttl=settings.DASHBOARD_STATS_TTL_SECONDS,
+    refresh_ahead=settings.DASHBOARD_STATS_REFRESH_AHEAD_SECONDS,
+)
@@ -0,0 +1,83 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, List, Sequence
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.sql import Select
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, replica_reads_allowed
+
+# 支持的导出格式及对应的媒体类型
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def encode_csv(columns: Sequence[str], rows: Sequence[Sequence[Any]], header: bool) -> bytes:
+    """将一批行编码为CSV（首批带表头，并加BOM便于Excel识别中文）"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        buffer.write("﻿")
+        writer.writerow(columns)
+    writer.writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+def encode_ndjson(columns: Sequence[str], rows: Sequence[Sequence[Any]], header: bool) -> bytes:
+    """将一批行编码为NDJSON（每行一个JSON对象）"""
+    return "".join(
+        json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=_json_default) + "\n"
+        for row in rows
+    ).encode("utf-8")
+
+ENCODERS = {"csv": encode_csv, "ndjson": encode_ndjson}
+
+async def iter_export(stmt: Select, fmt: str, compress: bool) -> AsyncIterator[bytes]:
+    """
+    通过服务端游标（yield_per）逐批读取查询结果，逐批编码并可选gzip压缩后输出；
+    使用独立的只读会话，内存占用与导出总行数无关
+    """
+    columns: List[str] = list(stmt.selected_columns.keys())
+    encode = ENCODERS[fmt]
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    header = True
+
+    token = replica_reads_allowed.set(True)
+    try:
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(stmt.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+            async for partition in result.partitions():
+                chunk = encode(columns, partition, header)
+                header = False
+                if compressor is not None:
+                    chunk = compressor.compress(chunk)
+                if chunk:
+                    yield chunk
+    finally:
+        replica_reads_allowed.reset(token)
+
+    if header:
+        # 无数据时仍输出CSV表头
+        chunk = encode(columns, [], True)
+        yield compressor.compress(chunk) if compressor is not None else chunk
+    if compressor is not None:
+        yield compressor.flush()
+
+def export_response(stmt: Select, name: str, fmt: str = "csv", compress: bool = False) -> StreamingResponse:
+    """构造流式导出响应，文件名为 {name}.{fmt}[.gz]"""
+    filename = f"{name}.{fmt}" + (".gz" if compress else "")
+    media_type = "application/gzip" if compress else EXPORT_FORMATS[fmt]
+    return StreamingResponse(
+        iter_export(stmt, fmt, compress),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,293 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal, isolated_async_sessionmaker
+from app.models.job import Job
+from app.services.order_archive import archive_horizon, archive_orders, count_archivable
+from app.services.order_sync import sync_channel
+from app.services.sales_rollup import rebuild_rollup
+from app.services.stock import count_low_stock, scan_low_stock
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+# 当前进程的启动令牌，记录在执行中的任务上；每个进程（含fork出的子进程）启动时重新生成，
+# 容器重启后进程号或主机名相同也不会与之前的进程混淆
+WORKER_ID = uuid.uuid4().hex
+
+def _new_worker_id() -> None:
+    global WORKER_ID
+    WORKER_ID = uuid.uuid4().hex
+
+os.register_at_fork(after_in_child=_new_worker_id)
+
+# 任务类型 -> 处理函数(params, progress)，返回值作为任务结果保存
+JOB_HANDLERS: Dict[str, Callable[[Dict[str, Any], "JobProgress"], Any]] = {}
+# 任务类型 -> 去重键函数(params)，未注册的类型使用 job_key
+JOB_KEYS: Dict[str, Callable[[Dict[str, Any]], str]] = {}
+
+# 进程内执行后台任务的线程池（JOB_BACKEND=thread）
+_job_executor = ThreadPoolExecutor(max_workers=settings.JOB_WORKERS, thread_name_prefix="job")
+
+def job_handler(job_type: str, key: Optional[Callable[[Dict[str, Any]], str]] = None) -> Callable:
+    """注册任务处理函数的装饰器，key 为自定义去重键函数"""
+    def decorator(func: Callable) -> Callable:
+        JOB_HANDLERS[job_type] = func
+        if key is not None:
+            JOB_KEYS[job_type] = key
+        return func
+    return decorator
+
+class JobProgress:
+    """任务进度上报：每次调用最多每 JOB_PROGRESS_INTERVAL_SECONDS 秒写一次数据库"""
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self._last = 0.0
+
+    def __call__(self, current: int, total: Optional[int] = None, message: Optional[str] = None,
+                 force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._last < settings.JOB_PROGRESS_INTERVAL_SECONDS:
+            return
+        self._last = now
+        values: Dict[str, Any] = {"progress_current": current, "heartbeat_at": datetime.now()}
+        if total is not None:
+            values["progress_total"] = total
+        if message is not None:
+            values["message"] = message
+        with SessionLocal() as db:
+            db.execute(update(Job).where(Job.job_id == self.job_id).values(**values))
+            db.commit()
+
+def job_key(job_type: str, params: Dict[str, Any]) -> str:
+    """默认去重键：任务类型 + 规范化参数，过长时取哈希"""
+    key = f"{job_type}:{json.dumps(params, sort_keys=True, separators=(',', ':'), default=str)}"
+    if len(key) > 255:
+        key = f"{job_type}:{hashlib.sha256(key.encode('utf-8')).hexdigest()}"
+    return key
+
+def enqueue(db: Session, job_type: str, params: Optional[Dict[str, Any]] = None,
+            key: Optional[str] = None) -> Tuple[Job, bool]:
+    """
+    创建任务并提交执行，返回 (任务, 是否新建)：
+    同一去重键已有排队或执行中的任务时不重复创建，直接返回该任务（由 active_key 唯一约束保证）
+    """
+    if job_type not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job type: {job_type}")
+    params = params or {}
+    if key is None:
+        key = JOB_KEYS[job_type](params) if job_type in JOB_KEYS else job_key(job_type, params)
+    while True:
+        job = Job(
+            job_id=uuid.uuid4().hex,
+            job_type=job_type,
+            job_key=key,
+            active_key=key,
+            status=JOB_QUEUED,
+            params=params,
+            progress_current=0,
+            created_at=datetime.now(),
+        )
+        db.add(job)
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            # 占用去重键的任务已失去心跳（执行进程已退出）时释放去重键，重新创建
+            if fail_stale_jobs(db, key):
+                continue
+            existing = db.scalar(select(Job).where(Job.active_key == key))
+            if existing is not None:
+                return existing, False
+            # 活动任务恰好在此期间结束，重新创建
+            continue
+        submit(job.job_id)
+        return job, True
+
+def submit(job_id: str) -> None:
+    """把任务交给执行后端：进程内线程池（默认）或Celery"""
+    if settings.JOB_BACKEND == "celery":
+        from app.worker import run_job_task
+        run_job_task.delay(job_id)
+    else:
+        _job_executor.submit(run_job, job_id)
+
+def _finish(job_id: str, status: str, result: Any = None, error: Optional[str] = None) -> None:
+    with SessionLocal() as db:
+        values: Dict[str, Any] = {
+            "status": status,
+            "active_key": None,
+            "finished_at": datetime.now(),
+            "result": jsonable_encoder(result),
+            "error": error,
+        }
+        db.execute(update(Job).where(Job.job_id == job_id).values(**values))
+        db.commit()
+
+def _heartbeat(job_id: str, stop: threading.Event) -> None:
+    """执行期间每 JOB_HEARTBEAT_INTERVAL_SECONDS 秒刷新一次任务心跳，直到stop被设置"""
+    while not stop.wait(settings.JOB_HEARTBEAT_INTERVAL_SECONDS):
+        try:
+            with SessionLocal() as db:
+                db.execute(
+                    update(Job)
+                    .where(Job.job_id == job_id, Job.status == JOB_RUNNING)
+                    .values(heartbeat_at=datetime.now())
+                )
+                db.commit()
+        except Exception:
+            logger.exception("Failed to record heartbeat for job %s", job_id)
+
+def run_job(job_id: str) -> None:
+    """
+    执行一个任务（线程池与Celery worker共用）：
+    先以条件更新把任务从queued改为running，抢占失败（已被其他worker执行）时直接返回；
+    执行期间由心跳线程定期刷新 heartbeat_at；处理函数可以是协程函数，在本线程的新事件循环中运行
+    """
+    now = datetime.now()
+    with SessionLocal() as db:
+        claimed = db.execute(
+            update(Job)
+            .where(Job.job_id == job_id, Job.status == JOB_QUEUED)
+            .values(status=JOB_RUNNING, started_at=now, heartbeat_at=now, worker=WORKER_ID)
+        ).rowcount
+        db.commit()
+        if not claimed:
+            return
+        job = db.get(Job, job_id)
+        job_type, params = job.job_type, dict(job.params or {})
+
+    handler = JOB_HANDLERS.get(job_type)
+    stop = threading.Event()
+    threading.Thread(target=_heartbeat, args=(job_id, stop), name=f"job-heartbeat-{job_id}", daemon=True).start()
+    try:
+        if handler is None:
+            raise ValueError(f"Unknown job type: {job_type}")
+        result = handler(params, JobProgress(job_id))
+        if asyncio.iscoroutine(result):
+            result = asyncio.run(result)
+    except Exception as e:
+        logger.exception("Job %s (%s) failed", job_id, job_type)
+        _finish(job_id, JOB_FAILED, error=f"{type(e).__name__}: {e}")
+        return
+    finally:
+        stop.set()
+    _finish(job_id, JOB_SUCCEEDED, result=result)
+
+def fail_stale_jobs(db: Session, key: Optional[str] = None) -> int:
+    """
+    将心跳（没有心跳时为开始时间）超过 JOB_STALE_AFTER_SECONDS 未更新的running任务标记为失败并释放去重键，
+    key不为空时只处理占用该去重键的任务；返回标记的任务数。
+    执行进程崩溃、被杀或所在主机/容器重启后，其任务不再有心跳，由此结束
+    """
+    now = datetime.now()
+    cutoff = now - timedelta(seconds=settings.JOB_STALE_AFTER_SECONDS)
+    query = update(Job).where(
+        Job.status == JOB_RUNNING,
+        func.coalesce(Job.heartbeat_at, Job.started_at) < cutoff,
+    )
+    if key is not None:
+        query = query.where(Job.active_key == key)
+    failed = db.execute(
+        query.values(
+            status=JOB_FAILED,
+            active_key=None,
+            finished_at=now,
+            error=f"Interrupted: no heartbeat for {settings.JOB_STALE_AFTER_SECONDS:.0f}s",
+        ),
+        execution_options={"synchronize_session": False},
+    ).rowcount
+    db.commit()
+    if failed:
+        logger.warning("Marked %d stale running job(s) as failed", failed)
+    return failed
+
+def recover_jobs() -> int:
+    """
+    进程启动时恢复进程内线程池的任务：已失去心跳的running任务标记为失败（释放去重键），
+    queued任务重新提交；返回重新提交的任务数
+    """
+    with SessionLocal() as db:
+        fail_stale_jobs(db)
+        queued = db.scalars(select(Job.job_id).where(Job.status == JOB_QUEUED).order_by(Job.created_at)).all()
+    for job_id in queued:
+        submit(job_id)
+    return len(queued)
+
+@job_handler("order_sync", key=lambda params: f"order_sync:{params.get('channel_code')}")
+async def order_sync_job(params: Dict[str, Any], progress: JobProgress) -> Dict[str, Any]:
+    """渠道订单同步（同一渠道同时只有一个同步任务），进度为已拉取的订单数"""
+    def report_progress(report) -> None:
+        progress(report.orders, message=report.message())
+
+    async with isolated_async_sessionmaker() as session_factory:
+        report = await sync_channel(
+            params["channel_code"],
+            full=bool(params.get("full", False)),
+            progress=report_progress,
+            session_factory=session_factory,
+        )
+    progress(report.orders, message=report.message(), force=True)
+    if report.error:
+        raise RuntimeError(report.message())
+    return report.as_dict()
+
+@job_handler("rollup_rebuild")
+def rollup_rebuild_job(params: Dict[str, Any], progress: JobProgress) -> Dict[str, Any]:
+    """按日期区间重建日销售汇总"""
+    start = date.fromisoformat(params["start"]) if params.get("start") else None
+    end = date.fromisoformat(params["end"]) if params.get("end") else None
+    with SessionLocal() as db:
+        rows = rebuild_rollup(db, start=start, end=end)
+    return {"rows": rows}
+
+@job_handler("order_archive", key=lambda params: "order_archive")
+def order_archive_job(params: Dict[str, Any], progress: JobProgress) -> Dict[str, Any]:
+    """归档早于分界时间的订单（同时只有一个归档任务），进度为已归档订单数 / 开始时可归档的订单数"""
+    cutoff = archive_horizon()
+    with SessionLocal() as db:
+        total = count_archivable(db, cutoff)
+        progress(0, total=total, force=True)
+        archived = archive_orders(
+            db,
+            cutoff,
+            batch_size=params.get("batch_size"),
+            max_batches=params.get("max_batches"),
+            progress=lambda done: progress(done, total=total),
+        )
+    progress(archived, total=total, force=True)
+    return {"archived": archived, "cutoff": cutoff}
+
+@job_handler("inventory_alert_scan", key=lambda params: "inventory_alert_scan")
+def inventory_alert_scan_job(params: Dict[str, Any], progress: JobProgress) -> Dict[str, Any]:
+    """为低于预警阈值且没有未处理预警的库存生成预警（同时只有一个扫描任务），进度为已检查的库存数"""
+    with SessionLocal() as db:
+        total = count_low_stock(db)
+        progress(0, total=total, force=True)
+        created = scan_low_stock(
+            db,
+            batch_size=params.get("batch_size"),
+            progress=lambda checked: progress(checked, total=total),
+        )
+    progress(total, total=total, force=True)
+    return {"low_stock": total, "alerts_created": created}
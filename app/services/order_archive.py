@@ -0,0 +1,98 @@
+import time as _time
+from datetime import date, datetime, time, timedelta
+from typing import Callable, List, Optional, Tuple, Type
+
+from sqlalchemy import delete, exists, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.sales_order import SalesOrder, SalesOrderItem
+from app.models.sales_order_archive import SalesOrderArchive, SalesOrderItemArchive
+from app.models.synced_order import SyncedChannelOrder
+
+ORDER_COLUMNS = [
+    "order_id", "customer_user_id", "channel_id", "order_amount",
+    "order_status", "order_date", "created_at", "updated_at",
+]
+ITEM_COLUMNS = ["order_item_id", "order_id", "product_id", "quantity", "unit_price", "total_price"]
+
+# (订单模型, 订单项模型)：在线表与归档表
+HOT = (SalesOrder, SalesOrderItem)
+ARCHIVE = (SalesOrderArchive, SalesOrderItemArchive)
+
+def archive_horizon(today: Optional[date] = None) -> datetime:
+    """归档分界时间：早于该时间下单的订单可以归档"""
+    today = today or date.today()
+    return datetime.combine(today - timedelta(days=settings.ORDER_ARCHIVE_AFTER_DAYS), time.min)
+
+def reaches_archive(start: Optional[date]) -> bool:
+    """
+    查询的起始日期是否可能落入归档数据：
+    归档表中只有早于（归档时的）分界时间的订单，起始日期不早于当前分界时间的查询只需读在线表
+    """
+    return start is None or datetime.combine(start, time.min) < archive_horizon()
+
+def order_models(start: Optional[date]) -> List[Tuple[Type, Type]]:
+    """按查询起始日期返回需要读取的 (订单模型, 订单项模型) 列表"""
+    return [HOT, ARCHIVE] if reaches_archive(start) else [HOT]
+
+def _candidates(cutoff: datetime):
+    """早于分界时间、且未被渠道同步订单引用的订单"""
+    return select(SalesOrder.order_id).where(
+        SalesOrder.order_date < cutoff,
+        ~exists().where(SyncedChannelOrder.internal_sales_order_id == SalesOrder.order_id),
+    )
+
+def count_archivable(db: Session, cutoff: datetime) -> int:
+    """统计可归档的订单数"""
+    return db.scalar(select(func.count()).select_from(_candidates(cutoff).subquery()))
+
+def archive_batch(db: Session, cutoff: datetime, batch_size: int) -> int:
+    """
+    归档一批订单（按order_id顺序取最多batch_size条）：
+    复制订单及订单项到归档表后从在线表删除，在一个短事务中提交；返回本批归档的订单数。
+    日销售汇总保持不变，历史图表仍包含已归档订单
+    """
+    order_ids = db.scalars(_candidates(cutoff).order_by(SalesOrder.order_id).limit(batch_size)).all()
+    if not order_ids:
+        return 0
+
+    db.execute(insert(SalesOrderArchive).from_select(
+        ORDER_COLUMNS,
+        select(*[getattr(SalesOrder, c) for c in ORDER_COLUMNS]).where(SalesOrder.order_id.in_(order_ids)),
+    ))
+    db.execute(insert(SalesOrderItemArchive).from_select(
+        ITEM_COLUMNS,
+        select(*[getattr(SalesOrderItem, c) for c in ITEM_COLUMNS]).where(SalesOrderItem.order_id.in_(order_ids)),
+    ))
+    db.execute(delete(SalesOrderItem).where(SalesOrderItem.order_id.in_(order_ids)))
+    db.execute(delete(SalesOrder).where(SalesOrder.order_id.in_(order_ids)))
+    db.commit()
+    return len(order_ids)
+
+def archive_orders(
+    db: Session,
+    cutoff: Optional[datetime] = None,
+    batch_size: Optional[int] = None,
+    max_batches: Optional[int] = None,
+    pause: float = 0.0,
+    progress: Optional[Callable[[int], None]] = None,
+) -> int:
+    """
+    分批归档直到没有可归档订单（或达到max_batches）；
+    每批之间可暂停pause秒，降低对在线业务的影响；每批提交后以累计归档数调用progress；返回归档的订单总数
+    """
+    cutoff = cutoff or archive_horizon()
+    batch_size = batch_size or settings.ORDER_ARCHIVE_BATCH_SIZE
+    total = batches = 0
+    while max_batches is None or batches < max_batches:
+        archived = archive_batch(db, cutoff, batch_size)
+        if not archived:
+            break
+        total += archived
+        batches += 1
+        if progress is not None:
+            progress(total)
+        if pause:
+            _time.sleep(pause)
+    return total
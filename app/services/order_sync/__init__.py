@@ -0,0 +1,24 @@
+# 渠道订单同步引擎
+from .adapters import ADAPTERS, ChannelAdapter, Checkpoint, Page, RestChannelAdapter, get_adapter, register_adapter
+from .conversion import ConversionResult, convert_batch, convert_pending
+from .engine import SyncReport, WriteResult, load_checkpoint, new_sync_log, save_checkpoint, sync_channel, write_orders
+
+__all__ = [
+    "ADAPTERS",
+    "ChannelAdapter",
+    "Checkpoint",
+    "Page",
+    "RestChannelAdapter",
+    "get_adapter",
+    "register_adapter",
+    "ConversionResult",
+    "convert_batch",
+    "convert_pending",
+    "SyncReport",
+    "WriteResult",
+    "load_checkpoint",
+    "new_sync_log",
+    "save_checkpoint",
+    "sync_channel",
+    "write_orders",
+]
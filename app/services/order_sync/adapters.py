@@ -0,0 +1,182 @@
+import asyncio
+import hashlib
+import inspect
+import json
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, NamedTuple, Optional, Type
+
+import httpx
+
+from app.core.config import settings
+
+# 需要重试的HTTP状态码（限流及服务端临时错误）
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+class Checkpoint(NamedTuple):
+    """同步检查点：已同步订单的最大外部更新时间与渠道分页游标（或最后同步的外部订单ID）"""
+    high_water_mark: Optional[datetime] = None
+    cursor: Optional[str] = None
+
+class Page(NamedTuple):
+    """一页渠道原始订单及写入该页后应保存的检查点"""
+    orders: List[Dict[str, Any]]
+    checkpoint: Checkpoint
+
+class ChannelAdapter(ABC):
+    """
+    渠道适配器：从渠道API分页拉取订单，并将渠道原始订单转换为统一格式
+    （SyncedChannelOrders 的列 + items 订单项列表）；子类必须实现 pages 与 parse_order
+    """
+
+    def __init__(self, channel_code: str, api_address: str):
+        self.channel_code = channel_code
+        self.api_address = api_address.rstrip("/")
+        self.page_size = settings.ORDER_SYNC_PAGE_SIZE
+        self.semaphore = asyncio.Semaphore(settings.ORDER_SYNC_CONCURRENCY)
+
+    async def get(self, client: httpx.AsyncClient, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """带并发上限与指数退避重试的GET请求"""
+        retries = settings.ORDER_SYNC_MAX_RETRIES
+        for attempt in range(retries + 1):
+            response = None
+            async with self.semaphore:
+                try:
+                    response = await client.get(f"{self.api_address}{path}", params=params)
+                except httpx.TransportError:
+                    if attempt == retries:
+                        raise
+            if response is not None and (response.status_code not in RETRY_STATUS_CODES or attempt == retries):
+                response.raise_for_status()
+                return response.json()
+            await asyncio.sleep(0.5 * 2 ** attempt)
+
+    @abstractmethod
+    def pages(self, client: httpx.AsyncClient, since: Checkpoint) -> AsyncIterator[Page]:
+        """按更新时间顺序逐页返回检查点之后更新的渠道原始订单"""
+
+    @abstractmethod
+    def parse_order(self, raw: Dict[str, Any]) -> Dict[str, Any]:
+        """将渠道原始订单转换为统一格式"""
+
+    def content_hash(self, raw: Dict[str, Any]) -> str:
+        """
+        原始订单内容哈希：规范化JSON（键排序、无多余空白）的SHA-256，
+        渠道在订单中附带每次请求都变化的字段（如响应时间）时应在子类中剔除
+        """
+        canonical = json.dumps(raw, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+class RestChannelAdapter(ChannelAdapter):
+    """
+    默认REST渠道适配器：
+    GET {api_address}/orders?page_size=M&updated_since=T&after_id=ID 返回 {"orders": [...], "total_pages": K}，
+    订单按 (更新时间, 订单ID) 排序；传入 after_id 时只返回 (T, ID) 之后的订单，否则 updated_since 包含边界。
+    默认按键集分页：每页以上一页最后一个订单的 (更新时间, 订单ID) 请求下一页，逐页顺序拉取。
+    拉取期间被修改的订单移到列表末尾、在之后的页中拉取，不会使尚未拉取的订单滑入已消费的页而被漏掉；
+    检查点即最后一个订单的 (更新时间, 订单ID)，下次运行从该位置继续。
+    渠道提供稳定的快照分页（分页期间列表不变）时可在子类中将 snapshot_pagination 设为True，
+    按页码分页：读取第一页得到总页数后，其余页在并发上限内预取，并按页码顺序返回
+    """
+
+    snapshot_pagination = False
+
+    async def fetch_page(self, client: httpx.AsyncClient, since: Checkpoint, page: int = 1) -> Dict[str, Any]:
+        params: Dict[str, Any] = {"page": page, "page_size": self.page_size}
+        if since.high_water_mark is not None:
+            params["updated_since"] = since.high_water_mark.isoformat()
+            if since.cursor is not None:
+                params["after_id"] = since.cursor
+        return await self.get(client, "/orders", params)
+
+    def to_page(self, data: Dict[str, Any], since: Checkpoint) -> Page:
+        orders = data["orders"]
+        if not orders:
+            return Page(orders, since)
+        last = orders[-1]
+        return Page(orders, Checkpoint(self.updated_at(last), str(last["order_id"])))
+
+    @staticmethod
+    def updated_at(raw: Dict[str, Any]) -> datetime:
+        return datetime.fromisoformat(raw.get("updated_at") or raw["created_at"])
+
+    async def pages(self, client: httpx.AsyncClient, since: Checkpoint) -> AsyncIterator[Page]:
+        if self.snapshot_pagination:
+            async for page in self.snapshot_pages(client, since):
+                yield page
+            return
+
+        checkpoint = since
+        while True:
+            page = self.to_page(await self.fetch_page(client, checkpoint), checkpoint)
+            yield page
+            if len(page.orders) < self.page_size:
+                return
+            if page.checkpoint == checkpoint:
+                # 渠道忽略 after_id 且同一更新时间的订单超过一页时无法前进
+                raise RuntimeError(f"Channel {self.channel_code} pagination did not advance past {checkpoint}")
+            checkpoint = page.checkpoint
+
+    async def snapshot_pages(self, client: httpx.AsyncClient, since: Checkpoint) -> AsyncIterator[Page]:
+        first = await self.fetch_page(client, since)
+        yield self.to_page(first, since)
+
+        total_pages = first.get("total_pages") or 1
+        window = settings.ORDER_SYNC_CONCURRENCY
+        pending: Deque[asyncio.Task] = deque()
+        next_page = 2
+        try:
+            while next_page <= total_pages or pending:
+                # 已请求未消费的页数不超过并发上限，写库慢于拉取时内存占用保持有界
+                while next_page <= total_pages and len(pending) < window:
+                    pending.append(asyncio.create_task(self.fetch_page(client, since, next_page)))
+                    next_page += 1
+                yield self.to_page(await pending.popleft(), since)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def parse_order(self, raw: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "synced_order_id": str(raw["order_id"]),
+            "external_customer_user_id": raw.get("buyer_id"),
+            "external_channel_code": self.channel_code,
+            "order_status_external": raw["status"],
+            "order_amount_external": Decimal(str(raw["total_amount"])) if raw.get("total_amount") is not None else None,
+            "order_created_at_external": datetime.fromisoformat(raw["created_at"]),
+            "raw_order_data": raw,
+            "content_hash": self.content_hash(raw),
+            "items": [
+                {
+                    "external_product_id": item.get("product_id"),
+                    "product_sku": item.get("sku"),
+                    "product_name_external": item.get("title"),
+                    "quantity": int(item["quantity"]),
+                    "unit_price_external": Decimal(str(item["unit_price"])),
+                    "total_price_external": Decimal(str(item["total_price"])),
+                    "raw_item_data": item,
+                }
+                for item in raw.get("items", [])
+            ],
+        }
+
+# 渠道代码 -> 适配器类，未注册的渠道使用默认REST适配器
+ADAPTERS: Dict[str, Type[ChannelAdapter]] = {}
+
+def register_adapter(channel_code: str) -> Callable[[Type[ChannelAdapter]], Type[ChannelAdapter]]:
+    """注册渠道专用适配器的装饰器，未实现全部抽象方法的适配器在注册时即报错"""
+    def decorator(cls: Type[ChannelAdapter]) -> Type[ChannelAdapter]:
+        if inspect.isabstract(cls):
+            missing = ", ".join(sorted(cls.__abstractmethods__))
+            raise TypeError(f"Adapter {cls.__name__} for channel {channel_code} does not implement: {missing}")
+        ADAPTERS[channel_code] = cls
+        return cls
+    return decorator
+
+def get_adapter(channel_code: str, api_address: Optional[str]) -> ChannelAdapter:
+    """按渠道代码创建适配器"""
+    if not api_address:
+        raise ValueError(f"Channel {channel_code} has no api_address")
+    return ADAPTERS.get(channel_code, RestChannelAdapter)(channel_code, api_address)
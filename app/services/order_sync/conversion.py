@@ -0,0 +1,171 @@
+import hashlib
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.config import settings
+from app.db.upsert import upsert
+from app.models.order_sync_log import OrderSyncLog
+from app.models.sales_order import SalesOrder, SalesOrderItem
+from app.models.sales_order_archive import SalesOrderArchive
+from app.models.synced_order import SyncedChannelOrder
+from app.services.order_sync.resolver import channel_map, sku_map
+from app.services.sales_rollup import apply_rollup_changes
+
+# 隔离日志的状态：SKU或渠道无法解析 / 之后已成功转换
+SYNC_QUARANTINED = "quarantined"
+SYNC_RESOLVED = "resolved"
+
+class OrderIdConflict(Exception):
+    """分配给转换订单的ID已被并发写入占用（客户端指定ID下单，或其他渠道的转换同时进行）"""
+
+class ConversionResult(NamedTuple):
+    """转换结果：生成的内部订单数与因无法解析而隔离的同步订单数"""
+    converted: int
+    quarantined: int
+
+def quarantine_log_id(synced_order_id: str) -> str:
+    """每个同步订单固定一条隔离日志，重复转换失败时覆盖而不新增"""
+    return "Q" + hashlib.sha1(synced_order_id.encode("utf-8")).hexdigest()
+
+def _next_order_id(db: Session) -> int:
+    """
+    内部订单ID不自增，从在线表与归档表的最大ID之后分配；
+    读取不加锁，并发写入占用同一ID时插入冲突，由 convert_pending 回滚整批后重新分配
+    """
+    hot = db.scalar(select(func.max(SalesOrder.order_id))) or 0
+    archived = db.scalar(select(func.max(SalesOrderArchive.order_id))) or 0
+    return max(hot, archived) + 1
+
+def _problems(order: SyncedChannelOrder, channels: Dict[Any, Any], skus: Dict[Any, Any]) -> List[str]:
+    problems = []
+    if channels.get(order.external_channel_code) is None:
+        problems.append(f"Unknown channel: {order.external_channel_code}")
+    unresolved = sorted({item.product_sku or "" for item in order.order_items if skus.get(item.product_sku) is None})
+    if unresolved:
+        problems.append(f"Unresolved SKUs: {', '.join(sku or '<empty>' for sku in unresolved)}")
+    return problems
+
+def convert_batch(db: Session, orders: List[SyncedChannelOrder]) -> ConversionResult:
+    """
+    将一批同步订单转换为内部销售订单，在调用方的事务中执行：
+    整批的渠道代码与SKU各用一次IN查询（经进程内映射缓存）解析；
+    无法解析的订单写入隔离日志（OrderSyncLog，状态quarantined）并保持未转换，不影响同批其他订单。
+    转换后的订单与订单项以executemany插入，回写 internal_sales_order_id 并更新日销售汇总
+    """
+    channels = channel_map.resolve(db, (o.external_channel_code for o in orders))
+    skus = sku_map.resolve(db, (item.product_sku for o in orders for item in o.order_items))
+
+    now = datetime.now()
+    quarantine_rows: List[Dict[str, Any]] = []
+    ready: List[SyncedChannelOrder] = []
+    for order in orders:
+        problems = _problems(order, channels, skus)
+        if problems:
+            quarantine_rows.append({
+                "log_id": quarantine_log_id(order.synced_order_id),
+                "synced_order_id": order.synced_order_id,
+                "external_channel_code": order.external_channel_code,
+                "sync_status": SYNC_QUARANTINED,
+                "sync_time": now,
+                "message": "; ".join(problems),
+                "created_at": now,
+            })
+        else:
+            ready.append(order)
+    upsert(db, OrderSyncLog.__table__, quarantine_rows, ["log_id"], ["sync_status", "sync_time", "message"])
+    if not ready:
+        return ConversionResult(0, len(quarantine_rows))
+
+    next_id = _next_order_id(db)
+    order_rows, item_rows, links = [], [], []
+    for order_id, order in enumerate(ready, start=next_id):
+        amount = order.order_amount_external
+        if amount is None:
+            amount = sum((item.total_price_external for item in order.order_items), Decimal(0))
+        order_rows.append({
+            "order_id": order_id,
+            "customer_user_id": order.external_customer_user_id or order.external_channel_code,
+            "channel_id": channels[order.external_channel_code],
+            "order_amount": amount,
+            "order_status": order.order_status_external,
+            "order_date": order.order_created_at_external or now,
+            "created_at": now,
+            "updated_at": now,
+        })
+        item_rows.extend({
+            "order_id": order_id,
+            "product_id": skus[item.product_sku],
+            "quantity": item.quantity,
+            "unit_price": item.unit_price_external,
+            "total_price": item.total_price_external,
+        } for item in order.order_items)
+        links.append({"synced_order_id": order.synced_order_id, "internal_sales_order_id": order_id})
+
+    try:
+        with db.begin_nested():
+            db.execute(SalesOrder.__table__.insert(), order_rows)
+    except IntegrityError as e:
+        raise OrderIdConflict(f"Order ids {next_id}..{next_id + len(order_rows) - 1} were taken concurrently") from e
+    if item_rows:
+        db.execute(SalesOrderItem.__table__.insert(), item_rows)
+    db.execute(update(SyncedChannelOrder), links)
+    db.execute(
+        update(OrderSyncLog)
+        .where(
+            OrderSyncLog.log_id.in_([quarantine_log_id(o.synced_order_id) for o in ready]),
+            OrderSyncLog.sync_status == SYNC_QUARANTINED,
+        )
+        .values(sync_status=SYNC_RESOLVED, sync_time=now),
+        execution_options={"synchronize_session": False},
+    )
+    apply_rollup_changes(db, added=[
+        (row["order_date"], row["channel_id"], row["order_status"], row["order_amount"]) for row in order_rows
+    ])
+    return ConversionResult(len(order_rows), len(quarantine_rows))
+
+def convert_pending(db: Session, channel_code: Optional[str] = None, batch_size: Optional[int] = None) -> ConversionResult:
+    """
+    按 synced_order_id 顺序分批转换尚未关联内部订单的同步订单（可限定渠道），每批一个事务；
+    已隔离的订单每次都会重试，补齐产品或渠道后即可转换；
+    分配的订单ID被并发占用时整批回滚重试，最多 ORDER_SYNC_CONVERT_MAX_RETRIES 次
+    """
+    batch_size = batch_size or settings.ORDER_SYNC_CONVERT_BATCH_SIZE
+    converted = quarantined = 0
+    last_id = ""
+    conflicts = 0
+    while True:
+        query = (
+            select(SyncedChannelOrder)
+            .options(selectinload(SyncedChannelOrder.order_items))
+            .where(SyncedChannelOrder.internal_sales_order_id.is_(None), SyncedChannelOrder.synced_order_id > last_id)
+            .order_by(SyncedChannelOrder.synced_order_id)
+            .limit(batch_size)
+        )
+        if channel_code is not None:
+            query = query.where(SyncedChannelOrder.external_channel_code == channel_code)
+        orders = db.scalars(query).all()
+        if not orders:
+            break
+        batch_last_id = orders[-1].synced_order_id
+        try:
+            result = convert_batch(db, list(orders))
+        except OrderIdConflict:
+            # 回滚后新事务读取到最新的最大ID，重新转换同一批
+            db.rollback()
+            db.expunge_all()
+            conflicts += 1
+            if conflicts > settings.ORDER_SYNC_CONVERT_MAX_RETRIES:
+                raise
+            continue
+        db.commit()
+        db.expunge_all()
+        conflicts = 0
+        last_id = batch_last_id
+        converted += result.converted
+        quarantined += result.quarantined
+    return ConversionResult(converted, quarantined)
@@ -0,0 +1,284 @@
+import logging
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set
+
+import httpx
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.query_stats import current_query_stats
+from app.db.session import AsyncSessionLocal
+from app.db.upsert import upsert
+from app.models.channel_sync_state import ChannelSyncState
+from app.models.order_sync_log import OrderSyncLog
+from app.models.sales_channel import SalesChannel
+from app.models.synced_order import SyncedChannelOrder, SyncedChannelOrderItem
+from app.services.bulk_orders import chunked
+from app.services.order_sync.adapters import Checkpoint, get_adapter
+from app.services.order_sync.conversion import convert_pending
+
+logger = logging.getLogger(__name__)
+
+# 同步运行日志的状态
+SYNC_PROCESSING = "processing"
+SYNC_SUCCESS = "success"
+SYNC_FAILED = "failed"
+
+# 运行级日志不对应单个订单，synced_order_id 记为该值
+RUN_LOG_ORDER_ID = "*"
+
+class SyncReport:
+    """单次渠道同步的统计"""
+
+    def __init__(self, channel_code: str):
+        self.channel_code = channel_code
+        self.log_id: Optional[str] = None
+        self.since: Optional[datetime] = None
+        self.high_water_mark: Optional[datetime] = None
+        self.pages = 0
+        self.orders = 0
+        self.items = 0
+        self.skipped = 0
+        self.converted = 0
+        self.quarantined = 0
+        self.rows_written = 0
+        self.write_seconds = 0.0
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+        self.error: Optional[str] = None
+
+    @property
+    def status(self) -> str:
+        return SYNC_FAILED if self.error else SYNC_SUCCESS
+
+    @property
+    def rows_per_second(self) -> float:
+        """写库吞吐量（订单 + 订单项行数 / 写入耗时）"""
+        return self.rows_written / self.write_seconds if self.write_seconds else 0.0
+
+    def finish(self, error: Optional[str] = None) -> None:
+        self.elapsed = time.perf_counter() - self.started
+        self.error = error
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "channel_code": self.channel_code,
+            "log_id": self.log_id,
+            "status": self.status,
+            "since": self.since,
+            "high_water_mark": self.high_water_mark,
+            "pages": self.pages,
+            "orders": self.orders,
+            "items": self.items,
+            "skipped": self.skipped,
+            "converted": self.converted,
+            "quarantined": self.quarantined,
+            "rows_written": self.rows_written,
+            "rows_per_second": round(self.rows_per_second, 1),
+            "elapsed_seconds": round(self.elapsed, 3),
+            "error": self.error,
+        }
+
+    def message(self) -> str:
+        since = self.since.isoformat() if self.since else "full"
+        text = (f"since={since} pages={self.pages} orders={self.orders} items={self.items} "
+                f"skipped={self.skipped} rows={self.rows_written} rows/s={self.rows_per_second:.0f} "
+                f"converted={self.converted} quarantined={self.quarantined} elapsed={self.elapsed:.1f}s")
+        return f"{text} error={self.error}" if self.error else text
+
+def new_sync_log(channel_code: str) -> OrderSyncLog:
+    """创建一条处理中的运行日志（由调用方提交）"""
+    return OrderSyncLog(
+        log_id=uuid.uuid4().hex,
+        synced_order_id=RUN_LOG_ORDER_ID,
+        external_channel_code=channel_code,
+        sync_status=SYNC_PROCESSING,
+        sync_time=datetime.now(),
+        message="Sync started",
+    )
+
+# 订单已存在时覆盖的列（不修改已关联的内部订单ID）
+ORDER_UPDATE_COLUMNS = [
+    "external_customer_user_id",
+    "external_channel_code",
+    "order_status_external",
+    "order_amount_external",
+    "order_created_at_external",
+    "raw_order_data",
+    "content_hash",
+    "sync_timestamp",
+]
+
+class WriteResult(NamedTuple):
+    """一页订单的写入结果：写入的行数（订单 + 订单项）与内容未变化而跳过的订单数"""
+    rows: int
+    skipped: int
+
+def unchanged_ids(db: Session, orders: List[Dict[str, Any]]) -> Set[str]:
+    """用一次IN查询找出已存储且内容哈希相同的订单"""
+    hashes = {o["synced_order_id"]: o["content_hash"] for o in orders}
+    stored = db.execute(
+        select(SyncedChannelOrder.synced_order_id, SyncedChannelOrder.content_hash).where(
+            SyncedChannelOrder.synced_order_id.in_(list(hashes))
+        )
+    )
+    return {order_id for order_id, content_hash in stored if content_hash == hashes[order_id]}
+
+def write_orders(db: Session, orders: List[Dict[str, Any]]) -> WriteResult:
+    """
+    批量写入一页已转换的渠道订单，在调用方的事务中执行：
+    内容哈希与已存储版本相同的订单在写入前跳过；其余订单每 ORDER_SYNC_WRITE_CHUNK_SIZE 条
+    一次方言相关的插入或更新（executemany），订单项按订单集合整体替换（一次IN删除 + 一次executemany插入）；
+    同一页中重复的订单只保留最后一次出现的版本
+    """
+    now = datetime.now()
+    latest = list({o["synced_order_id"]: o for o in orders}.values())
+    written = skipped = 0
+    for chunk in chunked(latest, settings.ORDER_SYNC_WRITE_CHUNK_SIZE):
+        unchanged = unchanged_ids(db, chunk)
+        chunk = [o for o in chunk if o["synced_order_id"] not in unchanged]
+        skipped += len(unchanged)
+        if not chunk:
+            continue
+        order_rows = [
+            {**{k: v for k, v in o.items() if k != "items"}, "sync_timestamp": now} for o in chunk
+        ]
+        item_rows = [{**item, "synced_order_id": o["synced_order_id"]} for o in chunk for item in o["items"]]
+        upsert(db, SyncedChannelOrder.__table__, order_rows, ["synced_order_id"], ORDER_UPDATE_COLUMNS)
+        db.execute(
+            delete(SyncedChannelOrderItem).where(
+                SyncedChannelOrderItem.synced_order_id.in_([o["synced_order_id"] for o in chunk])
+            ),
+            execution_options={"synchronize_session": False},
+        )
+        if item_rows:
+            db.execute(insert(SyncedChannelOrderItem), item_rows)
+        written += len(order_rows) + len(item_rows)
+    return WriteResult(written, skipped)
+
+def load_checkpoint(db: Session, channel_code: str) -> Checkpoint:
+    """读取渠道的同步检查点，从未同步过时返回空检查点（全量同步）"""
+    state = db.get(ChannelSyncState, channel_code)
+    if state is None:
+        return Checkpoint()
+    return Checkpoint(state.high_water_mark, state.external_cursor)
+
+def save_checkpoint(db: Session, channel_code: str, checkpoint: Checkpoint, succeeded: bool = False) -> None:
+    """保存渠道的同步检查点，在调用方的事务中执行（与该批订单一起提交）"""
+    now = datetime.now()
+    row = {
+        "channel_code": channel_code,
+        "high_water_mark": checkpoint.high_water_mark,
+        "external_cursor": checkpoint.cursor,
+        "updated_at": now,
+    }
+    columns = ["high_water_mark", "external_cursor", "updated_at"]
+    if succeeded:
+        row["last_success_at"] = now
+        columns.append("last_success_at")
+    upsert(db, ChannelSyncState.__table__, [row], ["channel_code"], columns)
+
+def advance(current: Checkpoint, page: Checkpoint) -> Checkpoint:
+    """高水位只前进不后退"""
+    if page.high_water_mark is None:
+        return current
+    if current.high_water_mark is not None and page.high_water_mark < current.high_water_mark:
+        return current
+    return page
+
+async def sync_channel(
+    channel_code: str,
+    log_id: Optional[str] = None,
+    full: bool = False,
+    progress: Optional[Callable[["SyncReport"], None]] = None,
+    session_factory: Optional[async_sessionmaker] = None,
+) -> SyncReport:
+    """
+    同步一个渠道的订单：通过渠道适配器（httpx.AsyncClient，并发上限 ORDER_SYNC_CONCURRENCY）
+    拉取检查点之后更新的订单（full为True时忽略检查点全量拉取），
+    每页订单与推进后的检查点在同一个事务中写入，中断后下次运行从最后提交的检查点继续；
+    拉取完成后将尚未关联内部订单的同步订单转换为销售订单；
+    整个运行记录一条 OrderSyncLog（log_id 为空时新建），失败时记录错误而不抛出。
+    progress 在每页提交后以当前统计调用；在应用事件循环之外运行时通过 session_factory 传入独立的会话工厂
+    """
+    # 作为后台任务运行时，SQL不计入触发同步的请求统计
+    token = current_query_stats.set(None)
+    try:
+        return await _sync_channel(channel_code, log_id, full, progress, session_factory or AsyncSessionLocal)
+    finally:
+        current_query_stats.reset(token)
+
+async def _sync_channel(
+    channel_code: str,
+    log_id: Optional[str],
+    full: bool,
+    progress: Optional[Callable[[SyncReport], None]],
+    session_factory: async_sessionmaker,
+) -> SyncReport:
+    report = SyncReport(channel_code)
+    async with session_factory() as db:
+        log = await db.get(OrderSyncLog, log_id) if log_id else None
+        if log is None:
+            log = new_sync_log(channel_code)
+            db.add(log)
+            await db.commit()
+        report.log_id = log.log_id
+
+        try:
+            channel = await db.scalar(select(SalesChannel).where(SalesChannel.channel_code == channel_code))
+            if channel is None:
+                raise ValueError(f"Channel {channel_code} not found")
+            adapter = get_adapter(channel_code, channel.api_address)
+            since = Checkpoint() if full else await db.run_sync(load_checkpoint, channel_code)
+            checkpoint = since
+            report.since = since.high_water_mark
+
+            async with httpx.AsyncClient(timeout=settings.ORDER_SYNC_TIMEOUT_SECONDS) as client:
+                async for page in adapter.pages(client, since):
+                    orders = [adapter.parse_order(raw) for raw in page.orders]
+                    checkpoint = advance(checkpoint, page.checkpoint)
+                    started = time.perf_counter()
+                    result = await db.run_sync(write_orders, orders)
+                    await db.run_sync(save_checkpoint, channel_code, checkpoint)
+                    await db.commit()
+                    seconds = time.perf_counter() - started
+                    # 每页提交后清空会话，内存占用与同步总量无关
+                    db.expunge_all()
+                    report.pages += 1
+                    report.orders += len(orders)
+                    report.items += sum(len(o["items"]) for o in orders)
+                    report.skipped += result.skipped
+                    report.rows_written += result.rows
+                    report.write_seconds += seconds
+                    report.high_water_mark = checkpoint.high_water_mark
+                    logger.info(
+                        "Order sync %s batch %d: %d rows in %.3fs (%.0f rows/s), %d unchanged orders skipped",
+                        channel_code, report.pages, result.rows, seconds,
+                        result.rows / seconds if seconds else 0.0, result.skipped,
+                    )
+                    if progress is not None:
+                        progress(report)
+            await db.run_sync(save_checkpoint, channel_code, checkpoint, True)
+            await db.commit()
+
+            # 转换阶段：将未关联的同步订单转换为内部销售订单，无法解析的进入隔离
+            conversion = await db.run_sync(convert_pending, channel_code)
+            report.converted = conversion.converted
+            report.quarantined = conversion.quarantined
+            report.finish()
+        except Exception as e:
+            await db.rollback()
+            logger.exception("Order sync failed for channel %s", channel_code)
+            report.finish(f"{type(e).__name__}: {e}")
+
+        log = await db.merge(log)
+        log.sync_status = report.status
+        log.sync_time = datetime.now()
+        log.message = report.message()
+        await db.commit()
+    logger.info("Order sync for channel %s finished: %s", channel_code, report.message())
+    return report
@@ -0,0 +1,51 @@
+from typing import Any, Dict, Hashable, Iterable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.change_tracking import subscribe
+from app.models.product import Product
+from app.models.sales_channel import SalesChannel
+from app.services.bulk_orders import chunked
+
+# 缓存中区分“未缓存”与“已确认不存在”
+_MISSING = object()
+
+class ReferenceMap:
+    """
+    外部键到内部ID的进程内映射（如 SKU -> product_id）：
+    未命中的键按批一次IN查询解析，不存在的键同样缓存；所在表有写入提交后整表失效
+    """
+
+    def __init__(self, name: str, key_column: Any, id_column: Any):
+        self.key_column = key_column
+        self.id_column = id_column
+        self.cache = TTLCache(
+            name,
+            maxsize=settings.SYNC_RESOLVER_CACHE_MAX_SIZE,
+            ttl=settings.SYNC_RESOLVER_CACHE_TTL_SECONDS,
+        )
+        subscribe(key_column.table.name, self.cache.clear)
+
+    def resolve(self, db: Session, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """返回 {键: 内部ID}，不存在的键映射为None"""
+        result: Dict[Hashable, Any] = {}
+        missing = []
+        for key in set(k for k in keys if k is not None):
+            value = self.cache.get(key, _MISSING)
+            if value is _MISSING:
+                missing.append(key)
+            else:
+                result[key] = value
+        for batch in chunked(missing, settings.BULK_INSERT_BATCH_SIZE):
+            found = dict(db.execute(select(self.key_column, self.id_column).where(self.key_column.in_(batch))).all())
+            for key in batch:
+                result[key] = found.get(key)
+                self.cache.set(key, result[key])
+        return result
+
+# 产品或渠道新增、修改后自动失效
+sku_map = ReferenceMap("sync_sku_map", Product.sku, Product.product_id)
+channel_map = ReferenceMap("sync_channel_map", SalesChannel.channel_code, SalesChannel.channel_id)
@@ -0,0 +1,228 @@
+from datetime import date, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.change_tracking import table_version
+from app.models.sales_channel import SalesChannel
+from app.models.sales_rollup import DailySalesRollup
+
+# 未指定统计区间时默认统计最近30天
+DEFAULT_RANGE_DAYS = 30
+
+# 以整数返回的计数类指标
+COUNT_METRICS = ("total_orders", "active_channels")
+
+# 分析结果缓存，键包含统计区间、筛选条件及相关表的写入版本号
+analytics_cache = TTLCache(
+    "sales_analytics",
+    maxsize=settings.ANALYTICS_CACHE_MAX_SIZE,
+    ttl=settings.ANALYTICS_CACHE_TTL_SECONDS,
+)
+
+class AnalyticsWindow(NamedTuple):
+    """统计区间及等长的上一周期（均为闭区间）"""
+    start: date
+    end: date
+    previous_start: date
+    previous_end: date
+
+def analytics_window(start: Optional[date] = None, end: Optional[date] = None) -> AnalyticsWindow:
+    """补全统计区间，并取紧邻其前、天数相同的区间作为对比周期"""
+    end = end or date.today()
+    start = start or end - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+    days = (end - start).days + 1
+    previous_end = start - timedelta(days=1)
+    return AnalyticsWindow(start, end, previous_end - timedelta(days=days - 1), previous_end)
+
+def change_percent(current: Any, previous: Any) -> np.ndarray:
+    """环比变化百分比，上一周期为0时无法计算（NaN）"""
+    current = np.asarray(current, dtype="float64")
+    previous = np.asarray(previous, dtype="float64")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(previous != 0, (current - previous) / np.abs(previous) * 100, np.nan)
+
+def classify_trend(current: Any, previous: Any, threshold: Optional[float] = None) -> np.ndarray:
+    """按环比变化幅度判断趋势：up（上升）/down（下降）/stable（稳定）"""
+    threshold = settings.ANALYTICS_STABLE_THRESHOLD_PCT if threshold is None else threshold
+    current = np.asarray(current, dtype="float64")
+    previous = np.asarray(previous, dtype="float64")
+    pct = change_percent(current, previous)
+    return np.select(
+        [(previous == 0) & (current > 0), pct > threshold, pct < -threshold],
+        ["up", "up", "down"],
+        default="stable",
+    )
+
+def _records(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    """DataFrame转为JSON友好的记录列表（NaN转为None）"""
+    return frame.astype(object).where(frame.notna(), None).to_dict("records")
+
+def _filters(channel_id: Optional[int], order_status: Optional[str]) -> list:
+    filters = []
+    if channel_id is not None:
+        filters.append(DailySalesRollup.channel_id == channel_id)
+    if order_status is not None:
+        filters.append(DailySalesRollup.order_status == order_status)
+    return filters
+
+async def cached(
+    kind: str,
+    window: AnalyticsWindow,
+    channel_id: Optional[int],
+    order_status: Optional[str],
+    compute: Callable[[], Awaitable[Any]],
+) -> Any:
+    """按(分析类型, 统计区间, 筛选条件)缓存分析结果"""
+    key = (
+        kind, window, channel_id, order_status,
+        table_version(DailySalesRollup.__tablename__),
+        table_version(SalesChannel.__tablename__),
+    )
+    result = analytics_cache.get(key)
+    if result is None:
+        result = await compute()
+        analytics_cache.set(key, result)
+    return result
+
+async def _period_frame(
+    db: AsyncSession, window: AnalyticsWindow, dimension: Any, filters: list
+) -> pd.DataFrame:
+    """
+    一条分组查询同时汇总本期与上期：按维度与周期分组统计订单数和销售额，
+    返回以维度为索引、含 orders/revenue 及 previous_orders/previous_revenue 列的DataFrame
+    """
+    period = case((DailySalesRollup.sales_date >= window.start, "current"), else_="previous")
+    rows = (await db.execute(
+        select(
+            dimension.label("key"),
+            period.label("period"),
+            func.sum(DailySalesRollup.order_count),
+            func.sum(DailySalesRollup.total_amount),
+        ).where(
+            DailySalesRollup.sales_date >= window.previous_start,
+            DailySalesRollup.sales_date <= window.end,
+            *filters,
+        ).group_by(dimension, period)
+    )).all()
+
+    frame = pd.DataFrame(rows, columns=["key", "period", "orders", "revenue"])
+    frame["orders"] = frame["orders"].astype("int64")
+    frame["revenue"] = frame["revenue"].astype("float64")
+    wide = frame.pivot_table(
+        index="key", columns="period", values=["orders", "revenue"], aggfunc="sum", fill_value=0
+    ).reindex(
+        columns=pd.MultiIndex.from_product([["orders", "revenue"], ["current", "previous"]]), fill_value=0
+    )
+    wide.columns = ["orders", "previous_orders", "revenue", "previous_revenue"]
+    return wide
+
+def _with_comparison(frame: pd.DataFrame) -> pd.DataFrame:
+    """追加平均客单价、环比变化幅度与趋势列"""
+    frame = frame.copy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        frame["avg_order_value"] = np.where(frame["orders"] > 0, frame["revenue"] / frame["orders"], 0.0)
+    frame["orders_change_pct"] = change_percent(frame["orders"], frame["previous_orders"])
+    frame["revenue_change_pct"] = change_percent(frame["revenue"], frame["previous_revenue"])
+    frame["trend"] = classify_trend(frame["revenue"], frame["previous_revenue"])
+    return frame.round(2)
+
+async def channel_kpis(
+    db: AsyncSession, window: AnalyticsWindow, channel_id: Optional[int] = None, order_status: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """各渠道本期KPI及环比：订单数、销售额、客单价、销售额占比、变化幅度与趋势"""
+    frame = await _period_frame(db, window, DailySalesRollup.channel_id, _filters(channel_id, order_status))
+
+    channel_query = select(SalesChannel.channel_id, SalesChannel.channel_name)
+    if channel_id is not None:
+        channel_query = channel_query.where(SalesChannel.channel_id == channel_id)
+    channels = pd.DataFrame(
+        (await db.execute(channel_query.order_by(SalesChannel.channel_id))).all(),
+        columns=["channel_id", "channel_name"],
+    ).set_index("channel_id")
+
+    frame = channels.join(frame, how="left").fillna(
+        {"orders": 0, "previous_orders": 0, "revenue": 0.0, "previous_revenue": 0.0}
+    )
+    frame[["orders", "previous_orders"]] = frame[["orders", "previous_orders"]].astype("int64")
+    total_revenue = frame["revenue"].sum()
+    frame["revenue_share_pct"] = frame["revenue"] / total_revenue * 100 if total_revenue else 0.0
+    frame = _with_comparison(frame).sort_values("revenue", ascending=False)
+    return _records(frame.reset_index())
+
+async def status_breakdown(
+    db: AsyncSession, window: AnalyticsWindow, channel_id: Optional[int] = None, order_status: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """按订单状态统计本期订单数与销售额及环比"""
+    frame = await _period_frame(db, window, DailySalesRollup.order_status, _filters(channel_id, order_status))
+    frame = _with_comparison(frame).sort_values("orders", ascending=False)
+    return _records(frame.rename_axis("order_status").reset_index())
+
+async def summary(
+    db: AsyncSession, window: AnalyticsWindow, channel_id: Optional[int] = None, order_status: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    核心指标的本期值、上期值、变化幅度与趋势：
+    总订单数、总销售额、平均客单价、活跃渠道数（本期有订单的渠道）
+    """
+    frame = await _period_frame(db, window, DailySalesRollup.channel_id, _filters(channel_id, order_status))
+    orders = frame[["orders", "previous_orders"]].sum().to_numpy(dtype="float64")
+    revenue = frame[["revenue", "previous_revenue"]].sum().to_numpy(dtype="float64")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg_order_value = np.where(orders > 0, revenue / orders, 0.0)
+    active_channels = (frame[["orders", "previous_orders"]] > 0).sum().to_numpy(dtype="float64")
+
+    metrics = pd.DataFrame(
+        [orders, revenue, avg_order_value, active_channels],
+        index=["total_orders", "total_revenue", "avg_order_value", "active_channels"],
+        columns=["current", "previous"],
+    )
+    metrics["change_pct"] = change_percent(metrics["current"], metrics["previous"])
+    metrics["trend"] = classify_trend(metrics["current"], metrics["previous"])
+    records = _records(metrics.round(2).rename_axis("metric").reset_index())
+    for record in records:
+        if record["metric"] in COUNT_METRICS:
+            record["current"], record["previous"] = int(record["current"]), int(record["previous"])
+    return records
+
+async def daily_channel_series(
+    db: AsyncSession, window: AnalyticsWindow, channel_id: Optional[int] = None, order_status: Optional[str] = None
+) -> Dict[str, Any]:
+    """本期按天、按渠道的销售额与订单数序列（无销售的日期补0），用于堆叠柱状图"""
+    rows = (await db.execute(
+        select(
+            DailySalesRollup.sales_date,
+            DailySalesRollup.channel_id,
+            func.sum(DailySalesRollup.order_count),
+            func.sum(DailySalesRollup.total_amount),
+        ).where(
+            DailySalesRollup.sales_date >= window.start,
+            DailySalesRollup.sales_date <= window.end,
+            *_filters(channel_id, order_status),
+        ).group_by(DailySalesRollup.sales_date, DailySalesRollup.channel_id)
+    )).all()
+    names = dict((await db.execute(select(SalesChannel.channel_id, SalesChannel.channel_name))).all())
+
+    frame = pd.DataFrame(rows, columns=["sales_date", "channel_id", "orders", "revenue"])
+    frame["sales_date"] = pd.to_datetime(frame["sales_date"])
+    frame["orders"] = frame["orders"].astype("int64")
+    frame["revenue"] = frame["revenue"].astype("float64")
+    dates = pd.date_range(window.start, window.end, freq="D")
+    wide = frame.pivot_table(
+        index="sales_date", columns="channel_id", values=["orders", "revenue"], aggfunc="sum", fill_value=0
+    ).reindex(dates, fill_value=0)
+
+    series = []
+    for cid in sorted(frame["channel_id"].unique().tolist()):
+        series.append({
+            "channel_id": cid,
+            "channel_name": names.get(cid),
+            "amounts": wide[("revenue", cid)].round(2).tolist(),
+            "order_counts": wide[("orders", cid)].astype("int64").tolist(),
+        })
+    return {"dates": dates.strftime("%Y-%m-%d").tolist(), "series": series}
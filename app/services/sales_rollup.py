@@ -0,0 +1,100 @@
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select, union_all
+from sqlalchemy.orm import Session
+
+from app.db.upsert import upsert
+from app.models.sales_order import SalesOrder
+from app.models.sales_rollup import DailySalesRollup
+from app.services.order_archive import order_models
+
+# 汇总维度：(销售日期, 渠道ID, 订单状态)，计入的度量：订单金额
+RollupKey = Tuple[date, int, str]
+OrderSnapshot = Tuple[Optional[datetime], int, str, Decimal]
+
+def order_snapshot(order: SalesOrder) -> OrderSnapshot:
+    """提取订单中影响日汇总的字段，更新订单前后各取一次用于计算增量"""
+    return (order.order_date, order.channel_id, order.order_status, Decimal(order.order_amount or 0))
+
+def apply_rollup_changes(
+    db: Session,
+    added: Iterable[OrderSnapshot] = (),
+    removed: Iterable[OrderSnapshot] = (),
+) -> None:
+    """
+    在调用方事务中按订单增删增量维护日汇总表，提交与订单写入保持原子性；
+    同一维度的多笔变更先合并，再用一条批量upsert写入
+    """
+    deltas: Dict[RollupKey, List] = defaultdict(lambda: [0, Decimal(0)])
+    for sign, snapshots in ((1, added), (-1, removed)):
+        for order_date, channel_id, status, amount in snapshots:
+            if order_date is None:
+                continue
+            delta = deltas[(order_date.date(), channel_id, status)]
+            delta[0] += sign
+            delta[1] += sign * amount
+
+    rows = [
+        {
+            "sales_date": key[0],
+            "channel_id": key[1],
+            "order_status": key[2],
+            "order_count": count,
+            "total_amount": amount,
+        }
+        for key, (count, amount) in deltas.items()
+        if count or amount
+    ]
+    upsert(
+        db,
+        DailySalesRollup.__table__,
+        rows,
+        key_columns=["sales_date", "channel_id", "order_status"],
+        increment_columns=["order_count", "total_amount"],
+    )
+
+def rebuild_rollup(db: Session, start: Optional[date] = None, end: Optional[date] = None) -> int:
+    """
+    从SalesOrders全量（或按日期区间）重建日汇总，用于初始化回填或校正；
+    区间起始日期落入归档数据（或未指定）时合并读取归档表，已归档订单的历史汇总不会丢失；
+    区间为闭区间，返回重建后的汇总行数
+    """
+    rollup_filter = []
+    if start is not None:
+        rollup_filter.append(DailySalesRollup.sales_date >= start)
+    if end is not None:
+        rollup_filter.append(DailySalesRollup.sales_date <= end)
+
+    branches = []
+    for Order, _ in order_models(start):
+        order_filter = [Order.order_date.isnot(None)]
+        if start is not None:
+            order_filter.append(Order.order_date >= datetime.combine(start, time.min))
+        if end is not None:
+            order_filter.append(Order.order_date < datetime.combine(end + timedelta(days=1), time.min))
+        branches.append(select(
+            Order.order_id, Order.order_date, Order.channel_id, Order.order_status, Order.order_amount
+        ).where(*order_filter))
+    orders = (branches[0] if len(branches) == 1 else union_all(*branches)).subquery("orders")
+
+    db.execute(delete(DailySalesRollup).where(*rollup_filter))
+    sales_date = func.date(orders.c.order_date)
+    db.execute(
+        insert(DailySalesRollup).from_select(
+            ["sales_date", "channel_id", "order_status", "order_count", "total_amount"],
+            select(
+                sales_date,
+                orders.c.channel_id,
+                orders.c.order_status,
+                func.count(orders.c.order_id),
+                func.sum(orders.c.order_amount),
+            ).group_by(
+                sales_date, orders.c.channel_id, orders.c.order_status
+            ),
+        )
+    )
+    db.commit()
+    return db.scalar(select(func.count()).select_from(DailySalesRollup).where(*rollup_filter))
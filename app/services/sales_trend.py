@@ -0,0 +1,72 @@
+from datetime import date, timedelta
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# 支持的时间粒度及对应的numpy日期单位
+GRANULARITY_UNITS = {"hour": "h", "day": "D", "week": "W", "month": "M"}
+
+# 未指定起始日期时各粒度默认回看的天数
+DEFAULT_WINDOW_DAYS = {"hour": 1, "day": 30, "week": 7 * 12, "month": 365}
+
+# 小时粒度直接扫描订单明细，限制查询跨度
+MAX_HOURLY_RANGE_DAYS = 31
+
+_LABEL_FORMATS = {"hour": "%Y-%m-%d %H:00", "day": "%Y-%m-%d", "week": "%Y-%m-%d", "month": "%Y-%m"}
+
+# numpy的周以1970-01-01（周四）为起点，平移3天使每周从周一开始
+_WEEK_SHIFT = np.timedelta64(3, "D")
+
+def resolve_range(start: Optional[date], end: Optional[date], granularity: str):
+    """补全查询区间（闭区间），未指定时以今天为终点按粒度回看"""
+    end = end or date.today()
+    start = start or end - timedelta(days=DEFAULT_WINDOW_DAYS[granularity] - 1)
+    return start, end
+
+def bucket_start(values: np.ndarray, granularity: str) -> np.ndarray:
+    """将时间戳数组向下取整到所属时间桶的起点（周以周一为起点）"""
+    values = values.astype("datetime64[s]")
+    if granularity == "week":
+        return ((values + _WEEK_SHIFT).astype("datetime64[W]") - _WEEK_SHIFT).astype("datetime64[s]")
+    return values.astype(f"datetime64[{GRANULARITY_UNITS[granularity]}]").astype("datetime64[s]")
+
+def bucket_range(start: date, end: date, granularity: str) -> np.ndarray:
+    """生成区间内全部时间桶的起点，用于补齐无销售的时间段"""
+    first, last = bucket_start(
+        np.array([start, end + timedelta(days=1)], dtype="datetime64[s]") - np.array([0, 1], dtype="timedelta64[s]"),
+        granularity,
+    )
+    if granularity == "week":
+        return np.arange(first.astype("datetime64[D]"), last.astype("datetime64[D]") + 1, 7).astype("datetime64[s]")
+    unit = GRANULARITY_UNITS[granularity]
+    return np.arange(first.astype(f"datetime64[{unit}]"), last.astype(f"datetime64[{unit}]") + 1).astype("datetime64[s]")
+
+def bucket_sales(
+    timestamps: Sequence[Any],
+    amounts: Sequence[Any],
+    counts: Optional[Sequence[Any]],
+    start: date,
+    end: date,
+    granularity: str,
+    window: int = 7,
+) -> Dict[str, list]:
+    """
+    按粒度对销售数据分桶汇总，缺失时间段补0，并计算销售额移动平均；
+    counts为空时每条记录计为一笔订单（订单明细），否则为已汇总的订单数（日汇总）
+    """
+    timestamps = np.asarray(timestamps, dtype="datetime64[s]")
+    frame = pd.DataFrame({
+        "amount": np.asarray(amounts, dtype="float64"),
+        "orders": np.ones(len(timestamps), dtype="int64") if counts is None else np.asarray(counts, dtype="int64"),
+    })
+    buckets = bucket_range(start, end, granularity)
+    totals = frame.groupby(bucket_start(timestamps, granularity)).sum().reindex(buckets, fill_value=0)
+    moving_average = totals["amount"].rolling(window, min_periods=1).mean()
+
+    return {
+        "dates": pd.DatetimeIndex(buckets).strftime(_LABEL_FORMATS[granularity]).tolist(),
+        "amounts": totals["amount"].round(2).tolist(),
+        "order_counts": totals["orders"].astype("int64").tolist(),
+        "moving_average": moving_average.round(2).tolist(),
+    }
@@ -0,0 +1,141 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.inventory import Inventory, InventoryAlert
+
+# 视为“未处理”的预警状态，存在时不再重复生成
+OPEN_ALERT_STATUSES = ["未发送", "已发送", "处理中"]
+
+class InsufficientStock(Exception):
+    """库存不足（或产品没有库存记录），订单不能扣减库存"""
+
+    def __init__(self, product_id: int, quantity: int):
+        self.product_id = product_id
+        self.quantity = quantity
+        super().__init__(f"Insufficient stock for product {product_id} (requested {quantity})")
+
+def reserve_stock(db: Session, items: Iterable[Tuple[int, int]]) -> None:
+    """
+    在调用方事务中按订单项扣减库存：同一产品的数量先合并，
+    再按product_id升序逐条执行条件UPDATE（库存不小于扣减量时才扣减），
+    所有事务以相同顺序锁定库存行，避免并发下单时互相死锁；
+    任一产品库存不足时抛出InsufficientStock，由调用方回滚
+    """
+    quantities: Dict[int, int] = defaultdict(int)
+    for product_id, quantity in items:
+        quantities[product_id] += quantity
+
+    now = datetime.now()
+    for product_id in sorted(quantities):
+        quantity = quantities[product_id]
+        result = db.execute(
+            update(Inventory)
+            .where(
+                Inventory.product_id == product_id,
+                Inventory.current_stock_quantity >= quantity,
+            )
+            .values(
+                current_stock_quantity=Inventory.current_stock_quantity - quantity,
+                last_updated_at=now,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            raise InsufficientStock(product_id, quantity)
+
+    raise_low_stock_alerts(db, Inventory.product_id.in_(list(quantities)))
+
+def adjust_stock(db: Session, inventory_id: int, delta: int) -> bool:
+    """按增量原子调整库存（可为负），调整后库存不能小于0；记录不存在或库存不足时返回False"""
+    result = db.execute(
+        update(Inventory)
+        .where(
+            Inventory.inventory_id == inventory_id,
+            Inventory.current_stock_quantity + delta >= 0,
+        )
+        .values(
+            current_stock_quantity=Inventory.current_stock_quantity + delta,
+            last_updated_at=datetime.now(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+def _below_threshold():
+    return Inventory.current_stock_quantity < Inventory.alert_threshold
+
+def _open_alert(db: Session, inventory_id: int):
+    """加锁读取库存的未处理预警：可重复读隔离级别下也能看到并发事务已提交的预警"""
+    return db.scalar(
+        select(InventoryAlert.alert_id).where(
+            InventoryAlert.inventory_id == inventory_id,
+            InventoryAlert.alert_status.in_(OPEN_ALERT_STATUSES),
+        ).limit(1).with_for_update()
+    )
+
+def raise_low_stock_alerts(db: Session, *criteria) -> int:
+    """
+    为低于预警阈值且没有未处理预警的库存生成预警记录（预警ID由数据库自增分配），返回新生成的预警数；
+    库存行按inventory_id顺序加锁（下单扣减时已由UPDATE锁定），同一库存的预警生成因此串行执行
+    """
+    low_stock = db.scalars(
+        select(Inventory.inventory_id)
+        .where(_below_threshold(), *criteria)
+        .order_by(Inventory.inventory_id)
+        .with_for_update()
+    ).all()
+    created = 0
+    for inventory_id in low_stock:
+        if _open_alert(db, inventory_id) is not None:
+            continue
+        try:
+            with db.begin_nested():
+                db.add(InventoryAlert(
+                    inventory_id=inventory_id,
+                    alert_time=datetime.now(),
+                    alert_status="未发送"
+                ))
+        except IntegrityError:
+            # 只在该库存已有未处理预警时忽略冲突，其他完整性错误照常抛出
+            if _open_alert(db, inventory_id) is None:
+                raise
+            continue
+        created += 1
+    return created
+
+def count_low_stock(db: Session) -> int:
+    """低于预警阈值的库存数"""
+    return db.scalar(select(func.count()).select_from(Inventory).where(_below_threshold()))
+
+def scan_low_stock(
+    db: Session,
+    batch_size: Optional[int] = None,
+    progress: Optional[Callable[[int], None]] = None,
+) -> int:
+    """
+    全量扫描低于预警阈值的库存并补齐预警：按inventory_id分批，每批一个短事务（只锁定该批库存行）；
+    每批提交后以累计检查的库存数调用progress；返回新生成的预警数
+    """
+    batch_size = batch_size or settings.INVENTORY_ALERT_SCAN_BATCH_SIZE
+    last_id = None
+    checked = created = 0
+    while True:
+        query = select(Inventory.inventory_id).where(_below_threshold())
+        if last_id is not None:
+            query = query.where(Inventory.inventory_id > last_id)
+        ids = db.scalars(query.order_by(Inventory.inventory_id).limit(batch_size)).all()
+        if not ids:
+            break
+        created += raise_low_stock_alerts(db, Inventory.inventory_id.in_(ids))
+        db.commit()
+        last_id = ids[-1]
+        checked += len(ids)
+        if progress is not None:
+            progress(checked)
+    return created
@@ -0,0 +1,106 @@
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import case, func, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.product import Product
+from app.models.sales_channel import SalesChannel
+from app.services.order_archive import order_models
+
+# 排行榜支持的排序指标
+METRICS = ("revenue", "quantity")
+
+def sku_family(sku):
+    """
+    SKU系列的SQL表达式：取第一个“-”之前的部分（如 TS-RED-M 属于 TS 系列），没有“-”时为整个SKU；
+    instr/substr 在MySQL与SQLite中均可用，分组比较遵循列的排序规则
+    """
+    dash = func.instr(sku, "-")
+    return case((dash > 0, func.substr(sku, 1, dash - 1)), else_=sku)
+
+def _item_rows(start: date, end: date, channel_id: Optional[int]):
+    """
+    时间窗口内的订单项（产品、渠道、订单、数量、金额），作为子查询供分组统计；
+    窗口起始日期落入归档数据时合并归档表
+    """
+    since = datetime.combine(start, time.min)
+    until = datetime.combine(end + timedelta(days=1), time.min)
+    branches = []
+    for Order, Item in order_models(start):
+        query = select(
+            Item.product_id, Order.channel_id, Item.order_id, Item.quantity, Item.total_price
+        ).join(Order, Order.order_id == Item.order_id).where(
+            Order.order_date >= since, Order.order_date < until
+        )
+        if channel_id is not None:
+            query = query.where(Order.channel_id == channel_id)
+        branches.append(query)
+    return (branches[0] if len(branches) == 1 else union_all(*branches)).subquery("items")
+
+def _item_aggregates(items):
+    return (
+        func.sum(items.c.quantity).label("quantity"),
+        func.sum(items.c.total_price).label("revenue"),
+        func.count(func.distinct(items.c.order_id)).label("orders"),
+    )
+
+def _ranked(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    for rank, row in enumerate(rows, start=1):
+        row["rank"] = rank
+        row["quantity"] = int(row["quantity"] or 0)
+        row["revenue"] = float(row["revenue"] or 0)
+    return rows
+
+async def top_products(
+    db: AsyncSession, start: date, end: date, metric: str, limit: int, channel_id: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """按产品统计销量/销售额，由数据库分组排序并只返回前limit名"""
+    items = _item_rows(start, end, channel_id)
+    aggregates = _item_aggregates(items)
+    order_column = {"revenue": aggregates[1], "quantity": aggregates[0]}[metric]
+    rows = (await db.execute(
+        select(Product.product_id, Product.product_name, Product.sku, *aggregates)
+        .select_from(items)
+        .join(Product, Product.product_id == items.c.product_id)
+        .group_by(Product.product_id, Product.product_name, Product.sku)
+        .order_by(order_column.desc(), Product.product_id)
+        .limit(limit)
+    )).mappings().all()
+    return _ranked([dict(row) for row in rows])
+
+async def top_sku_families(
+    db: AsyncSession, start: date, end: date, metric: str, limit: int, channel_id: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """按SKU系列统计销量/销售额，由数据库按系列表达式分组排序并只返回前limit名"""
+    items = _item_rows(start, end, channel_id)
+    aggregates = _item_aggregates(items)
+    order_column = {"revenue": aggregates[1], "quantity": aggregates[0]}[metric]
+    family = sku_family(Product.sku).label("sku_family")
+    rows = (await db.execute(
+        select(family, *aggregates, func.count(func.distinct(Product.product_id)).label("products"))
+        .select_from(items)
+        .join(Product, Product.product_id == items.c.product_id)
+        .where(Product.sku.isnot(None))
+        .group_by(family)
+        .order_by(order_column.desc(), family)
+        .limit(limit)
+    )).mappings().all()
+    return _ranked([dict(row) for row in rows])
+
+async def top_channels(
+    db: AsyncSession, start: date, end: date, metric: str, limit: int
+) -> List[Dict[str, Any]]:
+    """按渠道统计销量/销售额，由数据库分组排序并只返回前limit名"""
+    items = _item_rows(start, end, None)
+    aggregates = _item_aggregates(items)
+    order_column = {"revenue": aggregates[1], "quantity": aggregates[0]}[metric]
+    rows = (await db.execute(
+        select(SalesChannel.channel_id, SalesChannel.channel_name, *aggregates)
+        .select_from(items)
+        .join(SalesChannel, SalesChannel.channel_id == items.c.channel_id)
+        .group_by(SalesChannel.channel_id, SalesChannel.channel_name)
+        .order_by(order_column.desc(), SalesChannel.channel_id)
+        .limit(limit)
+    )).mappings().all()
+    return _ranked([dict(row) for row in rows])
@@ -0,0 +1,18 @@
+"""
+Celery worker（JOB_BACKEND=celery 时使用）：
+任务状态与进度保存在 Jobs 表中，消息只传递任务ID；默认使用SQLite作为broker，生产环境可改为Redis
+
+启动：
+    JOB_BACKEND=celery celery -A app.worker worker --concurrency 4
+"""
+from celery import Celery
+
+from app.core.config import settings
+from app.services.jobs import run_job
+
+celery_app = Celery("ecommerce", broker=settings.CELERY_BROKER_URL)
+celery_app.conf.update(task_acks_late=True, worker_prefetch_multiplier=1, broker_connection_retry_on_startup=True)
+
+@celery_app.task(name="jobs.run")
+def run_job_task(job_id: str) -> None:
+    run_job(job_id)
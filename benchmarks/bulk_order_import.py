@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+订单导入吞吐量基准测试
+分别通过单条创建接口（POST /sales-orders/）与批量接口（POST /sales-orders/bulk）导入N条合成订单，
+对比每秒导入订单数。需要已存在的渠道与产品（--channel-id、--product-ids）
+
+示例：
+    python benchmarks/bulk_order_import.py --base-url http://localhost:8000 --orders 2000 --batch-size 1000
+"""
+
+import argparse
+import asyncio
+import time
+from typing import List
+
+import httpx
+
+
+def synthetic_order(order_id: int, channel_id: int, product_ids: List[int]) -> dict:
+    """生成一条包含两个订单项的合成订单"""
+    items = [
+        {
+            "product_id": product_ids[(order_id + k) % len(product_ids)],
+            "quantity": 1,
+            "unit_price": "10.00",
+            "total_price": "10.00",
+        }
+        for k in range(2)
+    ]
+    return {
+        "order_id": order_id,
+        "customer_user_id": f"bench-{order_id % 1000}",
+        "channel_id": channel_id,
+        "order_amount": "20.00",
+        "order_status": "pending",
+        "order_items": items,
+    }
+
+
+async def login(client: httpx.AsyncClient, base_url: str, username: str, password: str) -> None:
+    response = await client.post(
+        f"{base_url}/api/v1/login/access-token", data={"username": username, "password": password}
+    )
+    response.raise_for_status()
+    client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+
+async def import_single(client: httpx.AsyncClient, base_url: str, orders: List[dict], concurrency: int) -> int:
+    """并发逐条调用单条创建接口，返回成功数"""
+    queue = list(reversed(orders))
+    created = [0]
+
+    async def worker() -> None:
+        while queue:
+            order = queue.pop()
+            response = await client.post(f"{base_url}/api/v1/sales-orders/", json=order)
+            if response.status_code == 200:
+                created[0] += 1
+
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return created[0]
+
+
+async def import_bulk(client: httpx.AsyncClient, base_url: str, orders: List[dict], batch_size: int) -> int:
+    """按批调用批量接口，返回成功数"""
+    created = 0
+    for i in range(0, len(orders), batch_size):
+        response = await client.post(
+            f"{base_url}/api/v1/sales-orders/bulk", json={"orders": orders[i:i + batch_size]}
+        )
+        response.raise_for_status()
+        created += response.json()["created"]
+    return created
+
+
+async def run(args: argparse.Namespace) -> None:
+    base_url = args.base_url.rstrip("/")
+    product_ids = [int(p) for p in args.product_ids.split(",")]
+    first = args.start_order_id
+    single_orders = [synthetic_order(i, args.channel_id, product_ids) for i in range(first, first + args.orders)]
+    first += args.orders
+    bulk_orders = [synthetic_order(i, args.channel_id, product_ids) for i in range(first, first + args.orders)]
+
+    async with httpx.AsyncClient(timeout=args.timeout) as client:
+        await login(client, base_url, args.username, args.password)
+
+        started = time.perf_counter()
+        single_created = await import_single(client, base_url, single_orders, args.concurrency)
+        single_elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        bulk_created = await import_bulk(client, base_url, bulk_orders, args.batch_size)
+        bulk_elapsed = time.perf_counter() - started
+
+    single_rate = single_created / single_elapsed
+    bulk_rate = bulk_created / bulk_elapsed
+    print(f"单条接口: {single_created}/{args.orders} 条  {single_elapsed:.2f}s  {single_rate:,.1f} orders/sec"
+          f"（并发 {args.concurrency}）")
+    print(f"批量接口: {bulk_created}/{args.orders} 条  {bulk_elapsed:.2f}s  {bulk_rate:,.1f} orders/sec"
+          f"（每批 {args.batch_size}）")
+    if single_rate:
+        print(f"加速比: {bulk_rate / single_rate:.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="订单导入吞吐量基准测试")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--orders", type=int, default=2000, help="每种方式导入的订单数")
+    parser.add_argument("--batch-size", type=int, default=1000, help="批量接口每次请求的订单数")
+    parser.add_argument("--concurrency", type=int, default=10, help="单条接口的并发客户端数")
+    parser.add_argument("--channel-id", type=int, default=1)
+    parser.add_argument("--product-ids", default="1,2,3", help="逗号分隔的已存在产品ID")
+    parser.add_argument("--start-order-id", type=int, default=10_000_000, help="合成订单的起始订单ID")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
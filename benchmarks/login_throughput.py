@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+登录吞吐量基准测试
+使用N个并发客户端反复调用登录接口，统计每秒登录数与延迟分位数
+
+示例：
+    python benchmarks/login_throughput.py --base-url http://localhost:8000 --concurrency 50 --requests 1000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+import httpx
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """计算分位数（最近秩法）"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def worker(
+    client: httpx.AsyncClient,
+    url: str,
+    form: dict,
+    counter: List[int],
+    latencies: List[float],
+    errors: List[int],
+) -> None:
+    """单个客户端：循环登录直到请求总数用尽"""
+    while counter[0] > 0:
+        counter[0] -= 1
+        start = time.perf_counter()
+        try:
+            response = await client.post(url, data=form)
+            if response.status_code != 200:
+                errors[0] += 1
+                continue
+        except httpx.HTTPError:
+            errors[0] += 1
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+async def run(args: argparse.Namespace) -> None:
+    url = f"{args.base_url.rstrip('/')}/api/v1/login/access-token"
+    form = {"username": args.username, "password": args.password}
+    counter = [args.requests]
+    latencies: List[float] = []
+    errors = [0]
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=args.timeout) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*[
+            worker(client, url, form, counter, latencies, errors)
+            for _ in range(args.concurrency)
+        ])
+        elapsed = time.perf_counter() - started
+
+    print(f"并发客户端数: {args.concurrency}")
+    print(f"成功登录: {len(latencies)}  失败: {errors[0]}  总耗时: {elapsed:.2f}s")
+    print(f"吞吐量: {len(latencies) / elapsed:.1f} logins/sec")
+    if latencies:
+        print(
+            "延迟(ms): "
+            f"avg={statistics.mean(latencies) * 1000:.1f} "
+            f"p50={percentile(latencies, 50) * 1000:.1f} "
+            f"p95={percentile(latencies, 95) * 1000:.1f} "
+            f"p99={percentile(latencies, 99) * 1000:.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="登录吞吐量基准测试")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--concurrency", type=int, default=20, help="并发客户端数N")
+    parser.add_argument("--requests", type=int, default=500, help="登录请求总数")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+销售趋势分桶基准测试
+生成N条合成订单（时间戳+金额），对比向量化分桶（app.services.sales_trend.bucket_sales）
+与逐行Python循环分桶的耗时
+
+示例：
+    python benchmarks/sales_trend_bucketing.py --orders 10000000 --loop-orders 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.sales_trend import GRANULARITY_UNITS, bucket_sales  # noqa: E402
+
+
+def synthetic_orders(n: int, start: date, days: int, seed: int):
+    """在[start, start+days)内均匀生成n条订单时间戳与金额"""
+    rng = np.random.default_rng(seed)
+    offsets = rng.integers(0, days * 86400, size=n)
+    timestamps = np.datetime64(start, "s") + offsets.astype("timedelta64[s]")
+    amounts = rng.gamma(2.0, 50.0, size=n).round(2)
+    return timestamps, amounts
+
+
+def loop_bucket(timestamps, amounts, granularity: str):
+    """逐行Python循环分桶（对照组）"""
+    totals = defaultdict(float)
+    for ts, amount in zip(timestamps.tolist(), amounts.tolist()):
+        if granularity == "hour":
+            key = ts.replace(minute=0, second=0)
+        elif granularity == "day":
+            key = ts.date()
+        elif granularity == "week":
+            key = ts.date() - timedelta(days=ts.weekday())
+        else:
+            key = ts.date().replace(day=1)
+        totals[key] += amount
+    return totals
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="销售趋势分桶基准测试")
+    parser.add_argument("--orders", type=int, default=10_000_000, help="向量化分桶的合成订单数")
+    parser.add_argument("--loop-orders", type=int, default=1_000_000, help="循环对照组的订单数（0为跳过）")
+    parser.add_argument("--days", type=int, default=365, help="订单分布的天数")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    start = date(2025, 1, 1)
+    end = start + timedelta(days=args.days - 1)
+    timestamps, amounts = synthetic_orders(args.orders, start, args.days, args.seed)
+    print(f"合成订单: {args.orders:,} 条，{start} ~ {end}\n")
+
+    print(f"{'粒度':<8}{'时间桶':>8}{'向量化(s)':>12}{'订单/秒':>16}{'循环(s)':>12}{'循环订单/秒':>16}")
+    for granularity in GRANULARITY_UNITS:
+        trend, elapsed = timed(bucket_sales, timestamps, amounts, None, start, end, granularity)
+        line = f"{granularity:<8}{len(trend['dates']):>8}{elapsed:>12.3f}{args.orders / elapsed:>16,.0f}"
+        if args.loop_orders:
+            sample = slice(0, args.loop_orders)
+            _, loop_elapsed = timed(loop_bucket, timestamps[sample], amounts[sample], granularity)
+            line += f"{loop_elapsed:>12.3f}{args.loop_orders / loop_elapsed:>16,.0f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
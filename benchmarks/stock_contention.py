@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+库存争用基准测试（秒杀场景）
+N个并发买家同时对同一SKU下单，验证库存不会超卖并统计下单吞吐量
+
+流程：将指定库存重置为 --stock，然后 --buyers 个客户端各下一单（每单 --quantity 件），
+统计成功/库存不足/其他失败的订单数，并核对最终库存 = 初始库存 - 成功扣减量
+
+示例：
+    python benchmarks/stock_contention.py --base-url http://localhost:8000 --inventory-id 1 --product-id 1 --stock 100 --buyers 200
+"""
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+
+import httpx
+
+
+async def login(client: httpx.AsyncClient, base_url: str, username: str, password: str) -> None:
+    response = await client.post(
+        f"{base_url}/api/v1/login/access-token", data={"username": username, "password": password}
+    )
+    response.raise_for_status()
+    client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+
+async def buy(client: httpx.AsyncClient, base_url: str, args: argparse.Namespace, order_id: int,
+              start: asyncio.Event, outcomes: Counter) -> None:
+    """单个买家：等待发令后下一单"""
+    order = {
+        "order_id": order_id,
+        "customer_user_id": f"buyer-{order_id}",
+        "channel_id": args.channel_id,
+        "order_amount": "10.00",
+        "order_status": "pending",
+        "order_items": [{
+            "product_id": args.product_id,
+            "quantity": args.quantity,
+            "unit_price": "10.00",
+            "total_price": "10.00",
+        }],
+    }
+    await start.wait()
+    try:
+        response = await client.post(f"{base_url}/api/v1/sales-orders/", json=order)
+        outcomes[{200: "created", 409: "out_of_stock"}.get(response.status_code, f"http_{response.status_code}")] += 1
+    except httpx.HTTPError as e:
+        outcomes[type(e).__name__] += 1
+
+
+async def run(args: argparse.Namespace) -> int:
+    base_url = args.base_url.rstrip("/")
+    limits = httpx.Limits(max_connections=args.buyers)
+    async with httpx.AsyncClient(limits=limits, timeout=args.timeout) as client:
+        await login(client, base_url, args.username, args.password)
+        inventory_url = f"{base_url}/api/v1/inventory/{args.inventory_id}"
+        response = await client.put(inventory_url, json={"current_stock_quantity": args.stock})
+        response.raise_for_status()
+
+        outcomes: Counter = Counter()
+        start = asyncio.Event()
+        tasks = [
+            asyncio.create_task(buy(client, base_url, args, args.start_order_id + i, start, outcomes))
+            for i in range(args.buyers)
+        ]
+        await asyncio.sleep(0.1)
+        started = time.perf_counter()
+        start.set()
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+        final_stock = (await client.get(inventory_url)).json()["current_stock_quantity"]
+
+    created = outcomes["created"]
+    expected_stock = args.stock - created * args.quantity
+    print(f"并发买家: {args.buyers}  初始库存: {args.stock}  每单数量: {args.quantity}")
+    print(f"结果: {dict(outcomes)}")
+    print(f"总耗时: {elapsed:.2f}s  吞吐量: {args.buyers / elapsed:.1f} orders/sec")
+    print(f"最终库存: {final_stock}  预期: {expected_stock}")
+    oversold = final_stock < 0 or final_stock != expected_stock or created * args.quantity > args.stock
+    print("❌ 发生超卖或库存不一致" if oversold else "✅ 未超卖，库存一致")
+    return 1 if oversold else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="库存争用基准测试")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--inventory-id", type=int, default=1)
+    parser.add_argument("--product-id", type=int, default=1)
+    parser.add_argument("--channel-id", type=int, default=1)
+    parser.add_argument("--stock", type=int, default=100, help="测试前重置的库存量")
+    parser.add_argument("--quantity", type=int, default=1, help="每单购买数量")
+    parser.add_argument("--buyers", type=int, default=200, help="并发买家数")
+    parser.add_argument("--start-order-id", type=int, default=20_000_000, help="测试订单的起始订单ID")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    raise SystemExit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+索引顾问：回放采集到的SQL语句形状并执行EXPLAIN，报告发生全表扫描的查询
+
+使用方法：
+    1. 以 SQL_CAPTURE_PATH=query_shapes.jsonl 启动服务并访问常用页面，采集语句形状
+    2. python explain_query_shapes.py query_shapes.jsonl [--min-rows 1000]
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List
+
+from sqlalchemy import create_engine
+
+from app.core.config import settings
+
+# 只回放查询及可EXPLAIN的DML语句
+EXPLAINABLE = ("SELECT", "UPDATE", "DELETE", "WITH")
+
+def load_shapes(path: str) -> List[Dict[str, Any]]:
+    """读取采集文件"""
+    shapes = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                shapes.append(json.loads(line))
+    return shapes
+
+def _parameters(record: Dict[str, Any]) -> Any:
+    params = record.get("parameters")
+    if isinstance(params, list):
+        return tuple(params)
+    return params or ()
+
+def explain_mysql(conn, record: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """MySQL：type为ALL（全表扫描）或index（全索引扫描）的访问视为全扫描"""
+    result = conn.exec_driver_sql("EXPLAIN " + record["statement"], _parameters(record))
+    findings = []
+    for row in result.mappings():
+        if row["type"] in ("ALL", "index"):
+            findings.append({
+                "table": row["table"],
+                "access": row["type"],
+                "rows": row["rows"] or 0,
+                "detail": row["Extra"] or "",
+            })
+    return findings
+
+def explain_sqlite(conn, record: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """SQLite：EXPLAIN QUERY PLAN 中未使用索引的 SCAN 视为全表扫描"""
+    result = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + record["statement"], _parameters(record))
+    findings = []
+    for row in result:
+        detail = row[-1]
+        if detail.startswith("SCAN") and "INDEX" not in detail:
+            findings.append({"table": detail.split()[-1], "access": "SCAN", "rows": 0, "detail": detail})
+    return findings
+
+def explain_postgresql(conn, record: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """PostgreSQL：计划中的 Seq Scan 视为全表扫描"""
+    result = conn.exec_driver_sql("EXPLAIN " + record["statement"], _parameters(record))
+    findings = []
+    for (line,) in result:
+        if "Seq Scan on" in line:
+            table = line.split("Seq Scan on", 1)[1].split()[0]
+            rows = 0
+            if "rows=" in line:
+                rows = int(line.split("rows=", 1)[1].split()[0])
+            findings.append({"table": table, "access": "Seq Scan", "rows": rows, "detail": line.strip()})
+    return findings
+
+EXPLAINERS = {
+    "mysql": explain_mysql,
+    "sqlite": explain_sqlite,
+    "postgresql": explain_postgresql,
+}
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="回放SQL语句形状并报告全表扫描")
+    parser.add_argument("capture_file", help="SQL_CAPTURE_PATH 采集到的JSON Lines文件")
+    parser.add_argument("--min-rows", type=int, default=0, help="忽略估算扫描行数低于该值的结果")
+    args = parser.parse_args()
+
+    engine = create_engine(settings.DATABASE_URL)
+    explain = EXPLAINERS.get(engine.dialect.name)
+    if explain is None:
+        print(f"❌ 不支持的数据库: {engine.dialect.name}")
+        return 1
+
+    report = []
+    failed = 0
+    with engine.connect() as conn:
+        for record in load_shapes(args.capture_file):
+            if not record["statement"].lstrip().upper().startswith(EXPLAINABLE):
+                continue
+            try:
+                findings = explain(conn, record)
+            except Exception as e:
+                failed += 1
+                print(f"⚠️  无法EXPLAIN: {record['shape'][:120]}... ({e})")
+                conn.rollback()
+                continue
+            for finding in findings:
+                if finding["rows"] >= args.min_rows:
+                    report.append((finding, record["shape"]))
+
+    report.sort(key=lambda item: item[0]["rows"], reverse=True)
+    print(f"发现 {len(report)} 处全表扫描（{failed} 条语句无法EXPLAIN）\n")
+    for finding, shape in report:
+        print(f"[{finding['access']}] 表 {finding['table']}  估算行数 {finding['rows']}  {finding['detail']}")
+        print(f"    {shape[:300]}\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+本地模拟渠道API，用于测试渠道订单同步
+订单由序号确定性生成（不占用与订单数成正比的内存），可模拟数十万订单；
+同一订单在未被修改前每次返回的内容完全相同
+
+接口（{code} 为渠道代码）：
+    GET  /channels/{code}/orders?page_size=500&updated_since=2025-01-01T00:00:00&after_id=C1-000000123&page=1
+         按(更新时间, 订单ID)排序返回订单：传入 after_id 时从 (updated_since, after_id) 之后开始（键集分页），
+         否则 updated_since 为包含边界的更新时间下限；page 在该起点之后按页码偏移
+    POST /channels/{code}/touch?count=100
+         随机修改若干订单（状态变化，更新时间为当前时间），模拟渠道侧订单变更
+
+示例：
+    python mock_channel_server.py --orders 300000 --port 9100
+    # 将渠道的 api_address 设置为 http://localhost:9100/channels/<channel_code>
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+import numpy as np
+import uvicorn
+from fastapi import FastAPI, HTTPException, Query
+
+STATUSES = ["paid", "shipped", "delivered", "completed", "refunded"]
+
+class ChannelData:
+    """
+    单个渠道的模拟订单：订单i在第0版时的下单/更新时间为 base + i 分钟，被修改后版本号加一；
+    时间以整数微秒保存，与接口返回的ISO时间精确对应
+    """
+
+    def __init__(self, code: str, orders: int, skus: int):
+        self.code = code
+        self.skus = skus
+        base = int(time.time()) - orders * 60
+        self.created = (base + np.arange(orders, dtype=np.int64) * 60) * 1_000_000
+        self.updated = self.created.copy()
+        self.version = np.zeros(orders, dtype=np.int32)
+        self._sorted: Optional[np.ndarray] = None
+
+    def touch(self, count: int) -> int:
+        picked = np.random.choice(len(self.updated), size=min(count, len(self.updated)), replace=False)
+        now = int(time.time() * 1_000_000)
+        self.version[picked] += 1
+        self.updated[picked] = now + np.arange(len(picked), dtype=np.int64) * 1000
+        self._sorted = None
+        return len(picked)
+
+    def ordered(self) -> np.ndarray:
+        """全部订单序号，按(更新时间, 序号)排序，结果在下一次修改前缓存"""
+        if self._sorted is None:
+            indices = np.arange(len(self.updated))
+            self._sorted = indices[np.lexsort((indices, self.updated))]
+        return self._sorted
+
+    def start(self, since: Optional[int], after: Optional[int]) -> int:
+        """排序后列表中第一个在 since（包含）或 (since, after)（不包含）之后的位置"""
+        if since is None:
+            return 0
+        ordered = self.ordered()
+        keys = self.updated[ordered]
+        lo = int(np.searchsorted(keys, since, side="left"))
+        if after is None:
+            return lo
+        hi = int(np.searchsorted(keys, since, side="right"))
+        return lo + int(np.searchsorted(ordered[lo:hi], after, side="right"))
+
+    def order_id(self, i: int) -> str:
+        return f"{self.code}-{i:09d}"
+
+    @staticmethod
+    def isoformat(us: int, timespec: str) -> str:
+        return (datetime.fromtimestamp(us // 1_000_000) + timedelta(microseconds=us % 1_000_000)).isoformat(timespec=timespec)
+
+    def order(self, i: int) -> Dict[str, Any]:
+        version = int(self.version[i])
+        items = []
+        for k in range(1 + i % 3):
+            sku_no = 1 + (i * 7 + k) % self.skus
+            quantity = 1 + (i + k) % 4
+            unit_price = 10 + sku_no * 1.5
+            items.append({
+                "item_id": f"{self.code}-{i:09d}-{k}",
+                "product_id": f"P{sku_no:05d}",
+                "sku": f"SKU{sku_no}",
+                "title": f"Product {sku_no}",
+                "quantity": quantity,
+                "unit_price": f"{unit_price:.2f}",
+                "total_price": f"{unit_price * quantity:.2f}",
+            })
+        return {
+            "order_id": self.order_id(i),
+            "buyer_id": f"buyer-{i % 5000}",
+            "status": STATUSES[(i + version) % len(STATUSES)],
+            "total_amount": f"{sum(float(item['total_price']) for item in items):.2f}",
+            "created_at": self.isoformat(int(self.created[i]), "seconds"),
+            "updated_at": self.isoformat(int(self.updated[i]), "microseconds"),
+            "version": version,
+            "items": items,
+        }
+
+def create_app(orders: int, skus: int, latency: float, error_rate: float) -> FastAPI:
+    app = FastAPI(title="Mock Channel API")
+    channels: Dict[str, ChannelData] = {}
+
+    def channel(code: str) -> ChannelData:
+        if code not in channels:
+            channels[code] = ChannelData(code, orders, skus)
+        return channels[code]
+
+    @app.get("/channels/{code}/orders")
+    async def list_orders(
+        code: str,
+        page: int = Query(1, ge=1),
+        page_size: int = Query(500, ge=1, le=5000),
+        updated_since: Optional[datetime] = None,
+        after_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        if latency:
+            await asyncio.sleep(latency)
+        if error_rate and random.random() < error_rate:
+            raise HTTPException(status_code=503, detail="Injected failure")
+        data = channel(code)
+        since = None
+        if updated_since is not None:
+            # 与 isoformat 一致按本地时间换算为整数微秒
+            since = int(time.mktime(updated_since.replace(microsecond=0).timetuple())) * 1_000_000 + updated_since.microsecond
+        after = int(after_id.rsplit("-", 1)[1]) if after_id else None
+        indices = data.ordered()[data.start(since, after):]
+        start = (page - 1) * page_size
+        total = len(indices)
+        return {
+            "orders": [data.order(int(i)) for i in indices[start:start + page_size]],
+            "page": page,
+            "page_size": page_size,
+            "total": total,
+            "total_pages": max((total + page_size - 1) // page_size, 1),
+        }
+
+    @app.post("/channels/{code}/touch")
+    async def touch_orders(code: str, count: int = Query(100, ge=1)) -> Dict[str, Any]:
+        return {"touched": channel(code).touch(count)}
+
+    return app
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="本地模拟渠道订单API")
+    parser.add_argument("--orders", type=int, default=100000, help="每个渠道的订单数")
+    parser.add_argument("--skus", type=int, default=50, help="订单中出现的不同SKU数（SKU1..SKUn）")
+    parser.add_argument("--latency", type=float, default=0.0, help="每个请求的模拟延迟（秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="随机返回503的概率，用于测试重试")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    args = parser.parse_args()
+
+    app = create_app(args.orders, args.skus, args.latency, args.error_rate)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+#!/usr/bin/env python
+"""
+重建日销售汇总表（DailySalesRollups）
+首次上线时全量回填，或在数据校正后按日期区间重建
+
+示例：
+    python rebuild_sales_rollup.py
+    python rebuild_sales_rollup.py --start 2025-01-01 --end 2025-01-31
+"""
+import argparse
+from datetime import date
+
+from app.db.session import SessionLocal
+from app.services.sales_rollup import rebuild_rollup
+
+def main():
+    parser = argparse.ArgumentParser(description="重建日销售汇总表")
+    parser.add_argument("--start", type=date.fromisoformat, help="起始日期（含），默认不限")
+    parser.add_argument("--end", type=date.fromisoformat, help="结束日期（含），默认不限")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        rows = rebuild_rollup(db, start=args.start, end=args.end)
+    finally:
+        db.close()
+    print(f"Daily sales rollup rebuilt: {rows} rows.")
+
+if __name__ == "__main__":
+    main()
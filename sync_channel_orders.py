@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+"""
+同步渠道订单（替代外部定时同步脚本）
+按渠道的 api_address 拉取订单写入 SyncedChannelOrders / SyncedChannelOrderItems，
+默认只拉取检查点（ChannelSyncStates）之后更新的订单，每个渠道每次运行记录一条 OrderSyncLog；
+多个渠道并行同步
+
+示例：
+    python sync_channel_orders.py C1
+    python sync_channel_orders.py C1 C2 C3
+    python sync_channel_orders.py C1 --full
+"""
+import argparse
+import asyncio
+import sys
+
+from app.services.order_sync import sync_channel
+
+async def run(channel_codes, full):
+    return await asyncio.gather(*[sync_channel(code, full=full) for code in channel_codes])
+
+def main():
+    parser = argparse.ArgumentParser(description="同步渠道订单")
+    parser.add_argument("channel_codes", nargs="+", help="渠道代码")
+    parser.add_argument("--full", action="store_true", help="忽略检查点，全量同步")
+    args = parser.parse_args()
+
+    reports = asyncio.run(run(args.channel_codes, args.full))
+    for report in reports:
+        print(f"{report.channel_code}: {report.status} {report.message()}")
+    sys.exit(0 if all(r.error is None for r in reports) else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+from app.api.v1.endpoints.jobs import create_job
+from app.services.jobs import JOB_HANDLERS
+
+
+def test_create_job_doc_lists_every_job_type():
+    # 接口文档中的任务类型需与已注册的处理函数保持一致
+    for job_type in JOB_HANDLERS:
+        assert job_type in create_job.__doc__
@@ -0,0 +1,55 @@
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import func, select
+
+from app.models.sales_channel import SalesChannel
+from app.models.sales_order import SalesOrder
+from app.models.sales_order_archive import SalesOrderArchive
+from app.models.sales_rollup import DailySalesRollup
+from app.services.order_archive import archive_horizon, archive_orders
+from app.services.sales_rollup import apply_rollup_changes, order_snapshot, rebuild_rollup
+
+def _totals(db):
+    return db.execute(
+        select(func.sum(DailySalesRollup.order_count), func.sum(DailySalesRollup.total_amount))
+    ).one()
+
+def _seed(db):
+    now = datetime.now()
+    db.add(SalesChannel(channel_id=1, channel_name="ch1", channel_code="C1", platform_type="ecommerce", created_at=now))
+    old = archive_horizon() - timedelta(days=10)
+    orders = [
+        SalesOrder(order_id=1, customer_user_id="u1", channel_id=1, order_amount=Decimal("10.00"),
+                   order_status="done", order_date=old),
+        SalesOrder(order_id=2, customer_user_id="u2", channel_id=1, order_amount=Decimal("20.00"),
+                   order_status="done", order_date=old + timedelta(days=1)),
+        SalesOrder(order_id=3, customer_user_id="u3", channel_id=1, order_amount=Decimal("30.00"),
+                   order_status="pending", order_date=now),
+    ]
+    db.add_all(orders)
+    apply_rollup_changes(db, added=[order_snapshot(o) for o in orders])
+    db.commit()
+
+def test_rebuild_after_archive_keeps_archived_history(db):
+    _seed(db)
+    before = _totals(db)
+    assert before == (3, Decimal("60.00"))
+
+    assert archive_orders(db) == 2
+    assert db.scalar(select(func.count()).select_from(SalesOrderArchive)) == 2
+    assert _totals(db) == before
+
+    rebuild_rollup(db)
+    assert _totals(db) == before
+
+def test_rebuild_date_range_only_touches_range(db):
+    _seed(db)
+    archive_orders(db)
+    start = (archive_horizon() - timedelta(days=10)).date()
+
+    assert rebuild_rollup(db, start=start, end=start) == 1
+    assert _totals(db) == (3, Decimal("60.00"))
+
+    rebuild_rollup(db, start=date.today(), end=date.today())
+    assert _totals(db) == (3, Decimal("60.00"))